@@ -263,10 +263,9 @@ async def get_blockchain_info():
 async def get_block(block_index: int):
     """Get block details by index."""
     try:
-        if block_index < 0 or block_index >= len(blockchain.chain):
+        block = blockchain.get_block(block_index)
+        if block is None:
             raise ValueError("Block not found")
-        
-        block = blockchain.chain[block_index]
         return {
             "index": block.index,
             "hash": block.hash,
@@ -285,9 +284,14 @@ async def get_blocks(limit: int = 10):
     """Get latest blocks."""
     try:
         blocks = []
-        start_index = max(0, len(blockchain.chain) - limit)
+        length = blockchain.get_chain_length()
+        start_index = max(0, length - limit)
         
-        for block in blockchain.chain[start_index:]:
+        for index in range(start_index, length):
+            # Heights below a restored snapshot's base have no block
+            block = blockchain.get_block(index)
+            if block is None:
+                continue
             blocks.append({
                 "index": block.index,
                 "hash": block.hash,
@@ -298,7 +302,7 @@ async def get_blocks(limit: int = 10):
         
         return {
             "blocks": blocks,
-            "total": len(blockchain.chain)
+            "total": length
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -310,7 +314,7 @@ async def validate_blockchain():
         is_valid = blockchain.is_chain_valid()
         return {
             "is_valid": is_valid,
-            "chain_length": len(blockchain.chain),
+            "chain_length": blockchain.get_chain_length(),
             "message": "Blockchain is valid" if is_valid else "Blockchain is invalid"
         }
     except Exception as e:
@@ -364,7 +368,7 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "blockchain_length": len(blockchain.chain),
+        "blockchain_length": blockchain.get_chain_length(),
         "validators": len(blockchain.validators),
         "pending_transactions": len(blockchain.pending_transactions)
     }
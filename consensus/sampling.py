@@ -0,0 +1,253 @@
+"""
+consensus/sampling.py: Stake-weighted sampling for Φ-Chain consensus
+
+This module implements Walker/Vose alias tables for O(1) stake-weighted
+proposer draws. Tables are built with integer arithmetic only, so every
+node that builds a table from the same (sorted) stakes and draws with the
+same seed (e.g. the previous block hash) selects the same validator.
+
+It also provides stake-weighted committee sampling without replacement,
+cached per epoch, so consensus rounds only involve TARGET_COMMITTEE_SIZE
+validators instead of the full set.
+"""
+
+import hashlib
+import heapq
+import math
+import random
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+
+def seed_to_ints(seed: Union[str, bytes], counter: int = 0) -> tuple:
+    """
+    Derive two independent 128-bit integers from a seed.
+
+    Args:
+        seed: The seed (e.g. a block hash)
+        counter: Draw number, for several draws from one seed
+
+    Returns:
+        (r1, r2) as Python integers
+    """
+    if isinstance(seed, str):
+        seed = seed.encode()
+    digest = hashlib.sha256(seed + counter.to_bytes(8, "big")).digest()
+    return int.from_bytes(digest[:16], "big"), int.from_bytes(digest[16:], "big")
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table over integer weights.
+
+    Construction is O(n); every draw is O(1): pick a column uniformly,
+    then keep it or take its alias with an exact integer coin flip.
+    """
+
+    def __init__(self, keys: Sequence[str], weights: Sequence[int]):
+        """
+        Build an alias table.
+
+        Args:
+            keys: The items to sample (order must match across nodes)
+            weights: Positive integer weight per item (e.g. stake)
+        """
+        if len(keys) != len(weights):
+            raise ValueError("keys and weights must have the same length")
+
+        pairs = [(k, int(w)) for k, w in zip(keys, weights) if w > 0]
+        self.keys: List[str] = [k for k, _ in pairs]
+        n = len(pairs)
+        self.total_weight = sum(w for _, w in pairs)
+
+        # Scale by n so the per-column threshold is the integer total weight
+        scaled = [w * n for _, w in pairs]
+        self.prob: List[int] = [self.total_weight] * n
+        self.alias: List[int] = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < self.total_weight]
+        large = [i for i, p in enumerate(scaled) if p >= self.total_weight]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= self.total_weight - scaled[s]
+            if scaled[l] < self.total_weight:
+                small.append(l)
+            else:
+                large.append(l)
+
+        # Leftover columns are full (only reachable through exact ties)
+        for i in small + large:
+            self.prob[i] = self.total_weight
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def sample_index(self, r1: int, r2: int) -> int:
+        """
+        Draw an index from two uniform non-negative integers.
+
+        Args:
+            r1: Selects the column
+            r2: Selects between the column and its alias
+
+        Returns:
+            The sampled index
+        """
+        column = r1 % len(self.keys)
+        if r2 % self.total_weight < self.prob[column]:
+            return column
+        return self.alias[column]
+
+    def sample(self, rng: Optional[random.Random] = None) -> str:
+        """Draw a key using a (non-deterministic) random generator."""
+        rng = rng or random
+        return self.keys[self.sample_index(rng.getrandbits(64), rng.getrandbits(64))]
+
+    def sample_seeded(self, seed: Union[str, bytes], counter: int = 0) -> str:
+        """
+        Draw a key deterministically from a seed.
+
+        Args:
+            seed: Shared seed, e.g. the previous block hash
+            counter: Draw number for repeated draws from the same seed
+
+        Returns:
+            The sampled key
+        """
+        r1, r2 = seed_to_ints(seed, counter)
+        return self.keys[self.sample_index(r1, r2)]
+
+    def probability(self, index: int) -> float:
+        """Get the exact selection probability of an index (for checks and stats)."""
+        n = len(self.keys)
+        mass = self.prob[index]
+        for column in range(n):
+            if self.alias[column] == index and column != index:
+                mass += self.total_weight - self.prob[column]
+        return mass / (n * self.total_weight)
+
+
+def sample_committee(keys: Sequence[str], weights: Sequence[int], size: int,
+                     seed: Union[str, bytes]) -> List[str]:
+    """
+    Draw a stake-weighted sample without replacement (Efraimidis-Spirakis).
+
+    Every key gets a uniform u derived from sha256(seed + key) and the
+    `size` keys with the smallest -ln(u) / weight are selected, which is
+    equivalent to drawing one at a time proportionally to the remaining
+    weight. The result does not depend on the order of `keys`.
+
+    Args:
+        keys: Candidate keys (e.g. validator IDs)
+        weights: Positive integer weight per key (e.g. stake)
+        size: Committee size; the whole set is returned if it is smaller
+        seed: Shared seed, e.g. the epoch boundary block hash
+
+    Returns:
+        The committee, highest priority first
+    """
+    if len(keys) != len(weights):
+        raise ValueError("keys and weights must have the same length")
+    if isinstance(seed, str):
+        seed = seed.encode()
+
+    prefix = hashlib.sha256(seed)
+    priorities: List[Tuple[float, str]] = []
+    for key, weight in zip(keys, weights):
+        if weight <= 0:
+            continue
+        digest = prefix.copy()
+        digest.update(key.encode())
+        # 53-bit uniform in (0, 1]
+        u = ((int.from_bytes(digest.digest()[:8], "big") >> 11) + 1) / 2.0 ** 53
+        priorities.append((-math.log(u) / weight, key))
+
+    return [key for _, key in heapq.nsmallest(size, priorities)]
+
+
+class CommitteeSelector:
+    """
+    Epoch-scoped committee cache.
+
+    The committee for an epoch is computed once, from the candidate stakes
+    and the epoch seed, and reused for every round in that epoch.
+    """
+
+    def __init__(self, committee_size: int, epoch_length: int):
+        """
+        Initialize a committee selector.
+
+        Args:
+            committee_size: Target committee size (TARGET_COMMITTEE_SIZE)
+            epoch_length: Number of blocks per epoch
+        """
+        if epoch_length <= 0:
+            raise ValueError("epoch_length must be positive")
+        self.committee_size = committee_size
+        self.epoch_length = epoch_length
+        self._cache: Dict[int, Tuple[bytes, List[str]]] = {}
+
+    def epoch_of(self, height: int) -> int:
+        """Get the epoch a block height belongs to."""
+        return height // self.epoch_length
+
+    def boundary_height(self, epoch: int) -> int:
+        """Get the height of the block whose hash seeds an epoch (the last block before it)."""
+        return max(epoch * self.epoch_length - 1, 0)
+
+    def get_committee(self, epoch: int, seed: Union[str, bytes],
+                      stakes: Dict[str, int]) -> List[str]:
+        """
+        Get the committee for an epoch, sampling it on first use.
+
+        Args:
+            epoch: The epoch number
+            seed: The epoch boundary block hash
+            stakes: Candidate validator ID -> stake (only read on a cache miss)
+
+        Returns:
+            The committee members
+        """
+        cached = self.cached(epoch, seed)
+        if cached is not None:
+            return cached
+        if isinstance(seed, str):
+            seed = seed.encode()
+
+        keys = sorted(stakes)
+        committee = sample_committee(keys, [stakes[k] for k in keys], self.committee_size, seed)
+        # Only the current and previous epoch are ever needed
+        for old in [e for e in self._cache if e < epoch - 1]:
+            del self._cache[old]
+        self._cache[epoch] = (seed, committee)
+        return committee
+
+    def cached(self, epoch: int, seed: Union[str, bytes]) -> Optional[List[str]]:
+        """Get the cached committee for an epoch and seed, or None on a miss."""
+        if isinstance(seed, str):
+            seed = seed.encode()
+        cached = self._cache.get(epoch)
+        if cached is not None and cached[0] == seed:
+            return cached[1]
+        return None
+
+    def invalidate(self):
+        """Forget cached committees (e.g. after the candidate set changes)."""
+        self._cache.clear()
+
+
+if __name__ == "__main__":
+    # Demonstrate deterministic stake-weighted draws
+    stakes = {"validator_a": 6765, "validator_b": 10946, "validator_c": 17711}
+    keys = sorted(stakes)
+    table = AliasTable(keys, [stakes[k] for k in keys])
+
+    for i, key in enumerate(keys):
+        print(f"{key}: stake {stakes[key]}, p = {table.probability(i):.4f}")
+
+    previous_hash = "00" + "f" * 62
+    print(f"Proposer for {previous_hash[:8]}...: {table.sample_seeded(previous_hash)}")
+    print(f"Committee of 2: {sample_committee(keys, [stakes[k] for k in keys], 2, previous_hash)}")
@@ -5,11 +5,11 @@ This module implements validator selection, stake management, and
 the Fibonacci Byzantine Agreement (FBA) consensus mechanism.
 """
 
-from typing import Dict, List, Optional
-import random
+from typing import Callable, Dict, List, Optional, Union
 import sys
 sys.path.insert(0, '..')
 from phi_chain_core import FibonacciUtils, GenesisParameters
+from consensus.sampling import AliasTable
 
 
 class Validator:
@@ -37,6 +37,8 @@ class Validator:
         self.blocks_finalized = 0
         self.slashing_count = 0
         self.reputation = 1.0
+        # Called as on_change(validator, stake_delta) when stake or status changes
+        self.on_change: Optional[Callable[["Validator", int], None]] = None
     
     def propose_block(self) -> bool:
         """Record that this validator proposed a block."""
@@ -72,8 +74,18 @@ class Validator:
         if self.stake < FibonacciUtils.fibonacci(20):
             self.active = False
         
+        if self.on_change:
+            self.on_change(self, -amount)
+        
         return True
     
+    def set_active(self, active: bool):
+        """Activate or deactivate the validator."""
+        if self.active != active:
+            self.active = active
+            if self.on_change:
+                self.on_change(self, 0)
+    
     def get_performance_score(self) -> float:
         """Calculate the validator's performance score."""
         if self.blocks_proposed == 0:
@@ -103,6 +115,9 @@ class ValidatorSet:
         self.validators: Dict[str, Validator] = {}
         self.current_epoch = 0
         self.total_stake = 0
+        # Stake-weighted alias table over active validators, rebuilt lazily
+        # after a registration, slashing or activation change
+        self._proposer_table: Optional[AliasTable] = None
     
     def register_validator(self, validator_id: str, stake: int) -> bool:
         """
@@ -128,39 +143,73 @@ class ValidatorSet:
             return False
         
         # Register the validator
-        self.validators[validator_id] = Validator(validator_id, stake)
+        validator = Validator(validator_id, stake)
+        validator.on_change = self._on_validator_change
+        self.validators[validator_id] = validator
         self.total_stake += stake
+        self._proposer_table = None
         
         return True
     
-    def select_proposer(self) -> Optional[str]:
+    def _on_validator_change(self, validator: Validator, stake_delta: int):
+        """Track stake changes and invalidate the proposer table."""
+        self.total_stake += stake_delta
+        self._proposer_table = None
+    
+    def get_proposer_table(self) -> Optional[AliasTable]:
         """
-        Select the next block proposer using Fibonacci-weighted selection.
+        Get the alias table used for proposer selection, rebuilding it if stale.
+        
+        Validators are ordered by ID so every node builds the same table.
         
         Returns:
-            The ID of the selected proposer, or None if no validators available
+            The alias table, or None if no active validator has stake
         """
-        if not self.validators:
-            return None
+        if self._proposer_table is None:
+            active = sorted(
+                (v for v in self.validators.values() if v.active and v.stake > 0),
+                key=lambda v: v.validator_id
+            )
+            if not active:
+                return None
+            self._proposer_table = AliasTable(
+                [v.validator_id for v in active],
+                [v.stake for v in active]
+            )
+        return self._proposer_table
+    
+    def select_proposer(self, seed: Optional[Union[str, bytes]] = None) -> Optional[str]:
+        """
+        Select the next block proposer using Fibonacci-weighted selection.
         
-        # Get active validators
-        active_validators = [v for v in self.validators.values() if v.active]
-        if not active_validators:
-            return None
+        Selection is stake-weighted over active validators and O(1) once the
+        alias table is built (it is rebuilt only after stake or status changes).
         
-        # Compute selection probabilities based on stake
-        total_stake = sum(v.stake for v in active_validators)
+        Args:
+            seed: Shared seed such as the previous block hash; with a seed the
+                  draw is deterministic so all nodes agree on the proposer
         
-        # Weighted random selection
-        r = random.uniform(0, total_stake)
-        cumulative = 0
+        Returns:
+            The ID of the selected proposer, or None if no validators available
+        """
+        table = self.get_proposer_table()
+        if table is None:
+            return None
         
-        for validator in active_validators:
-            cumulative += validator.stake
-            if r <= cumulative:
-                return validator.validator_id
+        if seed is None:
+            return table.sample()
+        return table.sample_seeded(seed)
+    
+    def advance_epoch(self) -> int:
+        """
+        Move to the next epoch, rebuilding the proposer table on next use.
         
-        return active_validators[-1].validator_id
+        Returns:
+            The new epoch number
+        """
+        self.current_epoch += 1
+        self._proposer_table = None
+        return self.current_epoch
     
     def get_finality_threshold(self) -> int:
         """
@@ -222,6 +271,8 @@ class ValidatorSet:
 
 
 if __name__ == "__main__":
+    import hashlib
+    
     # Demonstrate validator management
     genesis_params = GenesisParameters()
     validator_set = ValidatorSet(genesis_params)
@@ -235,6 +286,9 @@ if __name__ == "__main__":
     print(validator_set.get_network_stats())
     
     print("\nProposer Selection:")
+    previous_hash = "0" * 64
     for _ in range(5):
-        proposer = validator_set.select_proposer()
+        proposer = validator_set.select_proposer(seed=previous_hash)
         print(f"Selected proposer: {proposer}")
+        # Stand-in for the hash of the block the proposer would produce
+        previous_hash = hashlib.sha256(previous_hash.encode()).hexdigest()
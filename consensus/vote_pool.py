@@ -0,0 +1,200 @@
+"""
+consensus/vote_pool.py: Vote aggregation for Φ-Chain FBA consensus
+
+This module implements a vote pool keyed by (height, block_hash, phase).
+Each tally stores a bitfield of validator indices and a running count and
+stake sum, so a duplicate vote is rejected in O(1) and a quorum is
+detected on the exact vote that crosses the threshold. Heights below the
+last finalized height are pruned, bounding memory to the live heights.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# Consensus phases, in order
+PREPARE = "prepare"
+COMMIT = "commit"
+PHASES = (PREPARE, COMMIT)
+
+VoteKey = Tuple[int, str, str]
+
+
+class VoteTally:
+    """Votes for one (height, block_hash, phase)."""
+
+    __slots__ = ("bits", "count", "stake", "threshold", "quorum_at")
+
+    def __init__(self, threshold: int):
+        self.bits = bytearray()
+        self.count = 0
+        self.stake = 0
+        self.threshold = threshold
+        self.quorum_at: Optional[float] = None
+
+    def has_voted(self, index: int) -> bool:
+        """Check whether a validator index has voted."""
+        byte = index >> 3
+        return byte < len(self.bits) and bool(self.bits[byte] & (1 << (index & 7)))
+
+    def add(self, index: int, stake: int) -> bool:
+        """
+        Record a vote.
+
+        Args:
+            index: The validator's index
+            stake: The validator's stake
+
+        Returns:
+            True if the vote is new, False if it is a duplicate
+        """
+        byte = index >> 3
+        bits = self.bits
+        if byte >= len(bits):
+            bits.extend(bytes(byte - len(bits) + 1))
+        mask = 1 << (index & 7)
+        if bits[byte] & mask:
+            return False
+        bits[byte] |= mask
+        self.count += 1
+        self.stake += stake
+        return True
+
+    def voters(self) -> List[int]:
+        """Get the indices of every validator that voted, in order."""
+        return [
+            (byte << 3) + bit
+            for byte, value in enumerate(self.bits) if value
+            for bit in range(8) if value & (1 << bit)
+        ]
+
+
+class VotePool:
+    """
+    Aggregates consensus votes by (height, block_hash, phase).
+    """
+
+    def __init__(self, threshold: Callable[[int], int]):
+        """
+        Initialize a vote pool.
+
+        Args:
+            threshold: Returns the number of votes needed for a quorum at a height
+        """
+        self.threshold = threshold
+        self.tallies: Dict[VoteKey, VoteTally] = {}
+        self._heights: Dict[int, Set[VoteKey]] = {}
+        self.finalized_height = -1
+        # Called as on_quorum(height, block_hash, phase, tally) when a quorum forms
+        self.on_quorum: List[Callable[[int, str, str, VoteTally], None]] = []
+
+    def add_vote(self, height: int, block_hash: str, phase: str,
+                 index: int, stake: int = 0) -> bool:
+        """
+        Add a vote to the pool.
+
+        Args:
+            height: The height of the block voted on
+            block_hash: The block hash voted on
+            phase: "prepare" or "commit"
+            index: The voting validator's index
+            stake: The voting validator's stake
+
+        Returns:
+            True if the vote was counted (not stale, unknown or duplicate)
+        """
+        if phase not in PHASES or height < self.finalized_height:
+            return False
+
+        tally = self._tally(height, block_hash, phase)
+        if not tally.add(index, stake):
+            return False
+        if tally.quorum_at is None and tally.count >= tally.threshold:
+            self._reached(height, block_hash, phase, tally)
+        return True
+
+    def add_votes(self, height: int, block_hash: str, phase: str,
+                  indices: List[int], stakes: List[int]) -> int:
+        """
+        Add a batch of votes for the same (height, block_hash, phase).
+
+        Args:
+            height: The height of the block voted on
+            block_hash: The block hash voted on
+            phase: "prepare" or "commit"
+            indices: The voting validators' indices
+            stakes: The voting validators' stakes
+
+        Returns:
+            The number of votes counted
+        """
+        if phase not in PHASES or height < self.finalized_height:
+            return 0
+
+        tally = self._tally(height, block_hash, phase)
+        add = tally.add
+        counted = 0
+        for index, stake in zip(indices, stakes):
+            if add(index, stake):
+                counted += 1
+        if tally.quorum_at is None and tally.count >= tally.threshold:
+            self._reached(height, block_hash, phase, tally)
+        return counted
+
+    def _tally(self, height: int, block_hash: str, phase: str) -> VoteTally:
+        key = (height, block_hash, phase)
+        tally = self.tallies.get(key)
+        if tally is None:
+            # The threshold is fixed when the first vote for a key arrives
+            tally = self.tallies[key] = VoteTally(self.threshold(height))
+            self._heights.setdefault(height, set()).add(key)
+        return tally
+
+    def _reached(self, height: int, block_hash: str, phase: str, tally: VoteTally):
+        tally.quorum_at = time.time()
+        for callback in self.on_quorum:
+            callback(height, block_hash, phase, tally)
+        if phase == COMMIT:
+            self.finalize(height)
+
+    def get_tally(self, height: int, block_hash: str, phase: str) -> Optional[VoteTally]:
+        """Get the tally for a (height, block_hash, phase), if any votes exist."""
+        return self.tallies.get((height, block_hash, phase))
+
+    def has_quorum(self, height: int, block_hash: str, phase: str) -> bool:
+        """Check whether a (height, block_hash, phase) has reached quorum."""
+        tally = self.tallies.get((height, block_hash, phase))
+        return tally is not None and tally.quorum_at is not None
+
+    def finalize(self, height: int) -> int:
+        """
+        Mark a height as finalized and prune every lower height.
+
+        The finalized height itself is kept so late votes are still deduplicated.
+
+        Returns:
+            The number of tallies pruned
+        """
+        if height <= self.finalized_height:
+            return 0
+        self.finalized_height = height
+        pruned = 0
+        for old in [h for h in self._heights if h < height]:
+            for key in self._heights.pop(old):
+                del self.tallies[key]
+                pruned += 1
+        return pruned
+
+    def __len__(self) -> int:
+        return len(self.tallies)
+
+
+if __name__ == "__main__":
+    # Demonstrate quorum detection for 7 validators (threshold 5)
+    pool = VotePool(lambda height: (2 * 7) // 3 + 1)
+    pool.on_quorum.append(lambda h, b, p, t: print(f"Quorum: height {h}, {p}, {t.count} votes, stake {t.stake}"))
+
+    for phase in PHASES:
+        for index in range(7):
+            pool.add_vote(1, "0xabc", phase, index, stake=6765)
+    print(f"Duplicate accepted: {pool.add_vote(1, '0xabc', COMMIT, 0, 6765)}")
+    print(f"Voters: {pool.get_tally(1, '0xabc', COMMIT).voters()}")
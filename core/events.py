@@ -0,0 +1,190 @@
+"""
+core/events.py: Structured event channels for Φ-Chain hot paths
+
+Execution and consensus loops report what they do through named event
+channels instead of print(). A channel records nothing by default; when
+enabled it appends raw (timestamp, level, message, args) tuples to a bounded ring
+buffer and only formats them when the buffer is drained or dumped, so the
+cost on the hot path is one level check and one deque append.
+
+Warnings and errors are rare and meant for the operator, so they are
+also written to stderr as they happen, whether or not the channel
+buffers them (see EventChannel.echo_level).
+"""
+
+import asyncio
+import sys
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, TextIO, Tuple
+
+
+# Event levels
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+SILENT = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+# Default ring buffer size (F_17 = 1597 events)
+DEFAULT_CAPACITY = 1597
+
+# Events at or above this level are echoed to stderr by default
+DEFAULT_ECHO_LEVEL = WARNING
+
+EventRecord = Tuple[float, int, str, tuple]
+
+
+class EventChannel:
+    """
+    A named, leveled event channel backed by a ring buffer.
+
+    Messages use %-style placeholders and are formatted lazily, e.g.
+    ``channel.info("Tx %d committed", index)``.
+    """
+
+    def __init__(self, name: str, level: int = SILENT, capacity: int = DEFAULT_CAPACITY,
+                 echo_level: int = DEFAULT_ECHO_LEVEL):
+        """
+        Initialize an event channel.
+
+        Args:
+            name: The channel name (e.g. "opevm")
+            level: Minimum level recorded (SILENT records nothing)
+            capacity: Maximum number of buffered events; the oldest are dropped
+            echo_level: Minimum level written to echo_stream immediately
+                (SILENT echoes nothing)
+        """
+        self.name = name
+        self.level = level
+        self.echo_level = echo_level
+        # None writes to the current sys.stderr
+        self.echo_stream: Optional[TextIO] = None
+        self.buffer: Deque[EventRecord] = deque(maxlen=capacity)
+        self.dropped = 0
+        self._threshold = min(level, echo_level)
+
+    def set_level(self, level: int):
+        """Set the minimum level recorded by this channel."""
+        self.level = level
+        self._threshold = min(level, self.echo_level)
+
+    def set_echo_level(self, level: int):
+        """Set the minimum level echoed as it happens (SILENT to stop echoing)."""
+        self.echo_level = level
+        self._threshold = min(self.level, level)
+
+    def enabled(self, level: int) -> bool:
+        """Check whether events at this level are recorded."""
+        return level >= self.level
+
+    def emit(self, level: int, message: str, *args):
+        """
+        Record an event without formatting it.
+
+        Args:
+            level: The event level
+            message: A %-style format string
+            *args: Values for the format string
+        """
+        if level < self._threshold:
+            return
+        record = (time.time(), level, message, args)
+        if level >= self.echo_level:
+            (self.echo_stream or sys.stderr).write(self.format_record(record) + "\n")
+        if level < self.level:
+            return
+        buffer = self.buffer
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append(record)
+
+    def debug(self, message: str, *args):
+        self.emit(DEBUG, message, *args)
+
+    def info(self, message: str, *args):
+        self.emit(INFO, message, *args)
+
+    def warning(self, message: str, *args):
+        self.emit(WARNING, message, *args)
+
+    def error(self, message: str, *args):
+        self.emit(ERROR, message, *args)
+
+    def format_record(self, record: EventRecord) -> str:
+        """Format a single buffered event."""
+        timestamp, level, message, args = record
+        text = message % args if args else message
+        return f"{timestamp:.6f} [{self.name}] {LEVEL_NAMES.get(level, level)}: {text}"
+
+    def drain(self) -> List[str]:
+        """
+        Remove and format every buffered event.
+
+        Returns:
+            The formatted events, oldest first
+        """
+        records = []
+        buffer = self.buffer
+        while buffer:
+            records.append(buffer.popleft())
+        return [self.format_record(record) for record in records]
+
+    def dump(self, stream: Optional[TextIO] = None):
+        """Drain the buffer and write the events to a stream (default stdout)."""
+        stream = stream or sys.stdout
+        for line in self.drain():
+            stream.write(line + "\n")
+
+    async def drain_forever(self, sink: Callable[[List[str]], None], interval: float = 1.0):
+        """
+        Periodically drain the buffer into a sink until cancelled.
+
+        Args:
+            sink: Called with each non-empty batch of formatted events
+            interval: Seconds between drains
+        """
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                lines = self.drain()
+                if lines:
+                    sink(lines)
+        finally:
+            lines = self.drain()
+            if lines:
+                sink(lines)
+
+    def __repr__(self) -> str:
+        return f"EventChannel({self.name}, level={LEVEL_NAMES.get(self.level, self.level)}, buffered={len(self.buffer)})"
+
+
+_channels: Dict[str, EventChannel] = {}
+
+
+def get_channel(name: str) -> EventChannel:
+    """Get (or create) the shared event channel with this name."""
+    channel = _channels.get(name)
+    if channel is None:
+        channel = _channels[name] = EventChannel(name)
+    return channel
+
+
+def set_all_levels(level: int):
+    """Set the level of every registered channel."""
+    for channel in _channels.values():
+        channel.set_level(level)
+
+
+if __name__ == "__main__":
+    # Demonstrate lazy recording and draining
+    channel = get_channel("demo")
+    channel.info("Not recorded: channel is silent by default")
+    channel.set_level(INFO)
+    for i in range(3):
+        channel.info("Block %d processed. State: %s", i, (i + 1, i))
+    channel.debug("Not recorded: below INFO")
+    print(channel)
+    channel.dump()
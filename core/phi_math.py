@@ -4,6 +4,10 @@ phi_math.py - اللبنة الرياضية الأساسية لـ Φ-Chain با
 """
 
 import math
+from functools import lru_cache
+
+# عدد البتات الكسرية لـ φ الثابتة الثنائية: 256 بت للتجزئة + 64 بت هامش
+PHI_BITS = 320
 
 class PhiMath:
     # استخدام عامل قياس كبير للحفاظ على الدقة (10^18 يشبه Wei في Ethereum)
@@ -64,6 +68,30 @@ class PhiMath:
         """تحويل عدد صحيح ثابت إلى قيمة عائمة (للعرض فقط)."""
         return value / (10**precision)
 
+@lru_cache(maxsize=None)
+def golden_ratio(precision: int = 18) -> float:
+    """φ كقيمة عائمة (تُحسب بدقة precision منزلة مرة واحدة ثم تُخزن)"""
+    return PhiMath.from_fixed(PhiMath.get_phi(precision), precision)
+
+# φ كقيمة عائمة مشتركة بين الوحدات (FibonacciUtils.golden_ratio() تُرجع عددًا صحيحًا ثابت الفاصلة × 10^18)
+PHI_FLOAT = golden_ratio()
+
+@lru_cache(maxsize=None)
+def phi_fixed(bits: int = PHI_BITS) -> int:
+    """
+    floor(φ × 2^bits) بالضبط، بالجذر الصحيح math.isqrt (يُخزن لكل دقة).
+    φ × 2^b = (2^b + sqrt(5 × 2^2b)) / 2
+    """
+    return ((1 << bits) + math.isqrt(5 << (2 * bits))) >> 1
+
+def phi_multiply(value: int, bits: int = PHI_BITS) -> int:
+    """
+    floor(value × φ) بضرب وإزاحة صحيحين فقط.
+    دقيق لكل value < 2^(bits - 64) ما عدا احتمال ~2^-64 عند حافة عدد صحيح.
+    φ² = φ + 1، لذا floor(value × φ²) = phi_multiply(value) + value.
+    """
+    return (value * phi_fixed(bits)) >> bits
+
 def fibonacci(n: int) -> int:
     """
     حساب رقم فيبوناتشي مع دعم كامل للقيم السالبة (F(-n))
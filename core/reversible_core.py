@@ -5,8 +5,54 @@
 
 import hashlib
 import time
-from typing import Tuple, List, Optional
-from .phi_math import golden_ratio, fibonacci
+from typing import Iterable, Sequence, Tuple, List, Optional
+import numpy as np
+from .phi_math import golden_ratio, fibonacci, phi_multiply
+
+# التجزئات تُختزل إلى 256 بت
+HASH_MASK = (1 << 256) - 1
+
+# هامش الخطأ النسبي لتماثل زوج من الكتل (0.1%)
+SYMMETRY_TOLERANCE = 0.001
+
+# بادئة التجزئة المستخدمة في التحقق الجماعي: 16 خانة ستعشرية = 64 بت
+PREFIX_HEX = 16
+
+# تحت هذه القيمة تكون البادئة قصيرة (أصفار بادئة) فيُعاد التحقق بالتجزئة كاملة
+EXACT_BELOW = 1 << 32
+
+
+def phi_hash_pair(data: bytes) -> Tuple[str, str]:
+    """
+    تجزئتا φ و φ² لبيانات، بحساب SHA3-256 مرة واحدة.
+    
+    H_φ(x) = floor(φ × SHA3-256(x)) mod 2²⁵⁶
+    H_φ²(x) = floor(φ² × SHA3-256(x)) mod 2²⁵⁶ = H_φ(x) + SHA3-256(x) (لأن φ² = φ + 1)
+    
+    يُرجع: (التجزئة φ، التجزئة φ²) بصيغة ستعشرية من 64 خانة
+    """
+    base_int = int.from_bytes(hashlib.sha3_256(data).digest(), 'big')
+    phi_int = phi_multiply(base_int)
+    return format(phi_int & HASH_MASK, "064x"), format((phi_int + base_int) & HASH_MASK, "064x")
+
+
+def phi_hash_batch(items: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    تجزئة دفعة من البيانات (انظر phi_hash_pair)
+    
+    تجزئة φ لا تعتمد إلا على البيانات، لذا يمكن حساب تجزئات كتل كثيرة
+    دفعة واحدة قبل ربطها ببعضها.
+    """
+    sha3 = hashlib.sha3_256
+    from_bytes = int.from_bytes
+    results = []
+    for item in items:
+        base_int = from_bytes(sha3(item.encode('utf-8')).digest(), 'big')
+        phi_int = phi_multiply(base_int)
+        results.append((format(phi_int & HASH_MASK, "064x"),
+                        format((phi_int + base_int) & HASH_MASK, "064x")))
+    return results
+
 
 class ReversibleBlock:
     """كتلة واحدة في السلسلة العكسية الزمنية"""
@@ -15,53 +61,19 @@ class ReversibleBlock:
                  data: str, 
                  timestamp: float = None,
                  direction: str = "forward",  # "forward" أو "backward"
-                 previous_hash: str = None):
+                 previous_hash: str = None,
+                 hashes: Optional[Tuple[str, str]] = None):
         
         self.data = data
         self.direction = direction
         self.timestamp = timestamp or time.time()
         self.previous_hash = previous_hash
         self.nonce = 0
-        self.phi_hash = self._calculate_phi_hash()
-        self.mirror_hash = self._calculate_mirror_hash()
-        
-    def _calculate_phi_hash(self) -> str:
-        """
-        تجزئة φ: H_φ(x) = φ × SHA3-256(x) mod 2²⁵⁶
-        
-        تعتمد على النسبة الذهبية لإنتاج تجزئة غير عشوائية
-        """
-        phi = float(golden_ratio(30))
-        data_bytes = self.data.encode('utf-8')
-        
-        # تجزئة أساسية
-        base_hash = hashlib.sha3_256(data_bytes).digest()
-        base_int = int.from_bytes(base_hash, 'big')
-        
-        # تطبيق φ
-        phi_int = int(base_int * phi) % (2**256)
-        
-        # تحويل للتمثيل الستعشري
-        return hex(phi_int)[2:].zfill(64)
-    
-    def _calculate_mirror_hash(self) -> str:
-        """
-        حساب التجزئة العكسية (المرآتية)
-        
-        للكتل في الاتجاه الخلفي، نستخدم φ² بدلاً من φ
-        φ² = φ + 1 = 2.618...
-        """
-        if self.direction == "forward":
-            return self.phi_hash
-            
-        # للاتجاه الخلفي: H_mirror(x) = φ² × SHA3-256(x) mod 2²⁵⁶
-        phi_squared = float(golden_ratio(30)) ** 2
-        data_bytes = self.data.encode('utf-8')
-        base_hash = hashlib.sha3_256(data_bytes).digest()
-        base_int = int.from_bytes(base_hash, 'big')
-        
-        mirror_int = int(base_int * phi_squared) % (2**256)
-        return hex(mirror_int)[2:].zfill(64)
+        # hashes: زوج (φ، φ²) محسوب مسبقًا بـ phi_hash_batch
+        phi_hash, phi_squared_hash = hashes or phi_hash_pair(data.encode('utf-8'))
+        self.phi_hash = phi_hash
+        # للكتل في الاتجاه الخلفي، التجزئة المرآتية تستخدم φ² بدلاً من φ
+        self.mirror_hash = phi_hash if direction == "forward" else phi_squared_hash
     
     def validate_symmetry(self, paired_block: 'ReversibleBlock') -> bool:
         """
@@ -75,19 +87,8 @@ class ReversibleBlock:
         forward_hash = self.phi_hash if self.direction == "forward" else paired_block.phi_hash
         backward_hash = self.mirror_hash if self.direction == "backward" else paired_block.mirror_hash
         
-        # تحويل للتكامل
-        forward_int = int(forward_hash, 16)
-        backward_int = int(backward_hash, 16)
-        
-        # حساب النسبة (يجب أن تكون قريبة من φ)
-        if backward_int == 0:
-            return False
-            
-        ratio = forward_int / backward_int
-        phi = float(golden_ratio(10))
-        
-        # هامش خطأ 0.1% (لأخطاء التقريب)
-        return abs(ratio - phi) / phi < 0.001
+        # النسبة يجب أن تكون قريبة من φ (هامش خطأ 0.1% لأخطاء التقريب)
+        return _symmetric(int(forward_hash, 16), int(backward_hash, 16), float(golden_ratio(10)))
     
     def __str__(self) -> str:
         return f"ReversibleBlock({self.direction[:3]}, data={self.data[:20]}..., hash={self.phi_hash[:16]}...)"
@@ -101,10 +102,20 @@ class TemporalChain:
         self.backward_chain: List[ReversibleBlock] = []
         self.genesis_hash = "0" * 64
         
-    def add_block(self, data: str, direction: str = "forward") -> Tuple[ReversibleBlock, bool]:
+        # حالة فيبوناتشي (F_{n+1}, F_n): الكتلة الأمامية تطبق Q والخلفية تطبق Q⁻¹
+        self.state: Tuple[int, int] = (1, 0)
+        # سجل الإعادة: الكتل المُزالة بالتراجع (الأحدث في النهاية)
+        self.redo_log: List[ReversibleBlock] = []
+        # تماثل كل زوج (forward_chain[i], backward_chain[i]) وعدد الأزواج المتماثلة
+        self.pair_symmetry: List[bool] = []
+        self.symmetric_pairs = 0
+        
+    def add_block(self, data: str, direction: str = "forward",
+                  hashes: Optional[Tuple[str, str]] = None) -> Tuple[ReversibleBlock, bool]:
         """
         إضافة كتلة جديدة للاتجاه المحدد
         
+        hashes: زوج التجزئات المحسوب مسبقًا (انظر add_blocks)
         يُرجع: (الكتلة المضافة, نجاح العملية)
         """
         # تحديد السلسلة المناسبة
@@ -115,7 +126,8 @@ class TemporalChain:
         block = ReversibleBlock(
             data=data,
             direction=direction,
-            previous_hash=previous_hash
+            previous_hash=previous_hash,
+            hashes=hashes
         )
         
         # التحقق من التماثل إذا كانت هناك كتلة مقابلة
@@ -128,10 +140,53 @@ class TemporalChain:
             if not block.validate_symmetry(paired_block):
                 return None, False
         
-        # إضافة للسلسلة
-        target_chain.append(block)
+        # إضافة للسلسلة (كتلة جديدة تُلغي سجل الإعادة: التاريخ تفرّع)
+        self._append(block)
+        self.redo_log.clear()
         return block, True
     
+    def add_blocks(self, items: List[str], direction: str = "forward") -> int:
+        """
+        إضافة دفعة من الكتل بتجزئة بياناتها كلها أولًا (phi_hash_batch)
+        
+        يُرجع: عدد الكتل المضافة (تتوقف عند أول كتلة مرفوضة)
+        """
+        added = 0
+        for data, hashes in zip(items, phi_hash_batch(items)):
+            _, ok = self.add_block(data, direction, hashes)
+            if not ok:
+                break
+            added += 1
+        return added
+    
+    def _append(self, block: ReversibleBlock):
+        """إلحاق كتلة بسلسلتها وتطوير الحالة في اتجاهها"""
+        if block.direction == "forward":
+            self.forward_chain.append(block)
+            self.state = _step_forward(self.state)
+        else:
+            self.backward_chain.append(block)
+            self.state = _step_backward(self.state)
+        
+        # اكتمل زوج جديد: يُتحقق منه مرة واحدة فقط
+        index = len(self.pair_symmetry)
+        if index < len(self.forward_chain) and index < len(self.backward_chain):
+            symmetric = self.forward_chain[index].validate_symmetry(self.backward_chain[index])
+            self.pair_symmetry.append(symmetric)
+            self.symmetric_pairs += symmetric
+    
+    def _pop(self, chain: List[ReversibleBlock]) -> ReversibleBlock:
+        """إزالة آخر كتلة واستعادة الحالة قبلها بالمصفوفة المعاكسة"""
+        block = chain.pop()
+        if block.direction == "forward":
+            self.state = _step_backward(self.state)
+        else:
+            self.state = _step_forward(self.state)
+        if len(self.pair_symmetry) > len(chain):
+            self.symmetric_pairs -= self.pair_symmetry.pop()
+        self.redo_log.append(block)
+        return block
+    
     def get_temporal_state(self, position: int = -1) -> dict:
         """
         الحصول على حالة زمنية محددة (للأمام والخلف)
@@ -160,50 +215,72 @@ class TemporalChain:
             forward = self.forward_chain[position]
             backward = self.backward_chain[position]
         else:
-            if position >= len(self.forward_chain) or position >= len(self.backward_chain):
-                return False
-            forward = self.forward_chain[position]
-            backward = self.backward_chain[position]
+            # زوج مكتمل: النتيجة محفوظة منذ اكتماله
+            return position < len(self.pair_symmetry) and self.pair_symmetry[position]
         
         return forward.validate_symmetry(backward)
     
     def rewind(self, steps: int = 1) -> List[ReversibleBlock]:
         """
-        التراجع الزمني (إلغاء آخر كتل)
+        التراجع الزمني (إلغاء آخر كتل) في O(steps)
+        
+        تُستعاد الحالة بالمصفوفة المعاكسة الدقيقة، وتُحفظ الكتل المُزالة
+        في سجل الإعادة لتُعاد بـ replay() دون إعادة حساب تجزئاتها.
         
         يُرجع: الكتل التي تمت إزالتها
         """
         removed = []
         for _ in range(steps):
             if self.forward_chain:
-                removed.append(self.forward_chain.pop())
+                removed.append(self._pop(self.forward_chain))
             if self.backward_chain:
-                removed.append(self.backward_chain.pop())
+                removed.append(self._pop(self.backward_chain))
         return removed
     
+    def replay(self, count: Optional[int] = None) -> List[ReversibleBlock]:
+        """
+        إعادة آخر الكتل المُزالة بالتراجع (بعكس ترتيب إزالتها) في O(count)
+        
+        count: عدد الكتل (None لإعادة الكل)
+        يُرجع: الكتل المُعادة
+        """
+        if count is None:
+            count = len(self.redo_log)
+        restored = []
+        for _ in range(min(count, len(self.redo_log))):
+            block = self.redo_log.pop()
+            self._append(block)
+            restored.append(block)
+        return restored
+    
     def get_stats(self) -> dict:
         """إحصائيات السلسلة"""
         return {
             "forward_blocks": len(self.forward_chain),
             "backward_blocks": len(self.backward_chain),
             "total_blocks": len(self.forward_chain) + len(self.backward_chain),
+            "fibonacci_state": self.state,
+            "redo_blocks": len(self.redo_log),
             "symmetry_score": self._calculate_symmetry_score(),
             "temporal_balance": self._calculate_temporal_balance()
         }
     
     def _calculate_symmetry_score(self) -> float:
-        """حساب درجة التماثل الكلي"""
-        if not self.forward_chain or not self.backward_chain:
-            return 0.0
-            
-        min_length = min(len(self.forward_chain), len(self.backward_chain))
-        symmetric_count = 0
-        
-        for i in range(min_length):
-            if self.forward_chain[i].validate_symmetry(self.backward_chain[i]):
-                symmetric_count += 1
+        """حساب درجة التماثل الكلي في O(1) من العدّاد الجاري"""
+        pairs = len(self.pair_symmetry)
+        return self.symmetric_pairs / pairs if pairs > 0 else 0.0
+    
+    def audit_symmetry(self) -> int:
+        """
+        تدقيق: إعادة التحقق من كل الأزواج دفعة واحدة (validate_symmetry_many)
         
-        return symmetric_count / min_length if min_length > 0 else 0.0
+        يُرجع: عدد الأزواج المتماثلة (يجب أن يساوي symmetric_pairs)
+        """
+        pairs = len(self.pair_symmetry)
+        forward = [block.phi_hash for block in self.forward_chain[:pairs]]
+        backward = [block.mirror_hash for block in self.backward_chain[:pairs]]
+        result = validate_symmetry_many(hash_prefixes(forward), hash_prefixes(backward), forward, backward)
+        return int(np.count_nonzero(result))
     
     def _calculate_temporal_balance(self) -> float:
         """حساب التوازن الزمني (يجب أن يكون قريبًا من φ)"""
@@ -220,6 +297,55 @@ class TemporalChain:
         return abs(ratio - phi) / phi
 
 
+def _step_forward(state: Tuple[int, int]) -> Tuple[int, int]:
+    """Q × (F_{n+1}, F_n) = (F_{n+2}, F_{n+1})"""
+    return state[0] + state[1], state[0]
+
+
+def _step_backward(state: Tuple[int, int]) -> Tuple[int, int]:
+    """Q⁻¹ × (F_{n+1}, F_n) = (F_n, F_{n-1})، معكوس صحيح تمامًا لأن det(Q) = -1"""
+    return state[1], state[0] - state[1]
+
+
+def hash_prefixes(hashes: Sequence[str]) -> np.ndarray:
+    """أول 64 بت من كل تجزئة ستعشرية كمصفوفة uint64"""
+    data = bytes.fromhex("".join([h[:PREFIX_HEX] for h in hashes]))
+    return np.frombuffer(data, dtype=">u8").astype(np.uint64)
+
+
+def validate_symmetry_many(forward_prefixes: np.ndarray, backward_prefixes: np.ndarray,
+                           forward_hashes: Optional[Sequence[str]] = None,
+                           backward_hashes: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    التحقق الجماعي من تماثل أزواج (أمامية، خلفية) على مصفوفات NumPy
+    
+    نسبة بادئتي 64 بت تساوي نسبة التجزئتين كاملتين بخطأ نسبي < 2^-32 ما لم
+    تكن إحداهما صغيرة؛ تلك الأزواج النادرة يُعاد فحصها بالتجزئات كاملة إن أُعطيت.
+    
+    forward_prefixes: بادئات phi_hash للكتل الأمامية (hash_prefixes)
+    backward_prefixes: بادئات mirror_hash للكتل الخلفية
+    يُرجع: مصفوفة bool بنفس الطول (نفس نتيجة validate_symmetry)
+    """
+    phi = float(golden_ratio(10))
+    forward = forward_prefixes.astype(np.float64)
+    backward = backward_prefixes.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = forward / backward
+        result = (backward_prefixes != 0) & (np.abs(ratio - phi) / phi < SYMMETRY_TOLERANCE)
+    
+    short = np.flatnonzero((forward_prefixes < EXACT_BELOW) | (backward_prefixes < EXACT_BELOW))
+    if forward_hashes is not None and backward_hashes is not None:
+        for i in short:
+            result[i] = _symmetric(int(forward_hashes[i], 16), int(backward_hashes[i], 16), phi)
+    return result
+
+
+def _symmetric(forward_int: int, backward_int: int, phi: float) -> bool:
+    if backward_int == 0:
+        return False
+    return abs(forward_int / backward_int - phi) / phi < SYMMETRY_TOLERANCE
+
+
 # مثال تشغيلي
 if __name__ == "__main__":
     print("🧪 اختبار النواة العكسية الزمنية")
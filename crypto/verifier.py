@@ -0,0 +1,210 @@
+"""
+crypto/verifier.py: Batched signature verification for Φ-Chain
+
+This module implements a verification service for vote and block
+signatures. Signatures are queued as they arrive and verified in batches,
+split into chunks across a worker pool, and every successfully verified
+(message, signer, signature) triple is kept in a bounded cache so repeated
+votes and re-broadcast blocks are never verified twice.
+
+The default scheme matches ValidatorKeyManager: sha256(message + key).
+It is symmetric, so signers register the key used for signing; a real
+BLS scheme can be plugged in through the `scheme` argument.
+"""
+
+import hashlib
+import hmac
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# A signature scheme verifies (key, message, signature)
+Scheme = Callable[[str, str, str], bool]
+# A pending signature: (message, signer_id, signature)
+SignedItem = Tuple[str, str, str]
+
+# Default cache size (F_20 = 6765 verified signatures)
+DEFAULT_CACHE_SIZE = 6765
+
+
+def sha256_scheme(key: str, message: str, signature: str) -> bool:
+    """Verify a sha256(message + key) signature in constant time."""
+    expected = hashlib.sha256(f"{message}{key}".encode()).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def vote_message(block_hash: str, vote_type: str) -> str:
+    """Get the message a validator signs to vote on a block."""
+    return f"{block_hash}:{vote_type}"
+
+
+def _normalize(signature: Union[str, bytes, None]) -> str:
+    if signature is None:
+        return ""
+    if isinstance(signature, bytes):
+        return signature.hex()
+    return signature
+
+
+def _verify_chunk(scheme: Scheme, chunk: List[Tuple[str, str, str]]) -> List[bool]:
+    """Verify a chunk of (key, message, signature) in a worker."""
+    return [scheme(key, message, signature) for key, message, signature in chunk]
+
+
+class SignatureVerifier:
+    """
+    Batched, cached signature verification service.
+    """
+
+    def __init__(self, workers: int = 4, executor: str = "thread",
+                 min_parallel: int = 610, cache_size: int = DEFAULT_CACHE_SIZE,
+                 scheme: Scheme = sha256_scheme):
+        """
+        Initialize the verifier.
+
+        Args:
+            workers: Number of pool workers
+            executor: "thread", "process" or "inline" (no pool)
+            min_parallel: Smallest batch worth splitting across the pool
+            cache_size: Maximum number of cached verified signatures
+            scheme: The signature scheme (must be picklable for "process")
+        """
+        if executor not in ("thread", "process", "inline"):
+            raise ValueError(f"Unknown executor: {executor}")
+        self.workers = workers
+        self.executor_type = executor
+        self.min_parallel = min_parallel
+        self.cache_size = cache_size
+        self.scheme = scheme
+        self.keys: Dict[str, str] = {}
+        self.pending: List[SignedItem] = []
+        self._cache: Dict[SignedItem, bool] = {}
+        self._executor: Optional[Executor] = None
+        self.stats = {"verified": 0, "cache_hits": 0, "rejected": 0, "batches": 0}
+
+    # --- Signers ---
+
+    def register_signer(self, signer_id: str, key: str):
+        """Register the verification key for a signer."""
+        self.keys[signer_id] = key
+
+    # --- Single and batched verification ---
+
+    def verify(self, message: str, signer_id: str, signature: Union[str, bytes, None]) -> bool:
+        """
+        Verify one signature immediately (using the cache).
+
+        Args:
+            message: The signed message
+            signer_id: The signer's ID
+            signature: The signature (hex string or bytes)
+
+        Returns:
+            True if the signature is valid
+        """
+        return self.verify_batch([(message, signer_id, _normalize(signature))])[0]
+
+    def submit(self, message: str, signer_id: str, signature: Union[str, bytes, None]):
+        """Queue a signature for the next verify_pending() call."""
+        self.pending.append((message, signer_id, _normalize(signature)))
+
+    def submit_message(self, msg) -> None:
+        """Queue a consensus message (PipelinedBFTMessage-like) for verification."""
+        self.submit(vote_message(msg.block_hash, msg.msg_type), msg.validator_id, msg.signature)
+
+    def submit_block(self, block) -> None:
+        """Queue a block's proposer signature (over its hash) for verification."""
+        self.submit(block.hash, block.proposer, block.bls_signature)
+
+    def verify_pending(self) -> List[bool]:
+        """
+        Verify every queued signature as one batch.
+
+        Returns:
+            One result per submitted signature, in submission order
+        """
+        pending, self.pending = self.pending, []
+        return self.verify_batch(pending)
+
+    def verify_batch(self, items: List[SignedItem]) -> List[bool]:
+        """
+        Verify a batch of (message, signer_id, signature).
+
+        Cached signatures are answered immediately; the rest are split
+        into chunks across the worker pool.
+
+        Args:
+            items: The signatures to verify
+
+        Returns:
+            One result per item, in order
+        """
+        results = [False] * len(items)
+        todo: List[int] = []
+        cache = self._cache
+        keys = self.keys
+
+        for i, item in enumerate(items):
+            if item in cache:
+                results[i] = True
+            elif item[1] in keys and item[2]:
+                todo.append(i)
+        self.stats["cache_hits"] += results.count(True)
+
+        if todo:
+            jobs = [(keys[items[i][1]], items[i][0], items[i][2]) for i in todo]
+            self.stats["batches"] += 1
+            self.stats["verified"] += len(jobs)
+            for i, valid in zip(todo, self._run(jobs)):
+                if valid:
+                    results[i] = True
+                    cache[items[i]] = True
+            # Evict the oldest entries (dicts keep insertion order)
+            while len(cache) > self.cache_size:
+                del cache[next(iter(cache))]
+
+        self.stats["rejected"] += results.count(False)
+        return results
+
+    def _run(self, jobs: List[Tuple[str, str, str]]) -> List[bool]:
+        if self.executor_type == "inline" or self.workers <= 1 or len(jobs) < self.min_parallel:
+            return _verify_chunk(self.scheme, jobs)
+
+        size = -(-len(jobs) // self.workers)
+        chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+        executor = self._get_executor()
+        results: List[bool] = []
+        for chunk_results in executor.map(_verify_chunk, [self.scheme] * len(chunks), chunks):
+            results.extend(chunk_results)
+        return results
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+if __name__ == "__main__":
+    # Demonstrate batched vote verification with cache hits
+    verifier = SignatureVerifier(executor="inline")
+    keys = {f"validator_{i}": hashlib.sha256(str(i).encode()).hexdigest() for i in range(5)}
+    for signer, key in keys.items():
+        verifier.register_signer(signer, key)
+
+    message = vote_message("0xabc", "prepare")
+    for signer, key in keys.items():
+        verifier.submit(message, signer, hashlib.sha256(f"{message}{key}".encode()).hexdigest())
+    verifier.submit(message, "validator_0", "forged")
+    print(f"First batch: {verifier.verify_pending()}")
+
+    rebroadcast = hashlib.sha256(f"{message}{keys['validator_1']}".encode()).hexdigest()
+    print(f"Re-broadcast vote: {verifier.verify(message, 'validator_1', rebroadcast)}")
+    print(f"Stats: {verifier.stats}")
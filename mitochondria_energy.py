@@ -12,9 +12,14 @@ Mitochondria represents the "powerhouse" of the Φ-Chain, managing:
 """
 
 import numpy as np
-from typing import Dict, List, Tuple
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+from core.phi_math import PHI_FLOAT
 from phi_chain_core import FibonacciUtils, GenesisParameters
 
+# Cycles of production kept per organ (F_13 = 233)
+HISTORY_LENGTH = FibonacciUtils.fibonacci(13)
+
 
 class MitochondrialCell:
     """
@@ -43,7 +48,7 @@ class MitochondrialCell:
         self.production_rate = FibonacciUtils.fibonacci(tier + 5) / 100.0
         
         # Efficiency factor based on golden ratio
-        self.efficiency = 1.0 / FibonacciUtils.golden_ratio()
+        self.efficiency = 1.0 / PHI_FLOAT
     
     def produce_energy(self) -> float:
         """
@@ -76,6 +81,121 @@ class MitochondrialCell:
         return self.current_energy / self.max_energy
 
 
+class MitochondrialCells:
+    """
+    Structure-of-arrays store for many mitochondrial cells.
+    
+    Holds one NumPy vector per MitochondrialCell attribute, so a production
+    cycle over any number of cells is a single clip-add. Organs work on
+    contiguous slices (views) of one shared store.
+    """
+    
+    def __init__(self, tiers: np.ndarray):
+        """
+        Initialize the cells.
+        
+        Args:
+            tiers: The energy tier (1-6) of each cell
+        """
+        self.tier = np.asarray(tiers, dtype=np.int8)
+        fib = np.array([FibonacciUtils.fibonacci(k) for k in range(17)], dtype=np.float64)
+        
+        # Same parameters as MitochondrialCell, per tier
+        self.max_energy = fib[self.tier + 10]  # F_11 to F_16
+        self.current_energy = self.max_energy * 0.5  # Start at 50%
+        self.production_rate = fib[self.tier + 5] / 100.0
+        self.efficiency = np.full(len(self.tier), 1.0 / PHI_FLOAT)
+        self.refresh_output()
+        
+        # Prefix sums of current_energy for front-to-back draining, valid
+        # until the next production cycle; `_drained` energy has been taken
+        # from the front since and cells before `_cursor` are empty
+        self._prefix = None
+        self._drained = 0.0
+        self._cursor = 0
+    
+    @classmethod
+    def for_organs(cls, organ_count: int, cell_count: int) -> "MitochondrialCells":
+        """Cells for `organ_count` organs of `cell_count` cells, tiers 1-6 cycling per organ."""
+        tiers = np.tile(np.arange(cell_count) % 6 + 1, organ_count)
+        return cls(tiers)
+    
+    def __len__(self) -> int:
+        return len(self.tier)
+    
+    def refresh_output(self) -> None:
+        """Recompute the per-cycle output after changing rates or efficiencies."""
+        self.output = self.production_rate * self.efficiency
+    
+    def produce(self, cells: slice = slice(None)) -> None:
+        """Run one production cycle over `cells`, capping each at its capacity."""
+        self.invalidate()
+        current = self.current_energy[cells]
+        np.add(current, self.output[cells], out=current)
+        np.minimum(current, self.max_energy[cells], out=current)
+    
+    def invalidate(self) -> None:
+        """Drop the cached prefix sums (call after writing current_energy directly)."""
+        self._prefix = None
+    
+    def available(self) -> float:
+        """Total energy stored across all cells."""
+        if self._prefix is None:
+            return float(self.current_energy.sum())
+        return float(self._prefix[-1]) - self._drained if len(self._prefix) else 0.0
+    
+    def drain_front(self, amount: float) -> float:
+        """
+        Take up to `amount` from the cells in order, emptying each in turn.
+        
+        The prefix sums are built once per production cycle; after that
+        each call is a binary search for the draining boundary plus a slice
+        assignment over the cells it empties.
+        
+        Args:
+            amount: Amount of energy requested
+            
+        Returns:
+            Amount of energy actually provided
+        """
+        if self._prefix is None:
+            self._prefix = np.cumsum(self.current_energy)
+            self._drained = 0.0
+            self._cursor = 0
+        if amount <= 0 or not len(self._prefix):
+            return 0.0
+        target = min(self._drained + amount, float(self._prefix[-1]))
+        provided = target - self._drained
+        self._cursor = _drain_to(self.current_energy, self._prefix, self._cursor, target)
+        self._drained = target
+        return provided
+    
+    def drain(self, amount: float, cells: slice) -> float:
+        """Like drain_front, over the cells of one slice only."""
+        self.invalidate()
+        current = self.current_energy[cells]
+        if amount <= 0 or not len(current):
+            return 0.0
+        prefix = np.cumsum(current)
+        target = min(amount, float(prefix[-1]))
+        _drain_to(current, prefix, 0, target)
+        return target
+
+
+def _drain_to(current: np.ndarray, prefix: np.ndarray, start: int, target: float) -> int:
+    """
+    Empty `current` from the front until `target` (a prefix sum) is taken.
+    
+    Cells before `start` are already empty. Returns the index of the first
+    cell left holding energy.
+    """
+    boundary = int(np.searchsorted(prefix, target, side="right"))
+    current[start:boundary] = 0.0
+    if boundary < len(current):
+        current[boundary] = prefix[boundary] - target
+    return boundary
+
+
 class MitochondrialOrgan:
     """
     A collection of mitochondrial cells forming an energy-producing organ.
@@ -84,25 +204,31 @@ class MitochondrialOrgan:
     with redundancy and efficiency.
     """
     
-    def __init__(self, organ_id: int, cell_count: int = 144):
+    def __init__(self, organ_id: int, cell_count: int = 144,
+                 cells: MitochondrialCells = None, offset: int = 0):
         """
         Initialize a mitochondrial organ.
         
         Args:
             organ_id: Unique identifier for the organ
             cell_count: Number of cells (default F_12 = 144)
+            cells: Shared cell store to take cells from (a new one by default)
+            offset: Index of this organ's first cell in `cells`
         """
         self.organ_id = organ_id
-        self.cells = []
+        self.cell_count = cell_count
         
         # Create cells with varying tiers for diversity
-        for i in range(cell_count):
-            tier = (i % 6) + 1  # Tiers 1-6
-            self.cells.append(MitochondrialCell(i, tier))
+        if cells is None:
+            cells, offset = MitochondrialCells.for_organs(1, cell_count), 0
+        self.store = cells
+        self.cells = slice(offset, offset + cell_count)
+        self.current_energy = cells.current_energy[self.cells]
         
         # Organ-level parameters
         self.total_cycles = 0
-        self.energy_history = []
+        self.energy_history: Deque[float] = deque(maxlen=HISTORY_LENGTH)
+        self.capacity = float(cells.max_energy[self.cells].sum())
     
     def cycle(self) -> float:
         """
@@ -111,26 +237,28 @@ class MitochondrialOrgan:
         Returns:
             Total energy produced in this cycle
         """
-        total_produced = 0.0
-        for cell in self.cells:
-            total_produced += cell.produce_energy()
-        
+        self.store.produce(self.cells)
+        return self.record_cycle()
+    
+    @property
+    def cycle_output(self) -> float:
+        """Nominal energy produced per cycle, from the store's current output."""
+        return float(self.store.output[self.cells].sum())
+    
+    def record_cycle(self) -> float:
+        """Account for a cycle whose production the store already ran."""
+        output = self.cycle_output
         self.total_cycles += 1
-        self.energy_history.append(total_produced)
-        
-        # Keep history bounded
-        if len(self.energy_history) > FibonacciUtils.fibonacci(13):
-            self.energy_history.pop(0)
-        
-        return total_produced
+        self.energy_history.append(output)
+        return output
     
     def get_total_energy(self) -> float:
         """Get total energy stored across all cells."""
-        return sum(cell.current_energy for cell in self.cells)
+        return float(self.current_energy.sum())
     
     def get_total_capacity(self) -> float:
         """Get total energy capacity across all cells."""
-        return sum(cell.max_energy for cell in self.cells)
+        return self.capacity
     
     def get_charge_level(self) -> float:
         """Get overall charge level as a percentage (0-1)."""
@@ -148,16 +276,7 @@ class MitochondrialOrgan:
         Returns:
             Amount of energy actually provided
         """
-        remaining = amount
-        for cell in self.cells:
-            if remaining <= 0:
-                break
-            
-            available = min(cell.current_energy, remaining)
-            if cell.consume_energy(available):
-                remaining -= available
-        
-        return amount - remaining
+        return self.store.drain(amount, self.cells)
 
 
 class MitochondriaEnergySystem:
@@ -168,19 +287,25 @@ class MitochondriaEnergySystem:
     across the entire blockchain network.
     """
     
-    def __init__(self, genesis_params: GenesisParameters = None):
+    def __init__(self, genesis_params: GenesisParameters = None,
+                 organ_count: int = 5, cells_per_organ: int = 144):
         """
         Initialize the Mitochondria energy system.
         
         Args:
             genesis_params: The Φ-Chain genesis parameters
+            organ_count: Number of organs (default F_5 = 5)
+            cells_per_organ: Cells per organ (default F_12 = 144)
         """
         self.genesis_params = genesis_params or GenesisParameters()
         
-        # Create mitochondrial organs
+        # Create mitochondrial organs over one shared cell store
+        self.cells = MitochondrialCells.for_organs(organ_count, cells_per_organ)
         self.organs = []
-        for organ_id in range(1, 6):  # 5 organs (F_5 = 5)
-            self.organs.append(MitochondrialOrgan(organ_id))
+        for organ_id in range(1, organ_count + 1):
+            offset = (organ_id - 1) * cells_per_organ
+            self.organs.append(MitochondrialOrgan(organ_id, cells_per_organ, self.cells, offset))
+        self.total_capacity = float(self.cells.max_energy.sum())
         
         # Energy tiers based on Fibonacci
         self.energy_tiers = {
@@ -211,8 +336,10 @@ class MitochondriaEnergySystem:
             "system_charge": self.get_system_charge()
         }
         
+        # One clip-add over every cell, then per-organ bookkeeping
+        self.cells.produce()
         for organ in self.organs:
-            produced = organ.cycle()
+            produced = organ.record_cycle()
             cycle_data["organs_produced"].append(produced)
             cycle_data["total_produced"] += produced
             self.total_produced += produced
@@ -222,9 +349,8 @@ class MitochondriaEnergySystem:
     
     def get_system_charge(self) -> float:
         """Get overall system charge level (0-1)."""
-        total_energy = sum(organ.get_total_energy() for organ in self.organs)
-        total_capacity = sum(organ.get_total_capacity() for organ in self.organs)
-        return total_energy / total_capacity if total_capacity > 0 else 0.0
+        total_energy = float(self.cells.current_energy.sum())
+        return total_energy / self.total_capacity if self.total_capacity > 0 else 0.0
     
     def allocate_energy_to_validator(self, validator_id: str, tier: str) -> float:
         """
@@ -242,19 +368,38 @@ class MitochondriaEnergySystem:
         
         requested_energy = self.energy_tiers[tier]
         
-        # Try to allocate from organs in round-robin fashion
-        allocated = 0.0
-        for organ in self.organs:
-            if allocated >= requested_energy:
-                break
-            
-            remaining = requested_energy - allocated
-            provided = organ.distribute_energy(remaining)
-            allocated += provided
-        
+        # Organs are drained in order, which is the shared store's order
+        allocated = self.cells.drain_front(requested_energy)
         self.total_consumed += allocated
         return allocated
     
+    def allocate_many(self, validators: List[str], tiers: List[str]) -> List[float]:
+        """
+        Allocate energy to many validators in one pass.
+        
+        Gives the same allocations as calling allocate_energy_to_validator
+        for each validator in turn: requests are served in order until the
+        stored energy runs out.
+        
+        Args:
+            validators: The validators' identifiers
+            tiers: Each validator's energy tier ("tier_1" to "tier_6")
+            
+        Returns:
+            Amount of energy allocated to each validator
+        """
+        if len(validators) != len(tiers):
+            raise ValueError("validators and tiers must have the same length")
+        if not tiers:
+            return []
+        requested = np.array([self.energy_tiers.get(tier, 0) for tier in tiers], dtype=np.float64)
+        
+        # Cumulative demand, capped by what the store holds
+        served = np.minimum(np.cumsum(requested), self.cells.available())
+        allocated = np.diff(served, prepend=0.0)
+        self.total_consumed += self.cells.drain_front(float(served[-1]))
+        return allocated.tolist()
+    
     def get_energy_efficiency(self) -> float:
         """
         Calculate the overall energy efficiency of the system.
@@ -274,8 +419,7 @@ class MitochondriaEnergySystem:
         
         print("\n1. SYSTEM ARCHITECTURE:")
         print(f"   Organs: {len(self.organs)}")
-        total_cells = sum(len(organ.cells) for organ in self.organs)
-        print(f"   Total cells: {total_cells}")
+        print(f"   Total cells: {len(self.cells)}")
         
         print(f"\n2. ENERGY TIERS (Fibonacci-based):")
         for tier_name, energy in self.energy_tiers.items():
@@ -12,9 +12,32 @@ Nero represents the "brain" of the Φ-Chain, enabling:
 """
 
 import numpy as np
-from typing import Dict, List, Tuple
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Deque, Dict, List, Tuple
+from core.phi_math import PHI_FLOAT
 from phi_chain_core import FibonacciUtils, GenesisParameters
 
+# Average confidence above which a validator is a high performer
+HIGH_PERFORMER_SCORE = 0.8
+# Memories per trend window (F_5 = 5)
+TREND_WINDOW = FibonacciUtils.fibonacci(5)
+
+
+@lru_cache(maxsize=None)
+def fibonacci_weights(count: int) -> np.ndarray:
+    """Normalized weights F(1)..F(count), favouring the most recent entries."""
+    weights = []
+    a, b = 1, 1
+    for _ in range(count):
+        weights.append(a)
+        a, b = b, a + b
+    total = sum(weights)
+    vector = np.array([w / total for w in weights])
+    vector.flags.writeable = False
+    return vector
+
 
 class NeroNeuron:
     """
@@ -54,41 +77,61 @@ class NeroNeuron:
             weighted_sum += weight * value
         
         # Use golden ratio as activation function
-        phi = FibonacciUtils.golden_ratio()
-        self.activation = 1.0 / (1.0 + np.exp(-weighted_sum / phi))
+        self.activation = 1.0 / (1.0 + np.exp(-weighted_sum / PHI_FLOAT))
         return self.activation
 
 
 class NeroLayer:
     """
     A layer in the Nero network, containing Fibonacci-indexed neurons.
+    
+    The neurons are stored as one weight matrix (a row per neuron, a column
+    per input) and a bias vector, so a forward pass is a matrix product.
     """
     
-    def __init__(self, layer_id: int, neuron_count: int):
+    def __init__(self, layer_id: int, neuron_count: int, input_count: int):
         """
         Initialize a Nero layer.
         
         Args:
             layer_id: The layer index (determines Fibonacci properties)
             neuron_count: Number of neurons in this layer
+            input_count: Number of inputs (the previous layer's neuron count)
         """
         self.layer_id = layer_id
-        self.neurons = [NeroNeuron(i, layer_id) for i in range(neuron_count)]
+        self.neuron_count = neuron_count
+        self.weights = np.zeros((neuron_count, input_count))  # Connections to inputs
+        self.bias = np.full(neuron_count, FibonacciUtils.fibonacci(layer_id) / 1000.0)  # Fibonacci-scaled bias
     
-    def forward(self, inputs: Dict[int, float]) -> Dict[int, float]:
+    def forward(self, inputs: np.ndarray) -> np.ndarray:
         """
         Forward pass through the layer.
         
+        Inputs past the weight matrix's width have no connection and are
+        ignored; missing inputs count as zero.
+        
         Args:
-            inputs: Dictionary of input activations
+            inputs: An input vector, or a matrix with one input vector per row
             
         Returns:
-            Dictionary of output activations
+            The output activations, one row per input row
         """
-        outputs = {}
-        for neuron in self.neurons:
-            outputs[neuron.neuron_id] = neuron.activate(inputs)
-        return outputs
+        inputs = np.asarray(inputs, dtype=np.float64)
+        width = self.weights.shape[1]
+        if inputs.shape[-1] != width:
+            fitted = np.zeros(inputs.shape[:-1] + (width,))
+            count = min(width, inputs.shape[-1])
+            fitted[..., :count] = inputs[..., :count]
+            inputs = fitted
+        
+        # Use golden ratio as activation function: 1 / (1 + exp(-z / φ)),
+        # evaluated in place on the weighted sums
+        z = inputs @ self.weights.T
+        z += self.bias
+        z *= -1.0 / PHI_FLOAT
+        np.exp(z, out=z)
+        z += 1.0
+        return np.reciprocal(z, out=z)
 
 
 class NeroPhiNetwork:
@@ -99,12 +142,13 @@ class NeroPhiNetwork:
     consensus dynamics to optimize the blockchain's operation.
     """
     
-    def __init__(self, genesis_params: GenesisParameters = None):
+    def __init__(self, genesis_params: GenesisParameters = None, input_count: int = 4):
         """
         Initialize the Nero network.
         
         Args:
             genesis_params: The Φ-Chain genesis parameters
+            input_count: Number of performance metrics fed to the first layer
         """
         self.genesis_params = genesis_params or GenesisParameters()
         
@@ -112,14 +156,22 @@ class NeroPhiNetwork:
         self.layers = []
         for layer_id in range(1, 7):  # 6 layers (F_1 to F_6)
             neuron_count = FibonacciUtils.fibonacci(layer_id + 3)  # F_4 to F_9
-            self.layers.append(NeroLayer(layer_id, neuron_count))
+            self.layers.append(NeroLayer(layer_id, neuron_count, input_count))
+            input_count = neuron_count
         
         # Learning rate based on golden ratio
-        self.learning_rate = 1.0 / self.genesis_params.phi
+        self.learning_rate = 1.0 / self.genesis_params.PHI
         
         # Memory for pattern recognition
-        self.memory = []
+        self.memory: Deque[Dict] = deque()
         self.max_memory = FibonacciUtils.fibonacci(13)  # 233 memories
+        
+        # Per-validator view of memory: confidences oldest first, their
+        # running sums, and the validators whose mean is above
+        # HIGH_PERFORMER_SCORE (a dict used as an ordered set)
+        self.validator_memory: Dict[str, Deque[float]] = {}
+        self._confidence_sums: Dict[str, float] = {}
+        self._high_performers: Dict[str, None] = {}
     
     def learn_validator_behavior(self, validator_id: str, performance_metrics: Dict) -> float:
         """
@@ -133,32 +185,113 @@ class NeroPhiNetwork:
             The learned confidence score (0-1)
         """
         # Create input vector from metrics
-        metric_values = list(performance_metrics.values())
-        inputs = {i: v for i, v in enumerate(metric_values)}
+        inputs = np.fromiter(performance_metrics.values(), dtype=np.float64,
+                             count=len(performance_metrics))
+        confidence = float(self.score(inputs))
+        self._remember(validator_id, performance_metrics, confidence)
+        return confidence
+    
+    def learn_validator_behavior_many(self, validator_ids: List[str], metrics_matrix: np.ndarray) -> np.ndarray:
+        """
+        Learn from many validators at once.
+        
+        Scores every row in one forward pass and records the rows in memory
+        in order, as learn_validator_behavior would one by one.
+        
+        Args:
+            validator_ids: The validators' identifiers
+            metrics_matrix: One row of performance metrics per validator
+            
+        Returns:
+            The learned confidence scores (0-1), one per validator
+        """
+        metrics_matrix = np.asarray(metrics_matrix, dtype=np.float64)
+        if metrics_matrix.ndim != 2 or len(metrics_matrix) != len(validator_ids):
+            raise ValueError("metrics_matrix needs one row per validator")
+        confidences = self.score(metrics_matrix)
+        
+        # Only the last max_memory rows would survive in memory
+        held = len(self.memory)
+        start = max(0, len(validator_ids) - self.max_memory)
+        for i in range(start, len(validator_ids)):
+            self._remember(validator_ids[i], metrics_matrix[i], float(confidences[i]),
+                           min(held + i, self.max_memory))
+        return confidences
+    
+    def score(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Forward pass through the network.
         
-        # Forward pass through network
+        Args:
+            inputs: A metrics vector, or a matrix with one metrics vector per row
+            
+        Returns:
+            The confidence (mean final-layer activation) for each input
+        """
         layer_outputs = inputs
         for layer in self.layers:
             layer_outputs = layer.forward(layer_outputs)
         
-        # Compute confidence from final layer
-        final_activations = list(layer_outputs.values())
-        confidence = np.mean(final_activations) if final_activations else 0.0
-        
-        # Store in memory
+        # Compute confidence from final layer (a mean, as a matrix-vector product)
+        width = layer_outputs.shape[-1]
+        return layer_outputs @ np.full(width, 1.0 / width)
+    
+    def _remember(self, validator_id: str, metrics, confidence: float, timestamp: int = None) -> None:
+        """Store a learned confidence in memory."""
         memory_entry = {
             "validator_id": validator_id,
-            "metrics": performance_metrics,
+            "metrics": metrics,
             "confidence": confidence,
-            "timestamp": len(self.memory)
+            "timestamp": len(self.memory) if timestamp is None else timestamp
         }
         self.memory.append(memory_entry)
+        self._track(validator_id, confidence)
         
         # Keep memory bounded
         if len(self.memory) > self.max_memory:
-            self.memory.pop(0)
+            evicted = self.memory.popleft()
+            self._untrack(evicted["validator_id"])
+    
+    def _track(self, validator_id: str, confidence: float) -> None:
+        """Add a confidence to the validator's history."""
+        history = self.validator_memory.get(validator_id)
+        if history is None:
+            history = self.validator_memory[validator_id] = deque()
+            self._confidence_sums[validator_id] = 0.0
+        history.append(confidence)
+        self._confidence_sums[validator_id] += confidence
+        self._classify(validator_id)
+    
+    def _untrack(self, validator_id: str) -> None:
+        """Drop the validator's oldest confidence (evicted from memory)."""
+        history = self.validator_memory[validator_id]
+        oldest = history.popleft()
+        if not history:
+            del self.validator_memory[validator_id]
+            del self._confidence_sums[validator_id]
+            self._high_performers.pop(validator_id, None)
+            return
+        self._confidence_sums[validator_id] -= oldest
+        self._classify(validator_id)
+    
+    def _classify(self, validator_id: str) -> None:
+        """Update the validator's high performer membership."""
+        if self.get_validator_mean(validator_id) > HIGH_PERFORMER_SCORE:
+            self._high_performers[validator_id] = None
+        else:
+            self._high_performers.pop(validator_id, None)
+    
+    def get_validator_mean(self, validator_id: str) -> float:
+        """
+        Average learned confidence of a validator over memory, in O(1).
         
-        return confidence
+        Returns:
+            The mean confidence, or 0.0 for validators not in memory
+        """
+        history = self.validator_memory.get(validator_id)
+        if not history:
+            return 0.0
+        return self._confidence_sums[validator_id] / len(history)
     
     def predict_validator_quality(self, validator_id: str) -> float:
         """
@@ -170,23 +303,15 @@ class NeroPhiNetwork:
         Returns:
             A quality score (0-1)
         """
-        # Find validator's history in memory
-        validator_history = [m for m in self.memory if m["validator_id"] == validator_id]
+        # The validator's history in memory
+        history = self.validator_memory.get(validator_id)
         
-        if not validator_history:
+        if not history:
             return 0.5  # Neutral for unknown validators
         
-        # Compute weighted average of confidences
-        confidences = [m["confidence"] for m in validator_history]
-        weights = [FibonacciUtils.fibonacci(i + 1) for i in range(len(confidences))]
-        
-        # Normalize weights
-        total_weight = sum(weights)
-        normalized_weights = [w / total_weight for w in weights]
-        
-        # Weighted average
-        quality = sum(c * w for c, w in zip(confidences, normalized_weights))
-        return quality
+        # Fibonacci-weighted average of confidences, newest weighted most
+        confidences = np.fromiter(history, dtype=np.float64, count=len(history))
+        return float(confidences @ fibonacci_weights(len(history)))
     
     def recognize_patterns(self) -> List[Dict]:
         """
@@ -197,36 +322,28 @@ class NeroPhiNetwork:
         """
         patterns = []
         
-        if len(self.memory) < FibonacciUtils.fibonacci(5):  # Need at least 5 memories
+        if len(self.memory) < TREND_WINDOW:  # Need at least 5 memories
             return patterns
         
         # Pattern 1: High-performing validators
-        validator_scores = {}
-        for entry in self.memory:
-            v_id = entry["validator_id"]
-            if v_id not in validator_scores:
-                validator_scores[v_id] = []
-            validator_scores[v_id].append(entry["confidence"])
-        
-        for v_id, scores in validator_scores.items():
-            avg_score = np.mean(scores)
-            if avg_score > 0.8:
-                patterns.append({
-                    "type": "high_performer",
-                    "validator_id": v_id,
-                    "score": avg_score
-                })
+        for v_id in self._high_performers:
+            patterns.append({
+                "type": "high_performer",
+                "validator_id": v_id,
+                "score": self.get_validator_mean(v_id)
+            })
         
         # Pattern 2: Improving validators
-        if len(self.memory) >= 2 * FibonacciUtils.fibonacci(5):
-            recent_scores = [m["confidence"] for m in self.memory[-FibonacciUtils.fibonacci(5):]]
-            older_scores = [m["confidence"] for m in self.memory[-2*FibonacciUtils.fibonacci(5):-FibonacciUtils.fibonacci(5)]]
+        if len(self.memory) >= 2 * TREND_WINDOW:
+            latest = [m["confidence"] for m in islice(reversed(self.memory), 2 * TREND_WINDOW)]
+            recent_avg = np.mean(latest[:TREND_WINDOW])
+            older_avg = np.mean(latest[TREND_WINDOW:])
             
-            if np.mean(recent_scores) > np.mean(older_scores):
+            if recent_avg > older_avg:
                 patterns.append({
                     "type": "improving_trend",
-                    "recent_avg": np.mean(recent_scores),
-                    "older_avg": np.mean(older_scores)
+                    "recent_avg": recent_avg,
+                    "older_avg": older_avg
                 })
         
         return patterns
@@ -240,7 +357,7 @@ class NeroPhiNetwork:
         print("\n1. NETWORK ARCHITECTURE:")
         print(f"   Layers: {len(self.layers)}")
         for layer in self.layers:
-            print(f"   Layer {layer.layer_id}: {len(layer.neurons)} neurons")
+            print(f"   Layer {layer.layer_id}: {layer.neuron_count} neurons")
         
         print(f"\n2. LEARNING PARAMETERS:")
         print(f"   Learning rate: {self.learning_rate:.6f}")
@@ -0,0 +1,261 @@
+"""
+network/compact.py: Compact block relay for Φ-Chain gossip
+
+A compact block announcement carries the block header and a 6-byte short
+ID per transaction instead of the full transaction list. Short IDs are
+keyed blake2b digests of the transaction hash, with the key (salt)
+derived from the block hash and a per-announcement nonce. An attacker
+therefore cannot precompute colliding transactions.
+
+Receivers rebuild the block from their mempool and request only the
+missing transactions from the announcing peer (GET_BLOCK_TXN ->
+BLOCK_TXN). The rebuilt block must hash to the announced header, whose
+tx_root commits to the transaction list, so a short-ID collision is
+detected and resolved by fetching the full transaction list.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import sys
+sys.path.insert(0, '..')
+from core.events import get_channel
+from network.gossip import GossipNode, COMPACT_BLOCK, GET_BLOCK_TXN, BLOCK_TXN
+from network.transport import MAX_FRAME_SIZE
+from phi_chain import PhiBlock, PhiTransaction
+
+events = get_channel("compact")
+
+SHORT_ID_SIZE = 6
+
+# Most transactions one announcement can describe (one short ID each per frame)
+MAX_COMPACT_TXS = MAX_FRAME_SIZE // SHORT_ID_SIZE
+
+# Recent full blocks kept to answer GET_BLOCK_TXN (F_10 = 55)
+RECENT_BLOCKS = 55
+
+# Blocks awaiting missing transactions; the oldest is dropped past this (F_7 = 13)
+PARTIAL_BLOCKS = 13
+
+
+def compact_salt(block_hash: str, nonce: int) -> bytes:
+    """Derive the short-ID key for one announcement."""
+    return hashlib.sha256(bytes.fromhex(block_hash) + nonce.to_bytes(8, "little")).digest()[:16]
+
+
+def short_id(tx_hash: str, salt: bytes) -> bytes:
+    """Get the 6-byte short ID of a transaction hash."""
+    return hashlib.blake2b(bytes.fromhex(tx_hash), key=salt, digest_size=SHORT_ID_SIZE).digest()
+
+
+def compact_is_well_formed(message: Dict[str, Any]) -> bool:
+    """
+    Check that an announcement's transaction count matches its contents.
+
+    The count must be within MAX_COMPACT_TXS and equal the number of short
+    IDs plus prefilled transactions, whose indexes must be distinct and
+    below the count.
+    """
+    count = message.get("count")
+    short_ids = message.get("short_ids")
+    prefilled = message.get("prefilled")
+    if not isinstance(count, int) or not 0 <= count <= MAX_COMPACT_TXS:
+        return False
+    if not isinstance(short_ids, str) or not isinstance(prefilled, dict):
+        return False
+    if len(short_ids) % (2 * SHORT_ID_SIZE) or count != len(short_ids) // (2 * SHORT_ID_SIZE) + len(prefilled):
+        return False
+    indexes = set()
+    for index in prefilled:
+        if not (isinstance(index, str) and index.isdigit() and int(index) < count):
+            return False
+        indexes.add(int(index))
+    return len(indexes) == len(prefilled)
+
+
+def make_compact(block: PhiBlock, nonce: Optional[int] = None,
+                 prefill: Iterable[int] = ()) -> Dict[str, Any]:
+    """
+    Build a compact announcement for a block.
+
+    Args:
+        block: The full block
+        nonce: Salt nonce (random if omitted)
+        prefill: Transaction indexes to send in full (ones peers are unlikely to have)
+
+    Returns:
+        The compact block message
+    """
+    if nonce is None:
+        nonce = int.from_bytes(os.urandom(8), "little")
+    salt = compact_salt(block.hash, nonce)
+    prefill = set(prefill)
+    return {
+        "header": block.to_dict(transactions=False),
+        "nonce": nonce,
+        "count": len(block.transactions),
+        "short_ids": b"".join(short_id(tx.hash, salt) for i, tx in enumerate(block.transactions)
+                              if i not in prefill).hex(),
+        "prefilled": {str(i): block.transactions[i].to_dict() for i in sorted(prefill)},
+    }
+
+
+class CompactBlockRelay:
+    """
+    Announces blocks as compact blocks and rebuilds received ones from the mempool.
+    """
+
+    def __init__(self, gossip: GossipNode,
+                 mempool: Callable[[], Iterable[PhiTransaction]],
+                 on_block: Callable[[PhiBlock, Optional[str]], bool],
+                 recent_blocks: int = RECENT_BLOCKS,
+                 partial_blocks: int = PARTIAL_BLOCKS):
+        """
+        Attach compact relay to a gossip node.
+
+        Args:
+            gossip: The gossip node
+            mempool: Returns the transactions currently held in the mempool
+            on_block: Called with each rebuilt block and the announcing peer
+            recent_blocks: Number of full blocks kept to serve missing transactions
+            partial_blocks: Number of incomplete blocks kept while their
+                missing transactions are fetched
+        """
+        self.gossip = gossip
+        self.mempool = mempool
+        self.on_block = on_block
+        self.recent_blocks = recent_blocks
+        self.partial_blocks = partial_blocks
+        self.blocks: "OrderedDict[str, PhiBlock]" = OrderedDict()
+        # block hash -> (header, transaction slots, announcing peer, fetching all txs)
+        self.partial: "OrderedDict[str, Tuple[Dict[str, Any], List[Optional[PhiTransaction]], str, bool]]" = OrderedDict()
+        # block hash -> requests received before the block was rebuilt
+        self.waiting: Dict[str, List[Tuple[str, List[int]]]] = {}
+        self.stats = {"announced": 0, "received": 0, "reconstructed": 0,
+                      "round_trips": 0, "missing_txs": 0, "collisions": 0, "failed": 0,
+                      "evicted": 0}
+
+        gossip.subscribe(COMPACT_BLOCK, self._on_compact)
+        gossip.on_direct(GET_BLOCK_TXN, self._on_get_block_txn)
+        gossip.on_direct(BLOCK_TXN, self._on_block_txn)
+
+    def _remember(self, block: PhiBlock):
+        self.blocks[block.hash] = block
+        if len(self.blocks) > self.recent_blocks:
+            self.blocks.popitem(last=False)
+
+    def _await_transactions(self, block_hash: str, header: Dict[str, Any],
+                            slots: List[Optional[PhiTransaction]], source: Optional[str],
+                            full_fetch: bool, indexes: List[int]):
+        """Keep an incomplete block and request its missing transactions."""
+        self.partial[block_hash] = (header, slots, source, full_fetch)
+        # Announcements that are never completed must not accumulate
+        while len(self.partial) > self.partial_blocks:
+            evicted, _ = self.partial.popitem(last=False)
+            self.waiting.pop(evicted, None)
+            self.stats["evicted"] += 1
+        self.gossip.send(source, GET_BLOCK_TXN, {"block_hash": block_hash, "indexes": indexes})
+
+    def announce(self, block: PhiBlock, prefill: Iterable[int] = ()) -> int:
+        """
+        Announce a locally produced block.
+
+        Returns:
+            The number of peers the announcement was queued for
+        """
+        self._remember(block)
+        self.stats["announced"] += 1
+        return self.gossip.publish(COMPACT_BLOCK, make_compact(block, prefill=prefill))
+
+    # --- Receiving ---
+
+    def _on_compact(self, message: Dict[str, Any], source: Optional[str]) -> bool:
+        header = message["header"]
+        block_hash = header["hash"]
+        # Relay only announcements whose header is self-consistent and whose
+        # count matches their contents (it sizes the transaction slots)
+        if not compact_is_well_formed(message) or PhiBlock.header_hash(header) != block_hash:
+            self.stats["failed"] += 1
+            return False
+        self.stats["received"] += 1
+        if block_hash in self.blocks or block_hash in self.partial:
+            return True
+
+        slots: List[Optional[PhiTransaction]] = [None] * message["count"]
+        for index, tx in message["prefilled"].items():
+            slots[int(index)] = PhiTransaction.from_dict(tx)
+
+        salt = compact_salt(block_hash, message["nonce"])
+        available: Dict[bytes, Optional[PhiTransaction]] = {}
+        for tx in self.mempool():
+            sid = short_id(tx.hash, salt)
+            # Two mempool transactions with the same short ID: fetch that one
+            available[sid] = None if sid in available else tx
+
+        ids = bytes.fromhex(message["short_ids"])
+        open_slots = [i for i, tx in enumerate(slots) if tx is None]
+        for n, index in enumerate(open_slots):
+            slots[index] = available.get(ids[n * SHORT_ID_SIZE:(n + 1) * SHORT_ID_SIZE])
+
+        missing = [i for i, tx in enumerate(slots) if tx is None]
+        if missing:
+            self.stats["round_trips"] += 1
+            self.stats["missing_txs"] += len(missing)
+            self._await_transactions(block_hash, header, slots, source, False, missing)
+            return True
+
+        self._complete(header, slots, source)
+        return True
+
+    def _complete(self, header: Dict[str, Any], slots: List[PhiTransaction],
+                  source: Optional[str], full_fetch: bool = False):
+        block_hash = header["hash"]
+        try:
+            block = PhiBlock.from_dict(header, transactions=slots)
+        except ValueError:
+            self.partial.pop(block_hash, None)
+            if full_fetch or source is None:
+                self.stats["failed"] += 1
+                self.waiting.pop(block_hash, None)
+                return
+            # A short-ID collision picked the wrong transaction: fetch them all
+            self.stats["collisions"] += 1
+            self._await_transactions(block_hash, header, [None] * len(slots), source, True,
+                                     list(range(len(slots))))
+            return
+
+        self.partial.pop(block_hash, None)
+        self.stats["reconstructed"] += 1
+        self._remember(block)
+        for peer, indexes in self.waiting.pop(block_hash, []):
+            self._serve(peer, block, indexes)
+        self.on_block(block, source)
+
+    # --- Missing transactions ---
+
+    def _serve(self, peer: str, block: PhiBlock, indexes: List[int]):
+        txs = block.transactions
+        self.gossip.send(peer, BLOCK_TXN, {
+            "block_hash": block.hash,
+            "transactions": {str(i): txs[i].to_dict() for i in indexes if 0 <= i < len(txs)},
+        })
+
+    def _on_get_block_txn(self, request: Dict[str, Any], source: Optional[str]):
+        block_hash = request["block_hash"]
+        block = self.blocks.get(block_hash)
+        if block is not None:
+            self._serve(source, block, request["indexes"])
+        elif block_hash in self.partial:
+            # We relayed the announcement before rebuilding it; answer once rebuilt
+            self.waiting.setdefault(block_hash, []).append((source, request["indexes"]))
+
+    def _on_block_txn(self, response: Dict[str, Any], source: Optional[str]):
+        partial = self.partial.get(response["block_hash"])
+        if partial is None:
+            return
+        header, slots, announcer, full_fetch = partial
+        for index, tx in response["transactions"].items():
+            slots[int(index)] = PhiTransaction.from_dict(tx)
+        if all(tx is not None for tx in slots):
+            self._complete(header, slots, announcer, full_fetch)
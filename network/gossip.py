@@ -0,0 +1,236 @@
+"""
+network/gossip.py: Gossip layer for Φ-Chain transactions, blocks and votes
+
+Every message is identified by sha256(type + payload). A node handles and
+relays each message at most once: ids are remembered in a bounded
+seen-cache, so a message flooded around the mesh stops after one hop per
+node. Payloads are relayed as the raw bytes received, without re-encoding,
+to every peer except the one it came from. A handler can stop the relay
+by returning False (e.g. for an invalid block). Direct message types
+(requests and their responses) go to a single peer and are never relayed.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+import sys
+sys.path.insert(0, '..')
+from core.events import get_channel
+from network.transport import Peer, Transport, DEFAULT_QUEUE_SIZE
+
+events = get_channel("gossip")
+
+# Gossip message types (0 is the transport HELLO), flooded to every node
+TX = 1
+BLOCK = 2
+VOTE = 3
+COMPACT_BLOCK = 4
+MESSAGE_TYPES = (TX, BLOCK, VOTE, COMPACT_BLOCK)
+
+# Direct message types, sent to one peer and never relayed
+GET_BLOCK_TXN = 5
+BLOCK_TXN = 6
+GET_HEADERS = 7
+HEADERS = 8
+GET_BODIES = 9
+BODIES = 10
+DIRECT_TYPES = (GET_BLOCK_TXN, BLOCK_TXN, GET_HEADERS, HEADERS, GET_BODIES, BODIES)
+
+# Seen-cache bound (F_20 = 6765 message ids)
+SEEN_CACHE_SIZE = 6765
+
+# Handlers receive the decoded message and the sending node's ID (None if local)
+Handler = Callable[[Any, Optional[str]], Optional[bool]]
+
+
+def message_id(msg_type: int, payload: bytes) -> bytes:
+    """Get the gossip ID of a message."""
+    return hashlib.sha256(bytes((msg_type,)) + payload).digest()
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode a message as compact, canonical JSON."""
+    return json.dumps(message, sort_keys=True, separators=(",", ":")).encode()
+
+
+class GossipNode:
+    """
+    Flood gossip with seen-message deduplication over a Transport.
+    """
+
+    def __init__(self, node_id: str, port: int = 0, host: str = "127.0.0.1",
+                 peers: Optional[List[int]] = None, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 seen_size: int = SEEN_CACHE_SIZE):
+        """
+        Initialize a gossip node.
+
+        Args:
+            node_id: This node's ID
+            port: Port to listen on (0 picks a free port)
+            host: Interface to listen on
+            peers: Peer ports to keep connected to
+            queue_size: Per-peer send queue bound
+            seen_size: Number of message ids remembered for deduplication
+        """
+        self.node_id = node_id
+        self.peer_ports = list(peers or [])
+        self.transport = Transport(node_id, host, port, queue_size)
+        self.transport.on_message = self._on_frame
+        self.handlers: Dict[int, List[Handler]] = {t: [] for t in MESSAGE_TYPES}
+        self.direct_handlers: Dict[int, Handler] = {}
+        self.seen_size = seen_size
+        self._seen: "OrderedDict[bytes, None]" = OrderedDict()
+        self.stats = {"received": 0, "duplicates": 0, "relayed": 0, "published": 0, "invalid": 0}
+
+    @classmethod
+    def from_config(cls, path: str, **kwargs) -> "GossipNode":
+        """
+        Create a node from a validator config (config/validators/node_*.json).
+
+        Args:
+            path: Path to the config file
+            **kwargs: Extra GossipNode arguments
+
+        Returns:
+            The gossip node, listening on the configured port once started
+        """
+        with open(path) as f:
+            config = json.load(f)
+        return cls(config["validator_id"], port=config["port"], peers=config.get("peers", []), **kwargs)
+
+    @property
+    def port(self) -> int:
+        return self.transport.port
+
+    # --- Lifecycle ---
+
+    async def start(self):
+        """Start listening and dialling the configured peers."""
+        await self.transport.start()
+        self.transport.connect_peers(self.peer_ports)
+
+    async def wait_for_peers(self, count: Optional[int] = None, timeout: float = 10.0) -> bool:
+        """Wait until `count` peers (default: every configured peer) are connected."""
+        return await self.transport.wait_for_peers(
+            len(self.peer_ports) if count is None else count, timeout)
+
+    async def close(self):
+        await self.transport.close()
+
+    # --- Messages ---
+
+    def subscribe(self, msg_type: int, handler: Handler):
+        """
+        Register a handler for a message type.
+
+        Returning False from the handler stops the message being relayed.
+        """
+        if msg_type not in self.handlers:
+            raise ValueError(f"Unknown message type: {msg_type}")
+        self.handlers[msg_type].append(handler)
+
+    def on_direct(self, msg_type: int, handler: Handler):
+        """Register the handler for a direct (request/response) message type."""
+        if msg_type not in DIRECT_TYPES:
+            raise ValueError(f"Unknown direct message type: {msg_type}")
+        self.direct_handlers[msg_type] = handler
+
+    def send(self, node_id: str, msg_type: int, message: Dict[str, Any]) -> bool:
+        """Send a direct message to one peer."""
+        if msg_type not in DIRECT_TYPES:
+            raise ValueError(f"Unknown direct message type: {msg_type}")
+        return self.transport.send(node_id, msg_type, encode_message(message))
+
+    def _mark_seen(self, msg_id: bytes) -> bool:
+        """Remember a message id; returns False if it was already seen."""
+        seen = self._seen
+        if msg_id in seen:
+            return False
+        seen[msg_id] = None
+        if len(seen) > self.seen_size:
+            seen.popitem(last=False)
+        return True
+
+    def _dispatch(self, msg_type: int, message: Any, source: Optional[str]) -> bool:
+        valid = True
+        for handler in self.handlers[msg_type]:
+            try:
+                if handler(message, source) is False:
+                    valid = False
+            except Exception as e:
+                events.error("%s handler failed for type %d: %s", self.node_id, msg_type, e)
+                valid = False
+        return valid
+
+    def publish(self, msg_type: int, message: Dict[str, Any]) -> int:
+        """
+        Publish a message originating at this node.
+
+        Local handlers are not called; the caller already has the message.
+
+        Returns:
+            The number of peers it was queued for
+        """
+        if msg_type not in self.handlers:
+            raise ValueError(f"Unknown message type: {msg_type}")
+        payload = encode_message(message)
+        if not self._mark_seen(message_id(msg_type, payload)):
+            return 0
+        self.stats["published"] += 1
+        return self.transport.broadcast(msg_type, payload)
+
+    def _on_frame(self, peer: Peer, msg_type: int, payload: bytes):
+        if msg_type in self.direct_handlers:
+            try:
+                self.direct_handlers[msg_type](json.loads(payload), peer.node_id)
+            except Exception as e:
+                events.error("%s direct handler failed for type %d: %s", self.node_id, msg_type, e)
+                self.stats["invalid"] += 1
+            return
+        if msg_type not in self.handlers:
+            self.stats["invalid"] += 1
+            return
+        self.stats["received"] += 1
+        if not self._mark_seen(message_id(msg_type, payload)):
+            self.stats["duplicates"] += 1
+            return
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            self.stats["invalid"] += 1
+            return
+        if not self._dispatch(msg_type, message, peer.node_id):
+            self.stats["invalid"] += 1
+            return
+        self.stats["relayed"] += self.transport.broadcast(msg_type, payload, exclude=peer.node_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get gossip and transport counters."""
+        stats = dict(self.stats)
+        stats.update(self.transport.get_stats())
+        return stats
+
+
+if __name__ == "__main__":
+    # Demonstrate a 3-node line topology relaying a transaction end to end
+    async def demo():
+        nodes = [GossipNode(f"node_{i}") for i in range(3)]
+        for node in nodes:
+            await node.start()
+        # Each side lists the other; only the lower port dials
+        nodes[0].transport.connect_peers([nodes[1].port])
+        nodes[1].transport.connect_peers([nodes[0].port, nodes[2].port])
+        nodes[2].transport.connect_peers([nodes[1].port])
+        await nodes[1].wait_for_peers(2)
+
+        received = asyncio.Event()
+        nodes[2].subscribe(TX, lambda tx, source: received.set())
+        nodes[0].publish(TX, {"sender": "alice", "recipient": "bob", "value": 21})
+        await asyncio.wait_for(received.wait(), 5.0)
+        for node in nodes:
+            print(f"{node.node_id}: {node.get_stats()}")
+            await node.close()
+
+    asyncio.run(demo())
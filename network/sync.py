@@ -0,0 +1,363 @@
+"""
+network/sync.py: Headers-first fast sync for Φ-Chain
+
+A fresh (or lagging) node catches up in two phases:
+
+1. Headers: the header chain above the local tip is downloaded in height
+   ranges from several peers at once. Each range is validated on its own
+   as soon as it arrives: header hashes, index sequence, previous_hash
+   links and the f_vector progression. The range's first f_vector is
+   checked with a Q-matrix jump (PhiState.metrics_at, O(log n)), so no
+   earlier header is needed. Ranges are then stitched together and linked
+   to the local tip.
+
+2. Bodies: transaction lists are fetched in parallel, in height ranges,
+   from every peer at the target height. Each body must reproduce its
+   header's hash, whose tx_root commits to the transactions. Blocks are
+   applied in order through Blockchain.add_block as soon as the next
+   range is complete. Workers stay within a window of the applied height,
+   which bounds memory.
+
+Every node also serves GET_HEADERS / GET_BODIES from its own chain.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+import sys
+sys.path.insert(0, '..')
+from core.events import get_channel
+from network.gossip import GossipNode, GET_HEADERS, HEADERS, GET_BODIES, BODIES
+from phi_chain import Blockchain, PhiBlock, PhiTransaction, wrap_int64
+
+events = get_channel("sync")
+
+# Headers per request (F_17 = 1597) and blocks per body request (F_13 = 233)
+HEADER_BATCH = 1597
+BODY_BATCH = 233
+
+# Concurrent requests per peer, and how far ahead of the applied height
+# body downloads may run (in body ranges)
+REQUESTS_PER_PEER = 2
+BODY_WINDOW = 13
+
+Range = Tuple[int, int]
+
+
+def validate_header_range(headers: List[Dict[str, Any]], start: int) -> bool:
+    """
+    Validate a contiguous range of headers without any earlier header.
+
+    Args:
+        headers: Headers for heights start, start + 1, ...
+        start: Height of the first header
+
+    Returns:
+        True if every hash, index, link and f_vector checks out
+    """
+    if not headers:
+        return False
+    expected = Blockchain.expected_f_vector(start)
+    previous = None
+    for offset, header in enumerate(headers):
+        if header["index"] != start + offset:
+            return False
+        if PhiBlock.header_hash(header) != header["hash"]:
+            return False
+        if previous is not None and header["previous_hash"] != previous["hash"]:
+            return False
+        if tuple(header["f_vector"]) != expected:
+            return False
+        # Blocks 0 and 1 share the initial state; after that each is one Q step
+        if start + offset >= 1:
+            a, b = expected
+            expected = (wrap_int64(a + b), a)
+        previous = header
+    return True
+
+
+def split_ranges(start: int, end: int, size: int) -> List[Range]:
+    """Split heights [start, end) into ranges of at most `size`."""
+    return [(lo, min(lo + size, end)) for lo in range(start, end, size)]
+
+
+class ChainSync:
+    """
+    Serves headers and bodies from a blockchain, and syncs it from peers.
+    """
+
+    def __init__(self, gossip: GossipNode, blockchain: Blockchain,
+                 header_batch: int = HEADER_BATCH, body_batch: int = BODY_BATCH,
+                 requests_per_peer: int = REQUESTS_PER_PEER, body_window: int = BODY_WINDOW,
+                 timeout: float = 10.0):
+        """
+        Attach sync to a gossip node.
+
+        Args:
+            gossip: The gossip node
+            blockchain: The local chain (served, and extended by sync())
+            header_batch: Headers per request
+            body_batch: Blocks per body request
+            requests_per_peer: Concurrent requests per peer
+            body_window: Body ranges that may be held ahead of the applied height
+            timeout: Seconds to wait for a response
+        """
+        self.gossip = gossip
+        self.blockchain = blockchain
+        self.header_batch = header_batch
+        self.body_batch = body_batch
+        self.requests_per_peer = requests_per_peer
+        self.body_window = body_window
+        self.timeout = timeout
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self.stats = {"header_requests": 0, "body_requests": 0, "retries": 0,
+                      "headers": 0, "blocks": 0, "header_seconds": 0.0, "body_seconds": 0.0}
+
+        gossip.on_direct(GET_HEADERS, self._on_get_headers)
+        gossip.on_direct(GET_BODIES, self._on_get_bodies)
+        gossip.on_direct(HEADERS, self._on_response)
+        gossip.on_direct(BODIES, self._on_response)
+
+    # --- Serving ---
+
+    def _held(self, start: int, end: int) -> List[PhiBlock]:
+        """Get the locally held blocks in heights [start, end)."""
+        base = self.blockchain.base_index
+        return self.blockchain.chain[max(start - base, 0):max(end - base, 0)]
+
+    def _on_get_headers(self, request: Dict[str, Any], source: Optional[str]):
+        start = request["start"]
+        self.gossip.send(source, HEADERS, {
+            "id": request["id"],
+            "height": self.blockchain.get_chain_length() - 1,
+            "headers": [block.to_dict(transactions=False)
+                        for block in self._held(start, start + request["count"])],
+        })
+
+    def _on_get_bodies(self, request: Dict[str, Any], source: Optional[str]):
+        self.gossip.send(source, BODIES, {
+            "id": request["id"],
+            "bodies": [[tx.to_dict() for tx in block.transactions]
+                       for block in self._held(request["start"], request["end"])],
+        })
+
+    # --- Requests ---
+
+    def _on_response(self, response: Dict[str, Any], source: Optional[str]):
+        future = self._pending.pop(response.get("id"), None)
+        if future is not None and not future.done():
+            future.set_result(response)
+
+    async def request(self, peer: str, msg_type: int, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a request and wait for its response.
+
+        Raises:
+            asyncio.TimeoutError: If the peer does not answer in time
+            ConnectionError: If the peer is not connected
+        """
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        if not self.gossip.send(peer, msg_type, dict(message, id=request_id)):
+            self._pending.pop(request_id, None)
+            raise ConnectionError(f"Cannot send to {peer}")
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def peer_heights(self, peers: List[str]) -> Dict[str, int]:
+        """Ask peers for their chain heights (peers that do not answer are left out)."""
+        async def height(peer):
+            response = await self.request(peer, GET_HEADERS, {"start": 0, "count": 0})
+            return response["height"]
+
+        results = await asyncio.gather(*(height(p) for p in peers), return_exceptions=True)
+        return {p: h for p, h in zip(peers, results) if isinstance(h, int)}
+
+    async def _fetch_ranges(self, peers: List[str], ranges: List[Range],
+                            fetch: Callable[[str, Range], Awaitable[Any]],
+                            accept: Callable[[Range, Any], bool],
+                            ready: Optional[Callable[[Range], bool]] = None):
+        """
+        Fetch height ranges in parallel from several peers.
+
+        Ranges are handed out lowest first; with `ready`, a worker waits
+        until the lowest queued range is ready before taking it. A range
+        that times out or fails `accept` goes back to the front of the
+        queue and the peer serving it drops one worker.
+        """
+        if not ranges:
+            return
+        queue: Deque[Range] = deque(ranges)
+        remaining = {"count": len(ranges)}
+        progress = asyncio.Condition()
+        done = asyncio.Event()
+
+        async def notify():
+            async with progress:
+                progress.notify_all()
+
+        async def worker(peer: str):
+            while True:
+                if ready is not None:
+                    async with progress:
+                        await progress.wait_for(lambda: not queue or ready(queue[0]))
+                if not queue:
+                    return
+                item = queue.popleft()
+                try:
+                    ok = accept(item, await fetch(peer, item))
+                except (asyncio.TimeoutError, ConnectionError, KeyError, ValueError) as e:
+                    events.warning("Range %s from %s failed: %s", item, peer, e)
+                    ok = False
+                if ok:
+                    remaining["count"] -= 1
+                    if remaining["count"] == 0:
+                        done.set()
+                else:
+                    self.stats["retries"] += 1
+                    queue.appendleft(item)
+                await notify()
+                if not ok:
+                    return
+
+        workers = [asyncio.create_task(worker(peer))
+                   for _ in range(self.requests_per_peer) for peer in peers]
+        finished = asyncio.create_task(done.wait())
+        try:
+            # Stop when every range is in, or when every worker has given up
+            while not done.is_set():
+                for w in workers:
+                    if w.done() and not w.cancelled() and w.exception() is not None:
+                        raise w.exception()
+                live = [w for w in workers if not w.done()]
+                if not live:
+                    raise ValueError(f"Sync stalled with {remaining['count']} ranges left")
+                await asyncio.wait(live + [finished], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            finished.cancel()
+            for w in workers:
+                w.cancel()
+
+    # --- Sync ---
+
+    async def sync_headers(self, peers: List[str], target: int) -> List[Dict[str, Any]]:
+        """
+        Download and validate headers from the local tip + 1 to `target`.
+
+        Returns:
+            The validated headers, in height order
+
+        Raises:
+            ValueError: If the headers cannot be validated or stitched
+        """
+        start = self.blockchain.get_chain_length()
+        ranges = split_ranges(start, target + 1, self.header_batch)
+        received: Dict[int, List[Dict[str, Any]]] = {}
+
+        async def fetch(peer, item):
+            self.stats["header_requests"] += 1
+            response = await self.request(peer, GET_HEADERS, {"start": item[0], "count": item[1] - item[0]})
+            return response["headers"]
+
+        def accept(item, headers):
+            if len(headers) != item[1] - item[0] or not validate_header_range(headers, item[0]):
+                return False
+            received[item[0]] = headers
+            return True
+
+        began = time.perf_counter()
+        await self._fetch_ranges(peers, ranges, fetch, accept)
+
+        headers: List[Dict[str, Any]] = []
+        previous_hash = self.blockchain.get_latest_block().hash
+        for lo, _ in ranges:
+            chunk = received[lo]
+            if chunk[0]["previous_hash"] != previous_hash:
+                raise ValueError(f"Header chain does not link at height {lo}")
+            headers.extend(chunk)
+            previous_hash = chunk[-1]["hash"]
+        self.stats["headers"] += len(headers)
+        self.stats["header_seconds"] += time.perf_counter() - began
+        return headers
+
+    async def sync_bodies(self, peers: List[str], headers: List[Dict[str, Any]]) -> int:
+        """
+        Download bodies for validated headers and apply the blocks in order.
+
+        Returns:
+            The number of blocks applied
+
+        Raises:
+            ValueError: If a block fails to apply
+        """
+        if not headers:
+            return 0
+        base = headers[0]["index"]
+        ranges = split_ranges(base, base + len(headers), self.body_batch)
+        ready_blocks: Dict[int, List[PhiBlock]] = {}
+        applied = {"next": base, "count": 0}
+        window = self.body_window * self.body_batch
+
+        async def fetch(peer, item):
+            self.stats["body_requests"] += 1
+            response = await self.request(peer, GET_BODIES, {"start": item[0], "end": item[1]})
+            return response["bodies"]
+
+        def accept(item, bodies):
+            if len(bodies) != item[1] - item[0]:
+                return False
+            blocks = []
+            for offset, body in enumerate(bodies):
+                header = headers[item[0] + offset - base]
+                transactions = [PhiTransaction.from_dict(tx) for tx in body]
+                # Raises ValueError unless the body matches the header commitment
+                blocks.append(PhiBlock.from_dict(header, transactions=transactions))
+            ready_blocks[item[0]] = blocks
+            # Apply every range that is now contiguous with the chain
+            while applied["next"] in ready_blocks:
+                for block in ready_blocks.pop(applied["next"]):
+                    if not self.blockchain.add_block(block):
+                        raise RuntimeError(f"Block {block.index} failed to apply")
+                    applied["count"] += 1
+                applied["next"] = self.blockchain.get_chain_length()
+            return True
+
+        began = time.perf_counter()
+        try:
+            await self._fetch_ranges(peers, ranges, fetch, accept,
+                                     ready=lambda item: item[0] < applied["next"] + window)
+        except RuntimeError as e:
+            raise ValueError(str(e))
+        self.stats["blocks"] += applied["count"]
+        self.stats["body_seconds"] += time.perf_counter() - began
+        return applied["count"]
+
+    async def sync(self, peers: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Catch up with the highest peer.
+
+        Args:
+            peers: Peers to sync from (default: every connected peer)
+
+        Returns:
+            Sync statistics
+        """
+        peers = list(self.gossip.transport.peers) if peers is None else peers
+        heights = await self.peer_heights(peers)
+        local = self.blockchain.get_chain_length() - 1
+        target = max(heights.values(), default=local)
+        if target <= local:
+            return dict(self.stats, target=local, height=local)
+
+        # Fetch only from peers that have the whole target range
+        sources = [p for p, h in heights.items() if h >= target]
+        events.info("Syncing %d -> %d from %d peers", local, target, len(sources))
+        headers = await self.sync_headers(sources, target)
+        await self.sync_bodies(sources, headers)
+        return dict(self.stats, target=target, height=self.blockchain.get_chain_length() - 1)
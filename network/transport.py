@@ -0,0 +1,349 @@
+"""
+network/transport.py: Asyncio TCP transport for Φ-Chain peers
+
+Frames are length-prefixed binary:
+
+    [4-byte big-endian length][1-byte message type][payload]
+
+where the length covers the type byte and the payload. Every connection
+starts with a HELLO frame carrying the node ID and listening port.
+
+Connections are persistent: a node dials each configured peer with a
+higher port (the lower port accepts), and re-dials with backoff if the
+connection drops, so each pair shares exactly one connection. Every peer
+has its own bounded send queue and writer task; a slow peer fills only
+its own queue (further frames to it are dropped and counted) and never
+stalls sends to other peers.
+"""
+
+import asyncio
+import json
+import struct
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+import sys
+sys.path.insert(0, '..')
+from core.events import get_channel
+
+events = get_channel("transport")
+
+# Frame layout
+HEADER = struct.Struct(">IB")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Reserved message type for the connection handshake
+HELLO = 0
+
+# Per-peer send queue bound (F_13 = 233 frames)
+DEFAULT_QUEUE_SIZE = 233
+
+
+def encode_frame(msg_type: int, payload: bytes) -> bytes:
+    """
+    Encode one frame.
+
+    Args:
+        msg_type: Message type (0-255)
+        payload: Message payload
+
+    Returns:
+        The framed bytes
+    """
+    if len(payload) + 1 > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large: {len(payload)} bytes")
+    return HEADER.pack(len(payload) + 1, msg_type) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """
+    Read one frame.
+
+    Returns:
+        (message type, payload)
+
+    Raises:
+        asyncio.IncompleteReadError: If the connection closes mid-frame
+        ValueError: If the frame length is invalid
+    """
+    header = await reader.readexactly(HEADER.size)
+    length, msg_type = HEADER.unpack(header)
+    if length < 1 or length > MAX_FRAME_SIZE:
+        raise ValueError(f"Invalid frame length: {length}")
+    payload = await reader.readexactly(length - 1) if length > 1 else b""
+    return msg_type, payload
+
+
+def parse_hello(payload: bytes) -> Dict[str, Any]:
+    """
+    Decode a HELLO payload.
+
+    Raises:
+        ValueError: If it is not a JSON object with a string node_id and an integer port
+    """
+    hello = json.loads(payload)  # JSONDecodeError is a ValueError
+    if not isinstance(hello, dict) or not isinstance(hello.get("node_id"), str) or not hello["node_id"]:
+        raise ValueError("Invalid HELLO")
+    if not isinstance(hello.get("port", 0), int):
+        raise ValueError("Invalid HELLO port")
+    return hello
+
+
+class Peer:
+    """
+    One persistent connection with its own bounded send queue.
+    """
+
+    def __init__(self, node_id: str, port: int, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.node_id = node_id
+        self.port = port
+        self.reader = reader
+        self.writer = writer
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.frames_sent = 0
+        self.frames_received = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.dropped = 0
+        self.closed = False
+        self._writer_task: Optional[asyncio.Task] = None
+
+    def send(self, frame: bytes) -> bool:
+        """
+        Queue a frame without blocking.
+
+        Returns:
+            False if the peer is closed or its queue is full
+        """
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def _write_loop(self):
+        queue = self.queue
+        writer = self.writer
+        try:
+            while True:
+                frame = await queue.get()
+                writer.write(frame)
+                sent, count = len(frame), 1
+                # Coalesce whatever else is queued into the same drain
+                while not queue.empty():
+                    frame = queue.get_nowait()
+                    writer.write(frame)
+                    sent += len(frame)
+                    count += 1
+                await writer.drain()
+                self.frames_sent += count
+                self.bytes_sent += sent
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    def start(self):
+        self._writer_task = asyncio.create_task(self._write_loop())
+
+    async def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    def __repr__(self) -> str:
+        return f"Peer({self.node_id}, port={self.port}, queued={self.queue.qsize()}, dropped={self.dropped})"
+
+
+class Transport:
+    """
+    TCP transport with persistent peer connections.
+    """
+
+    def __init__(self, node_id: str, host: str = "127.0.0.1", port: int = 0,
+                 queue_size: int = DEFAULT_QUEUE_SIZE):
+        """
+        Initialize the transport.
+
+        Args:
+            node_id: This node's ID (sent in HELLO)
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            queue_size: Per-peer send queue bound
+        """
+        self.node_id = node_id
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.peers: Dict[str, Peer] = {}
+        # Called as on_message(peer, msg_type, payload) for every non-HELLO frame
+        self.on_message: Optional[Callable[[Peer, int, bytes], None]] = None
+        # Called as on_peer(peer) when a connection is established
+        self.on_peer: Optional[Callable[[Peer], None]] = None
+        self.running = False
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks = set()
+        # Bytes queued for sending, by message type
+        self.type_bytes: Dict[int, int] = {}
+
+    # --- Lifecycle ---
+
+    async def start(self):
+        """Start listening for inbound connections."""
+        self.running = True
+        self._server = await asyncio.start_server(self._on_inbound, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        events.info("%s listening on %s:%d", self.node_id, self.host, self.port)
+
+    async def close(self):
+        """Close the server and every peer connection."""
+        self.running = False
+        for task in list(self._tasks):
+            task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for peer in list(self.peers.values()):
+            await peer.close()
+        self.peers.clear()
+
+    def connect_peers(self, ports: Iterable[int], host: str = "127.0.0.1"):
+        """
+        Keep persistent connections to peers.
+
+        Only peers with a higher port are dialled; lower ports dial us.
+        """
+        for port in ports:
+            if port > self.port:
+                self.dial(port, host)
+
+    def dial(self, port: int, host: str = "127.0.0.1"):
+        """Keep a persistent connection to one peer (e.g. a sync client to servers)."""
+        self._spawn(self._dial_forever(host, port))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # --- Connections ---
+
+    def _hello(self) -> bytes:
+        return encode_frame(HELLO, json.dumps({"node_id": self.node_id, "port": self.port}).encode())
+
+    async def _dial_forever(self, host: str, port: int):
+        backoff = 0.05
+        while self.running:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+                writer.write(self._hello())
+                await writer.drain()
+                await self._serve(reader, writer)
+                backoff = 0.05
+            except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError):
+                pass
+            if self.running:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
+
+    async def _on_inbound(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            writer.write(self._hello())
+            await writer.drain()
+            await self._serve(reader, writer)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError):
+            writer.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        msg_type, payload = await asyncio.wait_for(read_frame(reader), timeout=5.0)
+        if msg_type != HELLO:
+            raise ValueError("Expected HELLO")
+        hello = parse_hello(payload)
+        node_id = hello["node_id"]
+        if node_id in self.peers or node_id == self.node_id:
+            writer.close()
+            return
+
+        peer = Peer(node_id, hello.get("port", 0), reader, writer, self.queue_size)
+        self.peers[node_id] = peer
+        peer.start()
+        events.info("%s connected to %s", self.node_id, node_id)
+        if self.on_peer is not None:
+            self.on_peer(peer)
+
+        try:
+            while self.running:
+                msg_type, payload = await read_frame(reader)
+                peer.frames_received += 1
+                peer.bytes_received += HEADER.size + len(payload)
+                if self.on_message is not None:
+                    self.on_message(peer, msg_type, payload)
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            # A peer shutting down closes between frames; so does our own close()
+            clean = isinstance(e, asyncio.IncompleteReadError) and not e.partial
+            if self.running and not peer.closed and not clean:
+                events.warning("%s lost connection to %s", self.node_id, node_id)
+            else:
+                events.info("%s disconnected from %s", self.node_id, node_id)
+        finally:
+            if self.peers.get(node_id) is peer:
+                del self.peers[node_id]
+            await peer.close()
+
+    async def wait_for_peers(self, count: int, timeout: float = 10.0) -> bool:
+        """Wait until at least `count` peers are connected."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while len(self.peers) < count:
+            if loop.time() > deadline:
+                return False
+            await asyncio.sleep(0.01)
+        return True
+
+    # --- Sending ---
+
+    def send(self, node_id: str, msg_type: int, payload: bytes) -> bool:
+        """Queue a message to one peer."""
+        peer = self.peers.get(node_id)
+        frame = encode_frame(msg_type, payload)
+        if peer is None or not peer.send(frame):
+            return False
+        self.type_bytes[msg_type] = self.type_bytes.get(msg_type, 0) + len(frame)
+        return True
+
+    def broadcast(self, msg_type: int, payload: bytes, exclude: Optional[str] = None) -> int:
+        """
+        Queue a message to every connected peer.
+
+        Args:
+            msg_type: Message type
+            payload: Message payload
+            exclude: Peer to skip (e.g. the one we received it from)
+
+        Returns:
+            The number of peers the frame was queued for
+        """
+        frame = encode_frame(msg_type, payload)
+        sent = sum(1 for node_id, peer in list(self.peers.items())
+                   if node_id != exclude and peer.send(frame))
+        self.type_bytes[msg_type] = self.type_bytes.get(msg_type, 0) + sent * len(frame)
+        return sent
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get byte, frame and drop counters summed over connected peers."""
+        stats = {"peers": len(self.peers), "frames_sent": 0, "frames_received": 0,
+                 "bytes_sent": 0, "bytes_received": 0, "dropped": 0}
+        for peer in self.peers.values():
+            stats["frames_sent"] += peer.frames_sent
+            stats["frames_received"] += peer.frames_received
+            stats["bytes_sent"] += peer.bytes_sent
+            stats["bytes_received"] += peer.bytes_received
+            stats["dropped"] += peer.dropped
+        return stats
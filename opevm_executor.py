@@ -6,33 +6,36 @@ three-stage conflict detection system.
 
 from typing import List, Dict, Set, Tuple
 from phi_chain_core import PhiTransaction
+from storage.overlay import StateOverlay
+from core.events import get_channel, DEBUG
+
+events = get_channel("opevm")
 
 class OPEVMExecutor:
     """
     Simulates the Optimistic Parallelized EVM (OPEVM) execution environment.
     """
     def __init__(self, state: Dict[str, int]):
-        # The global state, mapping storage slots (keys) to values
-        self.state = state
+        # The global state, mapping storage slots (keys) to values.
+        # Blocks execute in copy-on-write layers on top of it.
+        self.state = state if isinstance(state, StateOverlay) else StateOverlay(state)
         # A simple counter for simulation purposes
         self.execution_count = 0
 
-    def _simulate_execution(self, tx: PhiTransaction, local_state: Dict[str, int]) -> Tuple[Dict[str, int], Set[str], Set[str]]:
+    def _simulate_execution(self, tx: PhiTransaction, local_state: StateOverlay) -> Tuple[Dict[str, int], Set[str], Set[str]]:
         """
         Simulates the execution of a single transaction.
         In a real EVM, this would involve running bytecode.
         Here, we simulate state changes based on the estimated sets.
+        Writes go into `local_state`, a per-transaction overlay layer.
         Returns: (new_state_changes, actual_reads, actual_writes)
         """
         self.execution_count += 1
         
         # In a real scenario, the actual read/write sets are determined during execution.
         # For this simulation, we'll use the estimated sets as the actual sets.
-        actual_reads = set(tx.estimated_read_set)
-        actual_writes = set(tx.estimated_write_set)
-        
-        # Simulate a state change: e.g., transfer value
-        state_changes = {}
+        actual_reads = set(tx.read_set)
+        actual_writes = set(tx.write_set)
         
         # Simple simulation logic: if the transaction is from Alice, simulate a transfer
         if tx.sender == "0xAlice":
@@ -41,25 +44,29 @@ class OPEVMExecutor:
             
             # Only update sender's balance if it's in the write set
             if sender_key in actual_writes:
-                state_changes[sender_key] = local_state.get(sender_key, 0) - tx.value
+                local_state[sender_key] = local_state.get(sender_key, 0) - tx.value
             
             # Only update recipient's balance if it's in the write set
             if recipient_key in actual_writes:
-                state_changes[recipient_key] = local_state.get(recipient_key, 0) + tx.value
+                local_state[recipient_key] = local_state.get(recipient_key, 0) + tx.value
                 
-        return state_changes, actual_reads, actual_writes
+        return local_state.delta, actual_reads, actual_writes
 
-    def execute_block(self, transactions: List[PhiTransaction]) -> Tuple[Dict[str, int], List[int]]:
+    def execute_block(self, transactions: List[PhiTransaction]) -> Tuple[StateOverlay, List[int]]:
         """
         Executes a list of transactions using the OPEVM's three-stage process.
         Returns the final state and a list of re-executed transaction indices.
+
+        Every transaction runs in its own copy-on-write layer over the
+        pre-block state, so no stage copies the full state; the block layer
+        is committed into `self.state` in O(delta).
         """
-        print(f"\n--- OPEVM Execution of {len(transactions)} Transactions ---")
+        events.info("OPEVM execution of %d transactions", len(transactions))
         
         # --- Stage 1: Pre-Execution Static Analysis (Scheduling) ---
         # In a real system, this would group transactions for parallel threads.
         # For simulation, we just collect the estimated sets.
-        print("Stage 1: Pre-Execution Static Analysis (Simulated Parallel Scheduling)")
+        events.debug("Stage 1: Pre-Execution Static Analysis (Simulated Parallel Scheduling)")
         
         # --- Stage 2: Optimistic Parallel Execution & Dynamic Monitoring ---
         
@@ -74,8 +81,8 @@ class OPEVMExecutor:
         
         # Simulate parallel execution by iterating and checking for conflicts
         for i, tx in enumerate(transactions):
-            # Simulate a local copy of the state for the parallel thread
-            local_state = self.state.copy()
+            # Each parallel thread gets an empty layer over the pre-block state
+            local_state = self.state.child()
             
             # Simulate execution
             state_changes, actual_reads, actual_writes = self._simulate_execution(tx, local_state)
@@ -87,41 +94,48 @@ class OPEVMExecutor:
             write_conflict = not actual_writes.isdisjoint(committed_writes)
             
             if read_conflict or write_conflict:
-                print(f"  [Conflict Detected] Tx {i} conflicts with committed writes. Flagged for re-execution.")
                 conflicting_tx_indices.append(i)
                 # Do NOT commit the writes of this transaction yet
+                local_state.discard()
                 optimistic_results.append(None)
             else:
                 # No conflict, optimistically commit the writes
                 committed_writes.update(actual_writes)
                 optimistic_results.append((state_changes, actual_reads, actual_writes))
-                print(f"  [Optimistic Commit] Tx {i} executed successfully. Writes: {actual_writes}")
+
+        # One structured event per stage (not per transaction) keeps the
+        # enabled channel cheap relative to execution
+        events.debug("Stage 2: %d optimistic commits writing %d slots; conflicts flagged for re-execution: %s",
+                     len(transactions) - len(conflicting_tx_indices), len(committed_writes), conflicting_tx_indices)
 
         # --- Stage 3: Post-Execution Global Verification (Re-execution) ---
         
-        final_state = self.state.copy()
+        final_state = self.state.child()
         re_executed_indices = []
         
         # Apply non-conflicting results first
         for i, result in enumerate(optimistic_results):
             if result is not None:
                 state_changes, _, _ = result
-                final_state.update(state_changes)
+                final_state.merge(state_changes)
         
         # Re-execute conflicting transactions sequentially in canonical order
         if conflicting_tx_indices:
-            print(f"\nStage 3: Post-Execution Global Verification (Re-executing {len(conflicting_tx_indices)} transactions)")
             for i in conflicting_tx_indices:
                 tx = transactions[i]
                 # Re-execute against the current final state (which includes all prior successful txs)
-                state_changes, _, _ = self._simulate_execution(tx, final_state)
-                final_state.update(state_changes)
+                tx_state = final_state.child()
+                self._simulate_execution(tx, tx_state)
+                tx_state.commit()
                 re_executed_indices.append(i)
-                print(f"  [Re-executed] Tx {i} applied sequentially.")
+
+        if re_executed_indices:
+            events.debug("Stage 3: Post-Execution Global Verification (re-executed sequentially: %s)", re_executed_indices)
 
         # Update the executor's state
-        self.state = final_state
-        print(f"\nExecution Complete. Total executions (including re-executions): {self.execution_count}")
+        final_state.commit()
+        self.state.commit()
+        events.info("Execution complete. Total executions (including re-executions): %d", self.execution_count)
         return self.state, re_executed_indices
 
 # --- Conceptual Usage Example ---
@@ -136,29 +150,31 @@ if __name__ == "__main__":
     }
     
     executor = OPEVMExecutor(initial_state)
+    events.set_level(DEBUG)
     
     # Define transactions
     # Tx 0: Alice -> Bob (Non-conflicting with Tx 1)
     tx0 = PhiTransaction("0xAlice", "0xBob", 100, b"", 1, 21000, b"sig0",
-                         estimated_read_set=["0xAlice_balance", "0xBob_balance"],
-                         estimated_write_set=["0xAlice_balance", "0xBob_balance"])
+                         read_set=["0xAlice_balance", "0xBob_balance"],
+                         write_set=["0xAlice_balance", "0xBob_balance"])
     
     # Tx 1: Contract A update (Non-conflicting with Tx 0)
     tx1 = PhiTransaction("0xUser", "0xContractA", 0, b"call_update", 1, 50000, b"sig1",
-                         estimated_read_set=["0xContract_A_data"],
-                         estimated_write_set=["0xContract_A_data"])
+                         read_set=["0xContract_A_data"],
+                         write_set=["0xContract_A_data"])
 
     # Tx 2: Alice -> Charlie (Conflicting with Tx 0 on Alice's balance)
     tx2 = PhiTransaction("0xAlice", "0xCharlie", 50, b"", 2, 21000, b"sig2",
-                         estimated_read_set=["0xAlice_balance"],
-                         estimated_write_set=["0xAlice_balance"])
+                         read_set=["0xAlice_balance"],
+                         write_set=["0xAlice_balance"])
     
     transactions = [tx0, tx1, tx2]
     
     final_state, re_executed = executor.execute_block(transactions)
+    events.dump()
     
     print("\n--- Final State ---")
-    print(final_state)
+    print(final_state.to_dict())
     print(f"Re-executed Transactions (Indices): {re_executed}")
     
     # Expected Result:
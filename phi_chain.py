@@ -11,9 +11,14 @@ This module integrates all core blockchain components:
 
 import time
 import json
+import heapq
 import hashlib
-from typing import List, Dict, Optional, Tuple, Any
+from collections import deque
+from typing import Deque, List, Dict, Optional, Tuple, Any
 from core.phi_math import PhiMath, fibonacci
+from storage.overlay import StateOverlay
+from consensus.vote_pool import VotePool, PHASES
+from crypto.hash import MerkleTree
 import numpy as np
 
 # --- 1. Fibonacci & Golden Ratio Utilities ---
@@ -104,6 +109,8 @@ class PhiState:
     def __init__(self, f_n_plus_1: int = 1, f_n: int = 1):
         self.vector = np.array([f_n_plus_1, f_n], dtype=np.int64)
         self.Q_matrix = np.array([[1, 1], [1, 0]], dtype=np.int64)
+        # det(Q) = -1, so the inverse is an exact integer matrix
+        self.Q_inverse = np.array([[0, 1], [1, -1]], dtype=np.int64)
         self.step = 0
     
     def evolve(self) -> np.ndarray:
@@ -112,6 +119,12 @@ class PhiState:
         self.step += 1
         return self.vector
     
+    def revert(self) -> np.ndarray:
+        """S_{n-1} = Q^-1 * S_n (exact, including after int64 wrap-around)"""
+        self.vector = self.Q_inverse @ self.vector
+        self.step -= 1
+        return self.vector
+    
     def get_current_metrics(self) -> Tuple[int, int]:
         """Get current Fibonacci state values."""
         return int(self.vector[0]), int(self.vector[1])
@@ -120,6 +133,37 @@ class PhiState:
         """Generate hash of current state for block inclusion."""
         state_str = f"{self.vector[0]}:{self.vector[1]}:{self.step}"
         return hashlib.sha256(state_str.encode()).hexdigest()
+    
+    @staticmethod
+    def metrics_at(step: int, f_n_plus_1: int = 1, f_n: int = 1) -> Tuple[int, int]:
+        """
+        Get the state after `step` evolutions in O(log step) (a Q-matrix jump).
+        
+        Matches evolve(): int64 arithmetic wrapping modulo 2^64.
+        """
+        # Q^step by repeated squaring, as (a, b, c, d) = [[a, b], [c, d]]
+        result = (1, 0, 0, 1)
+        base = (1, 1, 1, 0)
+        while step > 0:
+            if step & 1:
+                result = _mat_mul(result, base)
+            base = _mat_mul(base, base)
+            step >>= 1
+        a, b, c, d = result
+        return (wrap_int64(a * f_n_plus_1 + b * f_n), wrap_int64(c * f_n_plus_1 + d * f_n))
+
+
+def wrap_int64(x: int) -> int:
+    """Reduce an integer to a signed 64-bit value (numpy int64 overflow)."""
+    x &= 0xFFFFFFFFFFFFFFFF
+    return x - (1 << 64) if x >> 63 else x
+
+
+def _mat_mul(m: Tuple[int, int, int, int], n: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """Multiply 2x2 matrices modulo 2^64."""
+    mask = 0xFFFFFFFFFFFFFFFF
+    return ((m[0] * n[0] + m[1] * n[2]) & mask, (m[0] * n[1] + m[1] * n[3]) & mask,
+            (m[2] * n[0] + m[3] * n[2]) & mask, (m[2] * n[1] + m[3] * n[3]) & mask)
 
 # --- 4. Transaction Structure ---
 
@@ -146,6 +190,7 @@ class PhiTransaction:
         self.read_set = read_set or []
         self.write_set = write_set or []
         self.timestamp = time.time()
+        self.hash = self.calculate_hash()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert transaction to dictionary."""
@@ -162,16 +207,43 @@ class PhiTransaction:
             "timestamp": self.timestamp
         }
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PhiTransaction':
+        """Rebuild a transaction from to_dict() output (e.g. received over the network)."""
+        tx = cls(
+            sender=data["sender"],
+            recipient=data["recipient"],
+            value=data["value"],
+            data=bytes.fromhex(data.get("data", "")),
+            nonce=data.get("nonce", 0),
+            gas_limit=data.get("gas_limit", 21000),
+            signature=bytes.fromhex(data.get("signature", "")),
+            read_set=data.get("read_set"),
+            write_set=data.get("write_set")
+        )
+        tx.timestamp = data.get("timestamp", tx.timestamp)
+        tx.hash = tx.calculate_hash()
+        return tx
+    
     def calculate_hash(self) -> str:
         """Calculate transaction hash."""
         import json
         tx_data = json.dumps(self.to_dict(), sort_keys=True)
         return hashlib.sha256(tx_data.encode()).hexdigest()
     
-    def validate(self, blockchain: 'Blockchain') -> bool:
-        """Validate transaction against blockchain state."""
+    def validate(self, blockchain: 'Blockchain', state: Optional[StateOverlay] = None) -> bool:
+        """
+        Validate transaction against blockchain state.
+
+        Args:
+            blockchain: The blockchain to validate against
+            state: Optional speculative state layer (defaults to the committed accounts)
+        """
         # Check if sender has sufficient balance
-        sender_balance = blockchain.get_balance(self.sender)
+        if state is not None:
+            sender_balance = state.get(self.sender, 0)
+        else:
+            sender_balance = blockchain.get_balance(self.sender)
         if sender_balance < self.value:
             return False
         
@@ -203,20 +275,88 @@ class PhiBlock:
         self.f_vector = f_vector  # Fibonacci state at this block
         self.bls_signature = bls_signature
         self.nonce = nonce
+        # Commits the header (and so the hash) to the transaction list
+        self.tx_root = self.calculate_tx_root()
         self.hash = self.calculate_hash()
     
+    def calculate_tx_root(self) -> str:
+        """Calculate the Merkle root of the block's transaction hashes."""
+        if not self.transactions:
+            return "0" * 64
+        return MerkleTree([tx.hash for tx in self.transactions]).get_root()
+    
+    @staticmethod
+    def header_hash(header: Dict[str, Any]) -> str:
+        """Calculate a block hash from header fields alone (no transactions needed)."""
+        block_string = json.dumps({
+            "index": header["index"],
+            "previous_hash": header["previous_hash"],
+            "timestamp": header["timestamp"],
+            "proposer": header["proposer"],
+            "f_vector": [int(x) for x in header["f_vector"]],
+            "tx_root": header["tx_root"],
+            "nonce": header["nonce"]
+        }, sort_keys=True)
+        return hashlib.sha256(block_string.encode()).hexdigest()
+    
     def calculate_hash(self) -> str:
         """Calculate block hash including Fibonacci state."""
-        import json
-        block_string = json.dumps({
-            "index": self.index,
+        return PhiBlock.header_hash(self.__dict__)
+    
+    def to_dict(self, transactions: bool = True) -> Dict[str, Any]:
+        """
+        Convert block to dictionary (the format used by save_blockchain_to_file).
+        
+        Args:
+            transactions: Include the transactions (False gives the header only)
+        """
+        data = {
+            "index": int(self.index),
+            "hash": self.hash,
             "previous_hash": self.previous_hash,
-            "timestamp": self.timestamp,
+            "timestamp": float(self.timestamp),
             "proposer": self.proposer,
-            "f_vector": list(self.f_vector),
-            "nonce": self.nonce
-        }, sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
+            "f_vector": [int(x) for x in self.f_vector],
+            "nonce": self.nonce,
+            "tx_root": self.tx_root,
+            "state_root": self.state_root,
+            "bls_signature": self.bls_signature.hex() if self.bls_signature else None
+        }
+        if transactions:
+            data["transactions"] = [tx.to_dict() for tx in self.transactions]
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any],
+                  transactions: Optional[List[PhiTransaction]] = None) -> 'PhiBlock':
+        """
+        Rebuild a block from to_dict() output.
+        
+        Args:
+            data: The block (or header) dictionary
+            transactions: The block's transactions, if already decoded
+                (otherwise they are read from data["transactions"])
+        
+        Raises:
+            ValueError: If the recomputed hash does not match data["hash"]
+        """
+        if transactions is None:
+            transactions = [PhiTransaction.from_dict(tx) for tx in data.get("transactions", [])]
+        signature = data.get("bls_signature")
+        block = cls(
+            index=data["index"],
+            previous_hash=data["previous_hash"],
+            timestamp=data["timestamp"],
+            transactions=transactions,
+            state_root=data.get("state_root", ""),
+            proposer=data["proposer"],
+            f_vector=tuple(data["f_vector"]),
+            bls_signature=bytes.fromhex(signature) if signature else None,
+            nonce=data.get("nonce", 0)
+        )
+        if "hash" in data and block.hash != data["hash"]:
+            raise ValueError(f"Block hash mismatch at index {block.index}")
+        return block
     
     def mine(self, difficulty: int = 2) -> bool:
         """Proof-of-Work mining with Fibonacci difficulty."""
@@ -228,22 +368,56 @@ class PhiBlock:
 
 # --- 6. Blockchain Implementation ---
 
+# Blocks that can be rewound (undo journals kept, F_13 = 233)
+UNDO_DEPTH = 233
+
+# Marks an account that did not exist before a block (in undo journals)
+_MISSING = object()
+
 class Blockchain:
     """Φ-Chain distributed ledger with PoC mining and FBA consensus"""
     
-    def __init__(self, genesis_params: Optional[GenesisParameters] = None):
-        """Initialize the blockchain with Genesis Block."""
+    def __init__(self, genesis_params: Optional[GenesisParameters] = None,
+                 genesis_timestamp: Optional[float] = None):
+        """
+        Initialize the blockchain with Genesis Block.
+        
+        Args:
+            genesis_params: Genesis parameters (defaults to GenesisParameters())
+            genesis_timestamp: Fixed genesis timestamp, so separate nodes build
+                the same genesis block (defaults to the current time)
+        """
         self.chain: List[PhiBlock] = []
+        # Index of chain[0] (non-zero when started from a snapshot)
+        self.base_index = 0
         self.pending_transactions: List[PhiTransaction] = []
         self.validators: Dict[str, Dict[str, Any]] = {}
         self.state = PhiState()
+        
+        # Running validator aggregates, so coherence scores are O(1)
+        self.total_stake = 0
+        self.total_participation = 0
+        self._validator_order: Dict[str, int] = {}
+        self._stake_heap: List[Tuple[int, int, str]] = []
+        self._coherence_heap: List[Tuple[int, int, str]] = []
         self.params = genesis_params or GenesisParameters()
         
+        # Account balances; blocks are executed in copy-on-write layers on top
+        self.accounts = StateOverlay()
+        
+        # Per-block undo journals (prior value of every account a block wrote)
+        self.undo_log: Deque[Dict[str, Any]] = deque(maxlen=UNDO_DEPTH)
+        
         # Create and add the Genesis Block
+        self.genesis_timestamp = genesis_timestamp
         self.create_genesis_block()
     
     def create_genesis_block(self) -> PhiBlock:
         """Create the Genesis Block with initial state."""
+        timestamp = time.time() if self.genesis_timestamp is None else self.genesis_timestamp
+        # Recorded, so snapshots of this chain rebuild the same genesis block
+        self.genesis_timestamp = timestamp
+        
         # Genesis transactions: initial supply distribution
         genesis_txs = [
             PhiTransaction(
@@ -253,11 +427,15 @@ class Blockchain:
                 nonce=0
             )
         ]
+        # The genesis tx_root must not depend on when the node started
+        for tx in genesis_txs:
+            tx.timestamp = timestamp
+            tx.hash = tx.calculate_hash()
         
         genesis_block = PhiBlock(
             index=0,
             previous_hash="0" * 64,
-            timestamp=time.time(),
+            timestamp=timestamp,
             transactions=genesis_txs,
             state_root=self.state.get_state_hash(),
             proposer="0x0000000000000000000000000000000000000000",
@@ -268,34 +446,159 @@ class Blockchain:
         # Mine the genesis block
         genesis_block.mine(difficulty=2)
         
+        # Genesis allocations are applied without balance checks
+        genesis_state = self.accounts.child()
+        self.apply_transactions(genesis_txs, genesis_state, validate=False)
+        genesis_state.commit()
+        self.accounts.commit()
+        
         self.chain.append(genesis_block)
+        # Kept after restore_snapshot drops the genesis block
+        self.genesis_hash = genesis_block.hash
         return genesis_block
     
     def get_latest_block(self) -> PhiBlock:
         """Get the most recent block in the chain."""
         return self.chain[-1]
     
-    def add_block(self, new_block: PhiBlock) -> bool:
+    def get_block(self, index: int) -> Optional[PhiBlock]:
+        """Get the block at a height, or None if it is not held locally."""
+        offset = index - self.base_index
+        if 0 <= offset < len(self.chain):
+            return self.chain[offset]
+        return None
+    
+    @staticmethod
+    def expected_f_vector(index: int) -> Tuple[int, int]:
+        """
+        Get the f_vector a block at `index` must carry.
+        
+        The genesis block is created before the first evolution, so blocks
+        0 and 1 both carry the initial state and block n carries S_{n-1}.
+        """
+        return PhiState.metrics_at(max(index - 1, 0))
+    
+    def add_block(self, new_block: PhiBlock, validate: bool = True) -> bool:
         """
         Add a new block to the blockchain.
         
         Args:
             new_block: The block to add
+            validate: Check the block first (False only for trusted local data)
             
         Returns:
             True if the block was added successfully, False otherwise
         """
-        # Validate the new block
-        if not self.is_valid_block(new_block):
-            return False
+        if validate:
+            # Validate the new block, keeping its speculative state layer
+            block_state = self.execute_block(new_block)
+            if block_state is None:
+                return False
+        else:
+            block_state = self.accounts.child()
+            self.apply_transactions(new_block.transactions, block_state, validate=False)
         
         self.chain.append(new_block)
         
+        # Journal what the block overwrites, then commit its delta into the accounts
+        accounts = self.accounts
+        self.undo_log.append({key: accounts.get(key, _MISSING) for key in block_state.delta})
+        block_state.commit()
+        self.accounts.commit()
+        
         # Evolve state after block addition
         self.state.evolve()
         
         return True
     
+    def rewind(self, count: int = 1) -> List[PhiBlock]:
+        """
+        Remove the last `count` blocks, restoring the state before them in O(count).
+        
+        Balances are restored from the undo journals and the PhiState is
+        stepped back with the inverse Q-matrix.
+        
+        Args:
+            count: Number of blocks to remove
+            
+        Returns:
+            The removed blocks, in chain order
+            
+        Raises:
+            ValueError: If the blocks are older than the undo journals (UNDO_DEPTH)
+                or the chain's first held block
+        """
+        if count < 0 or count > len(self.undo_log) or count >= len(self.chain):
+            raise ValueError(f"Cannot rewind {count} blocks "
+                             f"({len(self.undo_log)} undo journals held)")
+        removed = []
+        for _ in range(count):
+            block = self.chain.pop()
+            undo = self.accounts.child()
+            for key, value in self.undo_log.pop().items():
+                if value is _MISSING:
+                    del undo[key]
+                else:
+                    undo[key] = value
+            undo.commit()
+            self.accounts.commit()
+            self.state.revert()
+            removed.append(block)
+        removed.reverse()
+        return removed
+    
+    def replay(self, blocks: List[PhiBlock], validate: bool = True) -> int:
+        """
+        Add blocks in order, stopping at the first one rejected.
+        
+        Returns:
+            The number of blocks added
+        """
+        added = 0
+        for block in blocks:
+            if not self.add_block(block, validate=validate):
+                break
+            added += 1
+        return added
+    
+    def reorg(self, blocks: List[PhiBlock]) -> bool:
+        """
+        Switch to a competing branch that forks off the held chain.
+        
+        The current blocks after the fork point are rewound and the branch
+        is applied; if any branch block is invalid, the original blocks are
+        replayed. Transactions of dropped blocks that the branch does not
+        include go back to the pending pool.
+        
+        Args:
+            blocks: The branch, starting right after the fork point
+            
+        Returns:
+            True if the chain now ends with the branch
+        """
+        if not blocks:
+            return False
+        parent = self.get_block(blocks[0].index - 1)
+        if parent is None or parent.hash != blocks[0].previous_hash:
+            return False
+        depth = self.get_chain_length() - blocks[0].index
+        try:
+            dropped = self.rewind(depth)
+        except ValueError:
+            return False
+        
+        if self.replay(blocks) < len(blocks):
+            self.rewind(self.get_chain_length() - blocks[0].index)
+            self.replay(dropped, validate=False)
+            return False
+        
+        included = {tx.hash for block in blocks for tx in block.transactions}
+        for block in dropped:
+            for tx in block.transactions:
+                if tx.hash not in included:
+                    self.add_transaction(tx)
+        return True
+    
     def is_valid_block(self, block: PhiBlock) -> bool:
         """
         Validate a block according to Φ-Chain rules.
@@ -306,23 +609,63 @@ class Blockchain:
         Returns:
             True if the block is valid, False otherwise
         """
+        block_state = self.execute_block(block)
+        if block_state is None:
+            return False
+        
+        # Speculative validation only: drop the layer
+        block_state.discard()
+        return True
+    
+    def execute_block(self, block: PhiBlock) -> Optional[StateOverlay]:
+        """
+        Check a block's header and execute its transactions in a new state layer.
+        
+        Args:
+            block: The block to execute
+            
+        Returns:
+            The uncommitted state layer holding the block's writes,
+            or None if the block is invalid
+        """
         # Check that the block's previous hash matches the latest block
         if block.previous_hash != self.get_latest_block().hash:
-            return False
+            return None
         
-        # Check that the block's hash is correct
-        if block.hash != block.calculate_hash():
-            return False
+        # Check that the block's hash is correct and covers its transactions
+        if block.hash != block.calculate_hash() or block.tx_root != block.calculate_tx_root():
+            return None
         
         # Check that the block index is sequential
-        if block.index != len(self.chain):
-            return False
+        if block.index != self.get_chain_length():
+            return None
         
-        # Check that transactions are valid
-        for tx in block.transactions:
-            if not tx.validate(self):
-                return False
+        # Check that transactions are valid, each against the state left by the previous one
+        block_state = self.accounts.child()
+        if not self.apply_transactions(block.transactions, block_state):
+            block_state.discard()
+            return None
+        
+        return block_state
+    
+    def apply_transactions(self, transactions: List[PhiTransaction],
+                           state: StateOverlay, validate: bool = True) -> bool:
+        """
+        Apply balance transfers to a state layer.
         
+        Args:
+            transactions: The transactions to apply, in order
+            state: The layer receiving the writes
+            validate: Reject the batch on the first invalid transaction
+            
+        Returns:
+            True if every transaction was applied
+        """
+        for tx in transactions:
+            if validate and not tx.validate(self, state):
+                return False
+            state.add(tx.sender, -tx.value)
+            state.add(tx.recipient, tx.value)
         return True
     
     def add_transaction(self, transaction: PhiTransaction) -> bool:
@@ -355,13 +698,30 @@ class Blockchain:
         if not self.pending_transactions:
             return None
         
+        # Select the pending transactions that still apply in order
+        # (a sender may have queued more than its balance). The rest stay
+        # pending: a later transfer may still fund them.
+        build_state = self.accounts.child()
+        included = []
+        excluded = []
+        for tx in self.pending_transactions:
+            tx_state = build_state.child()
+            if self.apply_transactions([tx], tx_state):
+                tx_state.commit()
+                included.append(tx)
+            else:
+                excluded.append(tx)
+        build_state.discard()
+        if not included:
+            return None
+        
         # Create a new block with pending transactions
         latest_block = self.get_latest_block()
         new_block = PhiBlock(
-            index=len(self.chain),
+            index=self.get_chain_length(),
             previous_hash=latest_block.hash,
             timestamp=time.time(),
-            transactions=self.pending_transactions.copy(),
+            transactions=included,
             state_root=self.state.get_state_hash(),
             proposer=proposer_id,
             f_vector=self.state.get_current_metrics(),
@@ -373,7 +733,7 @@ class Blockchain:
         
         # Add the block to the chain
         if self.add_block(new_block):
-            self.pending_transactions = []
+            self.pending_transactions = excluded
             return new_block
         
         return None
@@ -388,16 +748,7 @@ class Blockchain:
         Returns:
             The balance of the address
         """
-        balance = 0.0
-        
-        for block in self.chain:
-            for transaction in block.transactions:
-                if transaction.sender == address:
-                    balance -= transaction.value
-                if transaction.recipient == address:
-                    balance += transaction.value
-        
-        return balance
+        return float(self.accounts.get(address, 0))
     
     def is_chain_valid(self) -> bool:
         """
@@ -413,6 +764,8 @@ class Blockchain:
             # Check current block's hash
             if current_block.hash != current_block.calculate_hash():
                 return False
+            if current_block.tx_root != current_block.calculate_tx_root():
+                return False
             
             # Check link to previous block
             if current_block.previous_hash != previous_block.hash:
@@ -421,14 +774,60 @@ class Blockchain:
         return True
     
     def get_chain_length(self) -> int:
-        """Get the length of the blockchain."""
-        return len(self.chain)
+        """Get the length of the blockchain (including heights below base_index)."""
+        return self.base_index + len(self.chain)
     
+    def restore_snapshot(self, anchor: PhiBlock, balances: Dict[str, Any],
+                         validators: List[Tuple[str, Dict[str, Any]]],
+                         vector: Tuple[int, int], step: int):
+        """
+        Replace this chain's state with a snapshot taken at `anchor`.
+
+        The anchor becomes chain[0] (base_index = anchor.index); blocks after
+        it are then added as usual. Bodies below the anchor are not held.
+
+        Args:
+            anchor: The block the snapshot was taken at
+            balances: Account balances after the anchor block
+            validators: (validator_id, record) pairs in registration order
+            vector: The PhiState vector after the anchor block
+            step: The PhiState step (equal to anchor.index)
+
+        Raises:
+            ValueError: If the state does not match the anchor block
+        """
+        if step != anchor.index or tuple(anchor.f_vector) != self.expected_f_vector(anchor.index):
+            raise ValueError("Snapshot state does not match its anchor block")
+        if tuple(vector) != PhiState.metrics_at(step):
+            raise ValueError("Snapshot state vector does not match its step")
+
+        self.chain = [anchor]
+        self.base_index = anchor.index
+        self.pending_transactions = []
+        self.undo_log.clear()
+        self.accounts = StateOverlay(dict(balances))
+        self.state = PhiState(*vector)
+        self.state.step = step
+
+        self.validators = {}
+        self.total_stake = 0
+        self.total_participation = 0
+        self._validator_order = {}
+        self._stake_heap = []
+        self._coherence_heap = []
+        for validator_id, record in validators:
+            if not self.add_validator(validator_id, record["stake"]):
+                raise ValueError(f"Invalid validator in snapshot: {validator_id}")
+            if record["participation"]:
+                self.record_participation(validator_id, record["participation"])
+            self.validators[validator_id]["blocks_proposed"] = record["blocks_proposed"]
+            self.validators[validator_id]["rewards"] = record["rewards"]
+
     def get_chain_summary(self) -> Dict[str, Any]:
         """Get a summary of the blockchain."""
         latest_block = self.get_latest_block()
         return {
-            "length": len(self.chain),
+            "length": self.get_chain_length(),
             "is_valid": self.is_chain_valid(),
             "pending_transactions": len(self.pending_transactions),
             "latest_block_hash": latest_block.hash,
@@ -455,14 +854,80 @@ class Blockchain:
         if stake < self.params.MIN_VALIDATOR_STAKE:
             return False
         
+        previous = self.validators.get(validator_id)
+        if previous is not None:
+            self.total_stake -= previous["stake"]
+            self.total_participation -= previous["participation"]
+        
         self.validators[validator_id] = {
             "stake": stake,
             "participation": 0,
             "blocks_proposed": 0,
             "rewards": 0
         }
+        self.total_stake += stake
+        order = self._validator_order.setdefault(validator_id, len(self._validator_order))
+        heapq.heappush(self._stake_heap, (-stake, order, validator_id))
+        return True
+    
+    def record_participation(self, validator_id: str, count: int = 1) -> bool:
+        """
+        Credit a validator with consensus participation.
+        
+        Args:
+            validator_id: The validator's ID
+            count: Number of participations to add
+            
+        Returns:
+            True if the validator exists
+        """
+        validator = self.validators.get(validator_id)
+        if validator is None:
+            return False
+        
+        validator["participation"] += count
+        self.total_participation += count
+        heapq.heappush(self._coherence_heap,
+                       (-validator["stake"] * validator["participation"],
+                        self._validator_order[validator_id], validator_id))
+        
+        # Each vote pushes a fresh entry; compact once stale ones dominate
+        if len(self._coherence_heap) > 2 * len(self.validators) + 64:
+            self._coherence_heap = [
+                (-v["stake"] * v["participation"], self._validator_order[vid], vid)
+                for vid, v in self.validators.items() if v["participation"] > 0
+            ]
+            heapq.heapify(self._coherence_heap)
         return True
     
+    def get_validator_index(self, validator_id: str) -> Optional[int]:
+        """Get a validator's stable index (registration order), used in vote bitfields."""
+        return self._validator_order.get(validator_id)
+    
+    def get_coherence_leader(self) -> Optional[str]:
+        """
+        Get the validator with the highest coherence score.
+        
+        Before any participation the score is stake only; afterwards it is
+        proportional to stake * participation. Ties go to the validator
+        registered first. Stale heap entries are dropped lazily.
+        
+        Returns:
+            The validator ID, or None if there are no validators
+        """
+        if self.total_participation == 0:
+            heap, key = self._stake_heap, lambda v: v["stake"]
+        else:
+            heap, key = self._coherence_heap, lambda v: v["stake"] * v["participation"]
+        
+        while heap:
+            negative_score, _, validator_id = heap[0]
+            validator = self.validators.get(validator_id)
+            if validator is not None and key(validator) == -negative_score:
+                return validator_id
+            heapq.heappop(heap)
+        return None
+    
     def get_validator_count(self) -> int:
         """Get the number of active validators."""
         return len(self.validators)
@@ -485,8 +950,8 @@ class ProofOfCoherence:
             return 0.0
         
         validator = self.validators[validator_id]
-        total_stake = sum(v["stake"] for v in self.validators.values())
-        total_participation = sum(v["participation"] for v in self.validators.values())
+        total_stake = self.blockchain.total_stake
+        total_participation = self.blockchain.total_participation
         
         if total_stake == 0:
             return 0.0
@@ -501,18 +966,8 @@ class ProofOfCoherence:
         return stake_weight * participation_weight
     
     def select_proposer(self) -> str:
-        """Select the next block proposer based on coherence scores."""
-        if not self.validators:
-            return ""
-        
-        scores = {
-            vid: self.calculate_coherence_score(vid)
-            for vid in self.validators.keys()
-        }
-        
-        # Select validator with highest score
-        proposer = max(scores, key=scores.get)
-        return proposer
+        """Select the next block proposer (highest coherence score)."""
+        return self.blockchain.get_coherence_leader() or ""
     
     def check_finality(self, block_hash: str, signatures: List[bytes]) -> bool:
         """
@@ -526,20 +981,27 @@ class ProofOfCoherence:
 class FBAConsensus:
     """Fibonacci Byzantine Agreement consensus protocol"""
     
-    def __init__(self, blockchain: Blockchain):
+    def __init__(self, blockchain: Blockchain, vote_pool: Optional[VotePool] = None):
         self.blockchain = blockchain
         self.validators = blockchain.validators
+        # Pass a shared pool to aggregate votes from several nodes
+        if vote_pool is None:
+            vote_pool = VotePool(lambda height: self.supermajority_threshold())
+        self.vote_pool = vote_pool
+    
+    def supermajority_threshold(self) -> int:
+        """Threshold = (2 * total_validators) // 3 + 1"""
+        return (2 * len(self.validators)) // 3 + 1
     
     def check_supermajority(self, votes: int) -> bool:
         """
         Check if votes reach supermajority threshold.
         Threshold = (2 * total_validators) // 3 + 1
         """
-        total_validators = len(self.validators)
-        threshold = (2 * total_validators) // 3 + 1
-        return votes >= threshold
+        return votes >= self.supermajority_threshold()
     
-    def process_vote(self, validator_id: str, block_hash: str, vote_type: str) -> bool:
+    def process_vote(self, validator_id: str, block_hash: str, vote_type: str,
+                     height: Optional[int] = None) -> bool:
         """
         Process a vote from a validator.
         
@@ -547,16 +1009,29 @@ class FBAConsensus:
             validator_id: The validator's ID
             block_hash: The block being voted on
             vote_type: "prepare" or "commit"
+            height: The height of the block (defaults to the chain head)
             
         Returns:
-            True if vote is valid and processed
+            True if vote is valid and processed (False for duplicates)
         """
-        if validator_id not in self.validators:
+        index = self.blockchain.get_validator_index(validator_id)
+        if index is None or vote_type not in PHASES:
             return False
         
-        # In production, verify BLS signature and track votes
-        self.validators[validator_id]["participation"] += 1
-        return True
+        if height is None:
+            height = self.blockchain.get_latest_block().index
+        
+        # In production, verify BLS signature before counting the vote
+        if not self.vote_pool.add_vote(height, block_hash, vote_type, index,
+                                       self.validators[validator_id]["stake"]):
+            return False
+        return self.blockchain.record_participation(validator_id)
+    
+    def has_quorum(self, block_hash: str, vote_type: str, height: Optional[int] = None) -> bool:
+        """Check whether a block has reached quorum in a phase."""
+        if height is None:
+            height = self.blockchain.get_latest_block().index
+        return self.vote_pool.has_quorum(height, block_hash, vote_type)
 
 # --- 9. Genesis Block Generation ---
 
@@ -596,18 +1071,7 @@ def generate_genesis_block() -> PhiBlock:
 def save_blockchain_to_file(blockchain: Blockchain, filename: str):
     """Save blockchain state to JSON file."""
     data = {
-        "chain": [
-            {
-                "index": int(block.index),
-                "hash": block.hash,
-                "previous_hash": block.previous_hash,
-                "timestamp": float(block.timestamp),
-                "proposer": block.proposer,
-                "f_vector": [int(x) for x in block.f_vector],
-                "transactions": [tx.to_dict() for tx in block.transactions]
-            }
-            for block in blockchain.chain
-        ],
+        "chain": [block.to_dict() for block in blockchain.chain],
         "validators": {
             vid: {
                 "stake": int(v["stake"]),
@@ -626,6 +1090,44 @@ def save_blockchain_to_file(blockchain: Blockchain, filename: str):
     with open(filename, 'w') as f:
         json.dump(data, f, indent=2)
 
+def load_blockchain_from_file(filename: str, validate: bool = True) -> Blockchain:
+    """
+    Load a blockchain saved by save_blockchain_to_file.
+    
+    Args:
+        filename: The JSON file
+        validate: Re-validate every block (False trusts the file, e.g. a local copy)
+        
+    Returns:
+        The rebuilt blockchain
+        
+    Raises:
+        ValueError: If the genesis block or any block does not check out
+    """
+    with open(filename) as f:
+        data = json.load(f)
+    
+    blocks = data["chain"]
+    blockchain = Blockchain(genesis_timestamp=blocks[0]["timestamp"])
+    if blockchain.chain[0].hash != blocks[0]["hash"]:
+        raise ValueError("Genesis block mismatch")
+    for block_data in blocks[1:]:
+        block = PhiBlock.from_dict(block_data)
+        if not blockchain.add_block(block, validate=validate):
+            raise ValueError(f"Invalid block at index {block.index}")
+    
+    for vid, v in data.get("validators", {}).items():
+        blockchain.add_validator(vid, v["stake"])
+        if v["participation"]:
+            blockchain.record_participation(vid, v["participation"])
+        blockchain.validators[vid]["blocks_proposed"] = v["blocks_proposed"]
+        blockchain.validators[vid]["rewards"] = v["rewards"]
+    
+    state = data.get("state")
+    if state is not None and state["step"] != blockchain.state.step:
+        raise ValueError("Saved state does not match the replayed chain")
+    return blockchain
+
 if __name__ == "__main__":
     # Quick verification and demonstration
     print("=" * 60)
@@ -40,6 +40,7 @@ class UnifiedPhiChain:
         # Reversible core components
         self.reversible_core = ReversibleFibonacciCore()
         self.pruning = TetrahedralPruning()
+        self.state_matrix = self.reversible_core.generate_state_matrix()
         
         # Load the reversible genesis
         try:
@@ -157,6 +158,27 @@ class UnifiedPhiChain:
         
         return result
     
+    def apply_state_matrix(self, state: np.ndarray, direction: str = "forward") -> np.ndarray:
+        """
+        Apply the reversible state transition matrix to a state vector.
+        
+        Forward multiplies by the matrix; backward solves against it, undoing
+        a forward step. Both are O(n) on the tridiagonal matrix.
+        
+        Args:
+            state: A vector of length 2*depth+1 (67 for the default depth)
+            direction: "forward" or "backward"
+            
+        Returns:
+            The transformed state
+        """
+        if direction == "forward":
+            return self.state_matrix @ state
+        elif direction == "backward":
+            return self.state_matrix.solve(state)
+        else:
+            raise ValueError(f"Unknown direction: {direction}")
+    
     def demonstrate_integration(self):
         """Display key integration insights."""
         print("\n" + "=" * 70)
@@ -190,6 +212,10 @@ class UnifiedPhiChain:
         print(f"   After 3 backward steps: {backward_state}")
         print(f"   Recovery check (should match initial): {np.allclose(backward_state, initial_state)}")
         
+        epoch_state = np.ones(self.state_matrix.shape[0])
+        recovered = self.apply_state_matrix(self.apply_state_matrix(epoch_state), "backward")
+        print(f"   State matrix {self.state_matrix.shape} round trip: {np.allclose(recovered, epoch_state)}")
+        
         print("\n5. REVERSIBLE GENESIS METADATA:")
         if self.reversible_genesis:
             meta = self.reversible_genesis.get("metadata", {})
@@ -9,10 +9,13 @@ from phi_chain_core.
 import hashlib
 import json
 import time
-import random
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 from phi_chain_core import FibonacciUtils, GenesisParameters, ValidatorSet
+from consensus.sampling import AliasTable
+from core.events import get_channel, INFO
+
+events = get_channel("fba")
 
 # Initialize Genesis Parameters
 GENESIS_PARAMS = GenesisParameters()
@@ -27,26 +30,35 @@ class FibonacciByzantineAgreement:
     
     def __init__(self, validator_set: ValidatorSet):
         self.validator_set = validator_set
+        # Cached alias table; rebuilt by invalidate() or when the set changes size
+        self._proposer_table: Optional[AliasTable] = None
+        self._table_size = -1
+    
+    def invalidate(self):
+        """Force the proposer table to be rebuilt (call after stake changes)."""
+        self._proposer_table = None
         
-    def select_proposer(self) -> str:
+    def select_proposer(self, previous_hash: Optional[str] = None) -> str:
         """
         Selects the next block proposer using a simplified Fibonacci-Weighted FBA.
         
         The probability of selection is proportional to the validator's stake,
-        embodying the principle of non-arbitrary influence.
+        embodying the principle of non-arbitrary influence. Draws are O(1) from
+        a cached alias table and deterministic when seeded with the previous
+        block hash.
         """
-        validators = list(self.validator_set.validators.keys())
-        stakes = [self.validator_set.validators[v] for v in validators]
-        total_stake = sum(stakes)
+        validators = self.validator_set.validators
+        if self._proposer_table is None or self._table_size != len(validators):
+            keys = sorted(validators)
+            self._proposer_table = AliasTable(keys, [validators[v] for v in keys])
+            self._table_size = len(validators)
         
-        if total_stake == 0:
+        if len(self._proposer_table) == 0:
             return "The_Creator_God" # Fallback to the ultimate non-arbitrary entity
-            
-        # Calculate selection weights (probability proportional to stake)
-        weights = [stake / total_stake for stake in stakes]
         
-        # Use a simple weighted random choice for the prototype
-        return random.choices(validators, weights=weights, k=1)[0]
+        if previous_hash is None:
+            return self._proposer_table.sample()
+        return self._proposer_table.sample_seeded(previous_hash)
 
     def check_finality(self, block_index: int) -> bool:
         """
@@ -64,7 +76,7 @@ class FibonacciByzantineAgreement:
         is_finalized = block_index % 5 == 0
         
         if is_finalized:
-            print(f"Block {block_index} Finalized: Simulated {finality_threshold} signatures received.")
+            events.info("Block %d Finalized: Simulated %d signatures received.", block_index, finality_threshold)
             
         return is_finalized
 
@@ -200,7 +212,7 @@ def run_prototype(num_blocks=5):
     
     for i in range(1, num_blocks + 1):
         # Select the proposer using the FBA logic
-        proposer_id = FBA_CONSENSUS.select_proposer()
+        proposer_id = FBA_CONSENSUS.select_proposer(phi_chain.get_latest_block().hash)
         
         data = f"Block {i} transactions. Proposer: {proposer_id}. Fee Tier F_{i % 12 + 1} applied."
         
@@ -235,6 +247,8 @@ if __name__ == "__main__":
     print(f"Total Validators: {len(VALIDATOR_SET.validators)}")
     print(f"Total Stake: {VALIDATOR_SET.get_total_stake()} tokens")
     
+    events.set_level(INFO)
     run_prototype(num_blocks=10)
+    events.dump()
     
 
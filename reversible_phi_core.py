@@ -14,13 +14,256 @@ Mathematical Breakthroughs:
 5. Matrix Homomorphism: Invertible Fibonacci matrices preserve algebraic structure for ZK-proofs
 """
 
+import os
+import sys
 import json
+import math
 import hashlib
-from typing import Dict, List, Tuple
+import threading
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice, repeat
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Tuple, Union
 import numpy as np
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
+# Default genesis depth: heights -33..33 around F(0) (F_33 genesis time)
+GENESIS_DEPTH = 33
+# Labels hashed per pool round trip, and the fewest worth a pool (F_19 = 4181)
+HASH_BATCH = 4181
+# Cached Zeckendorf encodings (F_17 = 1597)
+ZECKENDORF_CACHE = 1597
+
+# Shared table of F(0), F(1), ... extended on demand
+_FIB_TABLE = [0, 1]
+_FIB_LOCK = threading.Lock()
+
+
+def _extend_fib_table(n: int) -> None:
+    """Extend the shared table to hold F(n)."""
+    with _FIB_LOCK:
+        table = _FIB_TABLE
+        while len(table) <= n:
+            table.append(table[-1] + table[-2])
+
+
+def _extend_fib_table_past(value: int) -> None:
+    """Extend the shared table until its last entry exceeds `value`."""
+    with _FIB_LOCK:
+        table = _FIB_TABLE
+        while table[-1] <= value:
+            table.append(table[-1] + table[-2])
+
+
+def fibonacci(n: int) -> int:
+    """
+    F(n) for any integer n, read from the shared table.
+
+    Negative indices use F(-n) = (-1)^(n+1) * F(n).
+    """
+    k = abs(n)
+    if k >= len(_FIB_TABLE):
+        _extend_fib_table(k)
+    value = _FIB_TABLE[k]
+    return -value if n < 0 and k % 2 == 0 else value
+
+
+@lru_cache(maxsize=ZECKENDORF_CACHE)
+def _zeckendorf(n: int) -> Tuple[int, ...]:
+    """Greedy Zeckendorf terms of n >= 0, largest first."""
+    if n >= _FIB_TABLE[-1]:
+        _extend_fib_table_past(n)
+    table = _FIB_TABLE
+    terms = []
+    remainder = n
+    while remainder:
+        f = table[bisect_right(table, remainder) - 1]
+        terms.append(f)
+        remainder -= f
+    return tuple(terms)
+
+
+def zeckendorf(n: int) -> List[int]:
+    """Module-level ReversibleFibonacciCore.zeckendorf_representation."""
+    terms = _zeckendorf(abs(n))
+    return list(terms) if n >= 0 else [-f for f in terms]
+
+
+# Per-position mixing offsets, F(i) XOR F(-i) for i < 32
+_MIX_OFFSETS = tuple(fibonacci(i) ^ fibonacci(-i) for i in range(32))
+
+
+def _superpose(seed_forward: str) -> str:
+    """Fibonacci-mix a forward seed digest with its backward digest."""
+    seed_backward = hashlib.sha256(seed_forward[::-1].encode()).hexdigest()
+    mixed = "".join(
+        chr((ord(f) + ord(b) + offset) % 256)
+        for f, b, offset in zip(seed_forward, seed_backward, _MIX_OFFSETS)
+    )
+    return hashlib.sha256(mixed.encode()).hexdigest()
+
+
+def superposition_hash(block_data: str) -> str:
+    """Module-level ReversibleFibonacciCore.quantum_superposition_hash."""
+    return _superpose(hashlib.sha256(block_data.encode()).hexdigest())
+
+
+def hash_pool(labels: Iterable[str], workers: int = None) -> Iterator[str]:
+    """
+    Superposition hashes of `labels`, in order.
+
+    Labels are taken HASH_BATCH at a time; a full batch is spread over a
+    process pool when more than one worker is available, so memory stays
+    bounded however many labels are hashed.
+
+    Args:
+        labels: Strings to hash
+        workers: Pool size (defaults to the CPU count; 1 hashes inline)
+    """
+    labels = iter(labels)
+    workers = workers or os.cpu_count() or 1
+    batch = list(islice(labels, HASH_BATCH))
+    if workers == 1 or len(batch) < HASH_BATCH:
+        while batch:
+            yield from map(superposition_hash, batch)
+            batch = list(islice(labels, HASH_BATCH))
+        return
+    chunksize = max(1, HASH_BATCH // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while batch:
+            yield from pool.map(superposition_hash, batch, chunksize=chunksize)
+            batch = list(islice(labels, HASH_BATCH))
+
+
+def _saturating_float(value: int) -> float:
+    """float(value), or ±inf when it is past the float range."""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+class TridiagonalStateMatrix:
+    """
+    Square tridiagonal matrix stored as its three diagonals.
+    
+    Holds 3n floats instead of n², supports matvec, transpose and an O(n)
+    Thomas solve, and converts to a dense array only on request
+    (toarray() or np.asarray). `matrix @ x` and `.T` work as for an ndarray.
+    """
+    
+    def __init__(self, lower, diagonal, upper):
+        """
+        Initialize the matrix.
+        
+        Args:
+            lower: The n-1 entries below the diagonal (row i+1, column i)
+            diagonal: The n diagonal entries
+            upper: The n-1 entries above the diagonal (row i, column i+1)
+        """
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.diagonal = np.asarray(diagonal, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        n = len(self.diagonal)
+        if n == 0 or len(self.lower) != n - 1 or len(self.upper) != n - 1:
+            raise ValueError("off-diagonals must have one entry fewer than the diagonal")
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        n = len(self.diagonal)
+        return (n, n)
+    
+    @property
+    def dtype(self) -> np.dtype:
+        return self.diagonal.dtype
+    
+    @property
+    def nbytes(self) -> int:
+        return self.lower.nbytes + self.diagonal.nbytes + self.upper.nbytes
+    
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """
+        Compute A @ x in O(n).
+        
+        Args:
+            x: A vector of length n, or an (n, k) array of column vectors
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if x.shape[0] != len(self.diagonal):
+            raise ValueError(f"shape mismatch: {self.shape} @ {x.shape}")
+        column = (-1,) + (1,) * (x.ndim - 1)
+        y = self.diagonal.reshape(column) * x
+        y[1:] += self.lower.reshape(column) * x[:-1]
+        y[:-1] += self.upper.reshape(column) * x[1:]
+        return y
+    
+    def __matmul__(self, x: np.ndarray) -> np.ndarray:
+        return self.matvec(x)
+    
+    def transpose(self) -> "TridiagonalStateMatrix":
+        """The transpose (off-diagonals swapped)."""
+        return TridiagonalStateMatrix(self.upper, self.diagonal, self.lower)
+    
+    @property
+    def T(self) -> "TridiagonalStateMatrix":
+        return self.transpose()
+    
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        Solve A @ x = b in O(n) with the Thomas algorithm.
+        
+        The algorithm does not pivot, so a zero pivot raises even when the
+        matrix is invertible; the state matrices built by
+        generate_state_matrix have non-zero pivots.
+        
+        Args:
+            b: A vector of length n, or an (n, k) array of right-hand sides
+            
+        Returns:
+            x with the shape of b
+            
+        Raises:
+            ValueError: If b does not match or a pivot is zero
+        """
+        b = np.asarray(b, dtype=np.float64)
+        n = len(self.diagonal)
+        if b.shape[0] != n:
+            raise ValueError(f"shape mismatch: solve {self.shape} with {b.shape}")
+        lower, diagonal, upper = self.lower, self.diagonal, self.upper
+        c = np.empty(n - 1)
+        d = np.empty_like(b)
+        
+        # Forward sweep
+        pivot = diagonal[0]
+        if pivot == 0:
+            raise ValueError("zero pivot at row 0")
+        d[0] = b[0] / pivot
+        for i in range(1, n):
+            c[i - 1] = upper[i - 1] / pivot
+            pivot = diagonal[i] - lower[i - 1] * c[i - 1]
+            if pivot == 0:
+                raise ValueError(f"zero pivot at row {i}")
+            d[i] = (b[i] - lower[i - 1] * d[i - 1]) / pivot
+        
+        # Back substitution
+        for i in range(n - 2, -1, -1):
+            d[i] -= c[i] * d[i + 1]
+        return d
+    
+    def toarray(self) -> np.ndarray:
+        """The dense n x n array."""
+        return (np.diag(self.diagonal) + np.diag(self.lower, -1)
+                + np.diag(self.upper, 1))
+    
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        dense = self.toarray()
+        return dense if dtype is None else dense.astype(dtype)
+    
+    def __repr__(self) -> str:
+        return f"TridiagonalStateMatrix(shape={self.shape})"
+
 
 class ReversibleFibonacciCore:
     """Deepened Φ-Core with bidirectional state transitions."""
@@ -50,18 +293,7 @@ class ReversibleFibonacciCore:
         Returns:
             The nth Fibonacci number
         """
-        if n == 0:
-            return 0
-        elif n == 1 or n == -1:
-            return 1
-        elif n > 1:
-            a, b = 0, 1
-            for _ in range(n - 1):
-                a, b = b, a + b
-            return b
-        else:  # n < 0
-            # F(-n) = (-1)^(n+1) * F(n)
-            return (-1) ** (abs(n) + 1) * self.fib(abs(n))
+        return fibonacci(n)
     
     def zeckendorf_representation(self, n: int) -> List[int]:
         """
@@ -76,21 +308,9 @@ class ReversibleFibonacciCore:
         Returns:
             List of Fibonacci numbers that sum to n
         """
-        fib_seq = []
-        k = 1
-        while self.fib(k) <= abs(n):
-            fib_seq.append(self.fib(k))
-            k += 1
-        
-        result = []
-        remainder = abs(n)
-        for f in reversed(fib_seq):
-            if f <= remainder:
-                result.append(f if n >= 0 else -f)
-                remainder -= f
-        return result
-    
-    def generate_state_matrix(self, depth: int = 33) -> np.ndarray:
+        return zeckendorf(n)
+    
+    def generate_state_matrix(self, depth: int = 33) -> TridiagonalStateMatrix:
         """
         Generate reversible state transition matrix up to ±depth.
         
@@ -99,6 +319,10 @@ class ReversibleFibonacciCore:
         - Negative indices represent backward time (resolution)
         - The matrix is invertible, enabling quantum loop consensus
         
+        Only the three non-zero diagonals are stored; np.asarray(matrix)
+        gives the dense form. Diagonal entries F(n) past the float range
+        (|n| > 1476) saturate to ±inf.
+        
         Args:
             depth: The maximum index depth (default 33, matching F_33 genesis time)
             
@@ -106,20 +330,12 @@ class ReversibleFibonacciCore:
             A (2*depth+1) x (2*depth+1) state transition matrix
         """
         size = 2 * depth + 1
-        matrix = np.zeros((size, size), dtype=np.float64)
-        
-        for i in range(size):
-            n = i - depth  # Center at 0
-            # Main diagonal: F(n) states
-            matrix[i, i] = self.fib(n)
-            
-            # Off-diagonals for transitions
-            if i > 0:
-                matrix[i, i - 1] = 1 / self.phi  # Decay toward past
-            if i < size - 1:
-                matrix[i, i + 1] = self.phi  # Growth toward future
-        
-        return matrix
+        # Main diagonal: F(n) states, centered at 0
+        diagonal = [_saturating_float(fibonacci(n)) for n in range(-depth, depth + 1)]
+        # Off-diagonals for transitions
+        lower = np.full(size - 1, 1 / self.phi)  # Decay toward past
+        upper = np.full(size - 1, self.phi)  # Growth toward future
+        return TridiagonalStateMatrix(lower, diagonal, upper)
     
     def quantum_superposition_hash(self, block_data: str) -> str:
         """
@@ -135,17 +351,7 @@ class ReversibleFibonacciCore:
         Returns:
             A 64-character hexadecimal hash
         """
-        # Seed with both forward and backward iterations
-        seed_forward = hashlib.sha256(block_data.encode()).hexdigest()
-        seed_backward = hashlib.sha256(seed_forward[::-1].encode()).hexdigest()
-        
-        # Fibonacci mixing
-        mixed = ""
-        for i in range(32):
-            f_val = self.fib(i) ^ self.fib(-i)
-            mixed += chr((ord(seed_forward[i]) + ord(seed_backward[i]) + f_val) % 256)
-        
-        return hashlib.sha256(mixed.encode()).hexdigest()
+        return superposition_hash(block_data)
 
 
 @dataclass
@@ -183,57 +389,101 @@ class TetrahedralPruning:
         return False
 
 
-def build_reversible_genesis() -> Dict:
+@lru_cache(maxsize=8)
+def _decimal(n: int) -> str:
+    """str(n), remembered for the few values a block repeats."""
+    return str(n)
+
+
+def _py_str(value: Any) -> str:
+    """str() of a block, converting each integer to decimal only once."""
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{key!r}: {_py_str(item)}" for key, item in value.items()) + "}"
+    if isinstance(value, list):
+        return "[" + ", ".join(_py_str(item) for item in value) + "]"
+    if type(value) is int:
+        return _decimal(value)
+    return repr(value)
+
+
+class _StateDigest:
     """
-    Generate the complete reversible Φ-Core genesis block.
-    
-    This function constructs a mathematically self-consistent universe where:
-    - Pre-genesis blocks (F(-33) to F(-1)) establish the past
-    - Genesis block (F(0)) is the origin
-    - Forward blocks (F(1) to F(33)) establish the future
-    - Perfect symmetry ensures no arbitrary constants
-    
-    Returns:
-        A complete genesis dictionary ready for deployment
+    Incremental genesis state hash.
+
+    Hashes str(pre_genesis_blocks) + str(forward_blocks) one block at a
+    time, so the initial state hash never needs either list in memory.
+    """
+
+    def __init__(self):
+        self._sha = hashlib.sha256()
+        self._first = True
+
+    def open(self) -> None:
+        self._sha.update(b"[")
+        self._first = True
+
+    def add(self, block: Dict) -> None:
+        if not self._first:
+            self._sha.update(b", ")
+        self._first = False
+        self._sha.update(_py_str(block).encode())
+
+    def close(self) -> None:
+        self._sha.update(b"]")
+
+    def hexdigest(self) -> str:
+        return _superpose(self._sha.hexdigest())
+
+
+def _temporal_blocks(pruning: "TetrahedralPruning", heights: range, forward: bool,
+                     digest: _StateDigest, workers: int = None) -> Iterator[Dict]:
+    """Yield the pre-genesis or forward blocks for `heights`, feeding `digest`."""
+    prefix = "genesis_" if forward else "pre_genesis_"
+    hashes = hash_pool((f"{prefix}{n}" for n in heights), workers)
+    digest.open()
+    for block_hash, n in zip(hashes, heights):
+        value = fibonacci(n)
+        block = {
+            "height": n,
+            "fibonacci_value": value,
+            "hash": block_hash,
+            "zeckendorf_encoding": zeckendorf(value),
+        }
+        if forward:
+            block["reward_tier"] = value  # Positive for issuance
+            block["is_prunable"] = pruning.should_prune(n)
+            block["interpretation"] = "Genesis to forward state"
+        else:
+            block["is_prunable"] = pruning.should_prune(n)
+            block["interpretation"] = "Pre-genesis state (recovery point)"
+        digest.add(block)
+        yield block
+    digest.close()
+
+
+def _genesis_document(depth: int, workers: int = None) -> Dict:
+    """
+    The genesis as a lazy document.
+
+    Block lists and state matrix bands are generators and values that
+    depend on them are callables, so the document can be streamed by
+    _write_json or materialized by _materialize, in key order.
     """
-    
     core = ReversibleFibonacciCore()
     pruning = TetrahedralPruning()
+    digest = _StateDigest()
     
-    # Generate pre-genesis states (negative indices)
-    # These represent the "pre-creation" state that can be recovered to
-    pre_genesis_blocks = []
-    for n in range(-33, 0):
-        block_hash = core.quantum_superposition_hash(f"pre_genesis_{n}")
-        pre_genesis_blocks.append({
-            "height": n,
-            "fibonacci_value": core.fib(n),
-            "hash": block_hash,
-            "zeckendorf_encoding": core.zeckendorf_representation(core.fib(n)),
-            "is_prunable": pruning.should_prune(n),
-            "interpretation": "Pre-genesis state (recovery point)"
-        })
-    
-    # Genesis and forward states
-    forward_blocks = []
-    for n in range(0, 34):  # F(0) to F(33)
-        block_hash = core.quantum_superposition_hash(f"genesis_{n}")
-        forward_blocks.append({
-            "height": n,
-            "fibonacci_value": core.fib(n),
-            "hash": block_hash,
-            "zeckendorf_encoding": core.zeckendorf_representation(core.fib(n)),
-            "reward_tier": core.fib(n),  # Positive for issuance
-            "is_prunable": pruning.should_prune(n),
-            "interpretation": "Genesis to forward state"
-        })
+    # Pre-genesis states (negative indices) are the recovery points;
+    # forward states run from the genesis F(0) to F(depth)
+    pre_genesis_blocks = _temporal_blocks(pruning, range(-depth, 0), False, digest, workers)
+    forward_blocks = _temporal_blocks(pruning, range(0, depth + 1), True, digest, workers)
     
     # Generate slashing tiers (negative Fibonacci mirror)
     # Perfect symmetry: reward + penalty = 0
     slashing_tiers = {}
     for n in range(1, 21):
-        reward = core.fib(n)
-        penalty = core.fib(-n)
+        reward = fibonacci(n)
+        penalty = fibonacci(-n)
         slashing_tiers[f"tier_{n}"] = {
             "good_behavior_reward": reward,
             "equivocation_penalty": penalty,
@@ -241,24 +491,31 @@ def build_reversible_genesis() -> Dict:
             "balance_check": "Φ-invariant" if reward + penalty == 0 else "asymmetric"
         }
     
-    # State transition matrix for first epoch
-    state_matrix = core.generate_state_matrix(depth=33)
+    # State transition matrix for the first epoch, as its three diagonals
+    # (see ReversibleFibonacciCore.generate_state_matrix)
+    size = 2 * depth + 1
+    state_matrix = {
+        "format": "tridiagonal",
+        "size": size,
+        "lower": repeat(1 / core.phi, size - 1),  # Decay toward past
+        "diagonal": (fibonacci(n) for n in range(-depth, depth + 1)),
+        "upper": repeat(core.phi, size - 1),  # Growth toward future
+    }
     
     # Negative stake borrowing example
     # Demonstrates how validators can leverage negative Fibonacci for over-collateralization
     validator_economics = {
-        "base_stake": core.fib(10),  # F(10) = 55
-        "borrowable_negative": core.fib(-9),  # F(-9) = -34
+        "base_stake": fibonacci(10),  # F(10) = 55
+        "borrowable_negative": fibonacci(-9),  # F(-9) = -34
         "net_effective_stake": 21,  # 55 - 34 = 21
         "repayment_schedule": {
-            "next_epoch_forward": core.fib(11),  # F(11) = 89
+            "next_epoch_forward": fibonacci(11),  # F(11) = 89
             "repayment_from_growth": 34,
             "remainder": 55  # Returns to original
         }
     }
     
-    # Construct the complete genesis
-    genesis = {
+    return {
         "metadata": {
             "chain_name": "Reversible-Φ-Chain",
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -273,19 +530,19 @@ def build_reversible_genesis() -> Dict:
             "fibonacci_matrix_forward": core.matrix_A.tolist(),
             "fibonacci_matrix_backward": core.matrix_A_inv.tolist(),
             "eigenvalues": [float(core.phi), float(1 - 1 / core.phi)],
-            "state_transition_matrix": state_matrix.tolist(),
-            "zeckendorf_base": [core.fib(i) for i in range(1, 21)],
+            "state_transition_matrix": state_matrix,
+            "zeckendorf_base": [fibonacci(i) for i in range(1, 21)],
             "bidirectional_property": "F(-n) = (-1)^(n+1) * F(n)"
         },
         
         "temporal_architecture": {
             "pre_genesis_blocks": pre_genesis_blocks,
-            "genesis_block": forward_blocks[0],
-            "forward_blocks": forward_blocks[1:],
+            "genesis_block": lambda: next(forward_blocks),
+            "forward_blocks": forward_blocks,
             "time_symmetry_anchor": {
-                "F(-33)": core.fib(-33),
-                "F(33)": core.fib(33),
-                "symmetry_check": core.fib(-33) + core.fib(33) == 0
+                f"F({-depth})": fibonacci(-depth),
+                f"F({depth})": fibonacci(depth),
+                "symmetry_check": fibonacci(-depth) + fibonacci(depth) == 0
             }
         },
         
@@ -327,9 +584,9 @@ def build_reversible_genesis() -> Dict:
             }
         },
         
-        "initial_state_hash": core.quantum_superposition_hash(
-            str(pre_genesis_blocks) + str(forward_blocks)
-        ),
+        # Hash of str(pre_genesis_blocks) + str(forward_blocks), known
+        # once both lists have been produced
+        "initial_state_hash": digest.hexdigest,
         
         "deployment_manifest": {
             "command": "🌀 DEPLOY_REVERSIBLE_PHI_CORE",
@@ -338,8 +595,93 @@ def build_reversible_genesis() -> Dict:
             "countdown_to_2125": "100_years_of_phi_law"
         }
     }
+
+
+def _materialize(value: Any) -> Any:
+    """Resolve a lazy document into plain dicts and lists."""
+    if callable(value):
+        value = value()
+    if isinstance(value, dict):
+        return {key: _materialize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) or hasattr(value, "__next__"):
+        return [_materialize(item) for item in value]
+    return value
+
+
+def _write_json(write: Callable[[str], Any], value: Any, level: int = 0, indent: int = 2) -> None:
+    """Write a lazy document as json.dump(..., indent=indent) would, item by item."""
+    if callable(value):
+        value = value()
+    if isinstance(value, dict):
+        items, open_, close = iter(value.items()), "{", "}"
+    elif isinstance(value, (list, tuple)) or hasattr(value, "__next__"):
+        items, open_, close = iter(value), "[", "]"
+    elif type(value) is int:
+        write(_decimal(value))
+        return
+    else:
+        write(json.dumps(value, ensure_ascii=False))
+        return
+    pad = "\n" + " " * (indent * (level + 1))
+    first = True
+    for item in items:
+        write(open_ + pad if first else "," + pad)
+        first = False
+        if close == "}":
+            key, item = item
+            write(json.dumps(key, ensure_ascii=False) + ": ")
+        _write_json(write, item, level + 1, indent)
+    write(open_ + close if first else "\n" + " " * (indent * level) + close)
+
+
+def build_reversible_genesis(depth: int = GENESIS_DEPTH, workers: int = None) -> Dict:
+    """
+    Generate the complete reversible Φ-Core genesis block.
     
-    return genesis
+    This function constructs a mathematically self-consistent universe where:
+    - Pre-genesis blocks (F(-depth) to F(-1)) establish the past
+    - Genesis block (F(0)) is the origin
+    - Forward blocks (F(1) to F(depth)) establish the future
+    - Perfect symmetry ensures no arbitrary constants
+    
+    The state transition matrix is given by its three diagonals. For
+    large depths prefer write_reversible_genesis, which never holds the
+    genesis in memory.
+    
+    Args:
+        depth: Heights run from -depth to depth (default 33)
+        workers: Hash pool size (defaults to the CPU count)
+    
+    Returns:
+        A complete genesis dictionary ready for deployment
+    """
+    return _materialize(_genesis_document(depth, workers))
+
+
+def write_reversible_genesis(target: Union[str, IO[str]], depth: int = GENESIS_DEPTH,
+                             workers: int = None) -> str:
+    """
+    Stream the reversible genesis to a JSON file.
+    
+    Produces the same JSON as dumping build_reversible_genesis(depth)
+    with indent=2, writing blocks as they are hashed, so memory use does
+    not grow with the depth.
+    
+    Args:
+        target: Path or text file object to write to
+        depth: Heights run from -depth to depth (default 33)
+        workers: Hash pool size (defaults to the CPU count)
+    
+    Returns:
+        The genesis initial state hash
+    """
+    document = _genesis_document(depth, workers)
+    if isinstance(target, str):
+        with open(target, "w", encoding="utf-8") as f:
+            _write_json(f.write, document)
+    else:
+        _write_json(target.write, document)
+    return document["initial_state_hash"]()
 
 
 def demonstrate_reversible_core():
@@ -380,10 +722,9 @@ def demonstrate_reversible_core():
 
 if __name__ == "__main__":
     # Generate and save the reversible genesis
-    genesis = build_reversible_genesis()
-    
-    with open("reversible_phi_genesis.json", "w") as f:
-        json.dump(genesis, f, indent=2, ensure_ascii=False)
+    # python reversible_phi_core.py [depth]
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else GENESIS_DEPTH
+    write_reversible_genesis("reversible_phi_genesis.json", depth)
     
     # Display key insights
     demonstrate_reversible_core()
@@ -0,0 +1,420 @@
+"""
+storage/block_store.py: Append-only segmented block store with body pruning
+
+Blocks are stored in two parts. Headers (to_dict(transactions=False),
+which carries the hash, tx_root and state_root) are appended to a single
+headers file and are never pruned. Bodies (transaction lists) go to
+segment files of SEGMENT_BLOCKS heights each. Every record is framed as
+(height: u64, length: u32) + JSON, so the in-memory index is rebuilt by
+scanning the files on open and a torn record at the end is cut off.
+
+Pruning is done in two steps. prune() applies a retention policy
+(storage/pruning.py) and drops bodies from the index only; their bytes
+become dead. compact() then rewrites sealed segments whose dead share
+passes COMPACT_RATIO, deleting segments with no live bodies. Both run
+automatically each time a segment is sealed, a bounded number of
+segments at a time, so the store stays online and peak disk use stays
+bounded. The store is guarded by a lock, so compaction can run in a
+worker thread while blocks are read.
+
+A pruned height still answers get_header(); get_block() returns None.
+"""
+
+import json
+import os
+import struct
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import sys
+sys.path.insert(0, '..')
+from core.events import get_channel
+from phi_chain import Blockchain, PhiBlock, PhiTransaction
+from storage.pruning import RetentionPolicy
+
+events = get_channel("block_store")
+
+# Record framing: height, payload length
+RECORD = struct.Struct(">QI")
+
+# Heights per body segment (F_14 = 377)
+SEGMENT_BLOCKS = 377
+
+# Dead share of a segment that triggers its compaction
+COMPACT_RATIO = 0.5
+
+# Segments rewritten per automatic compaction (bounds the pause)
+COMPACT_BATCH = 3
+
+HEADERS_FILE = "headers.dat"
+SEGMENT_PREFIX = "bodies_"
+SEGMENT_SUFFIX = ".seg"
+
+
+def _encode(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _scan(path: str) -> Tuple[Dict[int, Tuple[int, int]], int]:
+    """
+    Index the records of a file, cutting off a torn record at the end.
+
+    Returns:
+        ({height: (offset, length)}, file size)
+    """
+    index: Dict[int, Tuple[int, int]] = {}
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + RECORD.size <= len(data):
+        height, length = RECORD.unpack_from(data, offset)
+        if offset + RECORD.size + length > len(data):
+            break
+        index[height] = (offset + RECORD.size, length)
+        offset += RECORD.size + length
+    if offset != len(data):
+        events.warning("Truncating torn record in %s at %d", path, offset)
+        with open(path, "r+b") as f:
+            f.truncate(offset)
+    return index, offset
+
+
+class _Segment:
+    """A body segment file and the index of its live records."""
+
+    def __init__(self, path: str, first: int):
+        self.path = path
+        self.first = first
+        self.index: Dict[int, Tuple[int, int]] = {}
+        self.size = 0
+        self.dead = 0
+
+
+class BlockStore:
+    """
+    Stores headers and bodies on disk, pruning bodies under a retention policy.
+    """
+
+    def __init__(self, directory: str, policy: Optional[RetentionPolicy] = None,
+                 segment_blocks: int = SEGMENT_BLOCKS, compact_ratio: float = COMPACT_RATIO):
+        """
+        Open (or create) a block store.
+
+        Args:
+            directory: Directory holding the headers file and body segments
+            policy: Body retention policy (default: keep every body)
+            segment_blocks: Heights per body segment
+            compact_ratio: Dead share of a segment that triggers compaction
+        """
+        if segment_blocks <= 0:
+            raise ValueError("segment_blocks must be positive")
+        self.directory = directory
+        self.policy = policy or RetentionPolicy()
+        self.segment_blocks = segment_blocks
+        self.compact_ratio = compact_ratio
+        # Bodies at or above this height are kept whatever the policy says
+        # (e.g. the tail after the latest state snapshot)
+        self.pinned_from: Optional[int] = None
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+
+        self.headers_path = os.path.join(directory, HEADERS_FILE)
+        if not os.path.exists(self.headers_path):
+            open(self.headers_path, "wb").close()
+        self.headers, self.headers_size = _scan(self.headers_path)
+        self.segments: Dict[int, _Segment] = {}
+        for name in os.listdir(directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                first = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+                segment = _Segment(os.path.join(directory, name), first)
+                segment.index, segment.size = _scan(segment.path)
+                self.segments[first] = segment
+            elif name.endswith(".tmp"):
+                # An interrupted compaction: the original segment is intact
+                os.remove(os.path.join(directory, name))
+
+        self.base = min(self.headers) if self.headers else None
+        self.tip = max(self.headers) if self.headers else None
+        self.stats = {"appended": 0, "pruned": 0, "compactions": 0, "reclaimed_bytes": 0}
+        self.peak_disk_bytes = self.disk_bytes()
+        self._headers_file = open(self.headers_path, "ab")
+        self._active: Optional[_Segment] = None
+        self._active_file = None
+
+    def close(self):
+        with self._lock:
+            self._headers_file.close()
+            if self._active_file is not None:
+                self._active_file.close()
+                self._active_file = None
+                self._active = None
+
+    def reset(self):
+        """Delete every stored header and body, leaving an empty store."""
+        with self._lock:
+            self.close()
+            for segment in self.segments.values():
+                os.remove(segment.path)
+            self.segments = {}
+            self._headers_file = open(self.headers_path, "wb")
+            self.headers, self.headers_size = {}, 0
+            self.base = self.tip = None
+
+    def __enter__(self) -> "BlockStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _segment_first(self, height: int) -> int:
+        return height - height % self.segment_blocks
+
+    def _segment_path(self, first: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{first:012d}{SEGMENT_SUFFIX}")
+
+    # --- Writing ---
+
+    def append(self, block: PhiBlock):
+        """
+        Append the next block.
+
+        Sealing a segment (the first block of the next one) prunes and
+        compacts the store.
+
+        Raises:
+            ValueError: If the block does not follow the stored tip
+        """
+        with self._lock:
+            if self.tip is not None and block.index != self.tip + 1:
+                raise ValueError(f"Expected block {self.tip + 1}, got {block.index}")
+
+            header = _encode(block.to_dict(transactions=False))
+            self._headers_file.write(RECORD.pack(block.index, len(header)) + header)
+            self._headers_file.flush()
+            self.headers[block.index] = (self.headers_size + RECORD.size, len(header))
+            self.headers_size += RECORD.size + len(header)
+
+            first = self._segment_first(block.index)
+            sealed = self._active is not None and self._active.first != first
+            if self._active is None or sealed:
+                if self._active_file is not None:
+                    self._active_file.close()
+                segment = self.segments.get(first)
+                if segment is None:
+                    segment = _Segment(self._segment_path(first), first)
+                    self.segments[first] = segment
+                self._active = segment
+                self._active_file = open(segment.path, "ab")
+
+            body = _encode([tx.to_dict() for tx in block.transactions])
+            segment = self._active
+            self._active_file.write(RECORD.pack(block.index, len(body)) + body)
+            self._active_file.flush()
+            segment.index[block.index] = (segment.size + RECORD.size, len(body))
+            segment.size += RECORD.size + len(body)
+
+            if self.base is None:
+                self.base = block.index
+            self.tip = block.index
+            self.stats["appended"] += 1
+            self._track_peak()
+            if sealed:
+                self.prune()
+                self.compact(COMPACT_BATCH)
+
+    def _track_peak(self):
+        self.peak_disk_bytes = max(self.peak_disk_bytes, self.disk_bytes())
+
+    def prune(self, tip: Optional[int] = None) -> int:
+        """
+        Drop the bodies the retention policy no longer keeps (index only).
+
+        Args:
+            tip: Height the policy is applied against (default the stored tip)
+
+        Returns:
+            The number of bodies dropped
+        """
+        with self._lock:
+            tip = self.tip if tip is None else tip
+            if tip is None:
+                return 0
+            pruned = 0
+            for segment in self.segments.values():
+                # Every body in the segment is younger than the policy's minimum
+                if tip - segment.first < self.policy.keep_recent:
+                    continue
+                for height in list(segment.index):
+                    if self.pinned_from is not None and height >= self.pinned_from:
+                        continue
+                    # The genesis body (the initial allocation) is always kept
+                    if height == 0 or self.policy.keep_body(height, tip):
+                        continue
+                    offset, length = segment.index.pop(height)
+                    segment.dead += RECORD.size + length
+                    pruned += 1
+            self.stats["pruned"] += pruned
+            return pruned
+
+    def compact(self, max_segments: Optional[int] = None) -> int:
+        """
+        Rewrite sealed segments with enough dead bytes, oldest first.
+
+        Args:
+            max_segments: Segments rewritten at most (None for all)
+
+        Returns:
+            The number of bytes reclaimed
+        """
+        reclaimed = 0
+        done = 0
+        with self._lock:
+            for first in sorted(self.segments):
+                if max_segments is not None and done >= max_segments:
+                    break
+                segment = self.segments[first]
+                if segment is self._active or segment.dead == 0:
+                    continue
+                if segment.index and segment.dead < self.compact_ratio * segment.size:
+                    continue
+                reclaimed += self._rewrite(segment)
+                done += 1
+            self.stats["compactions"] += done
+            self.stats["reclaimed_bytes"] += reclaimed
+        return reclaimed
+
+    def _rewrite(self, segment: _Segment) -> int:
+        """Copy a segment's live records to a new file and swap it in."""
+        before = segment.size
+        if not segment.index:
+            os.remove(segment.path)
+            del self.segments[segment.first]
+            return before
+
+        with open(segment.path, "rb") as f:
+            data = f.read()
+        index: Dict[int, Tuple[int, int]] = {}
+        out = bytearray()
+        for height in sorted(segment.index):
+            offset, length = segment.index[height]
+            out += RECORD.pack(height, length)
+            index[height] = (len(out), length)
+            out += data[offset:offset + length]
+        tmp = segment.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(out)
+        os.replace(tmp, segment.path)
+        segment.index = index
+        segment.size = len(out)
+        segment.dead = 0
+        return before - segment.size
+
+    # --- Reading ---
+
+    def _read(self, path: str, offset: int, length: int) -> Any:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def get_header(self, height: int) -> Optional[Dict[str, Any]]:
+        """Get a block header (available for pruned heights too)."""
+        with self._lock:
+            entry = self.headers.get(height)
+            if entry is None:
+                return None
+            return self._read(self.headers_path, *entry)
+
+    def get_body(self, height: int) -> Optional[List[Dict[str, Any]]]:
+        """Get a block's transactions as dictionaries, or None if pruned or missing."""
+        with self._lock:
+            segment = self.segments.get(self._segment_first(height))
+            if segment is None or height not in segment.index:
+                return None
+            return self._read(segment.path, *segment.index[height])
+
+    def get_block(self, height: int) -> Optional[PhiBlock]:
+        """
+        Get a full block, or None if its body was pruned (or it is not stored).
+
+        Raises:
+            ValueError: If the stored block does not hash to its header
+        """
+        with self._lock:
+            header = self.get_header(height)
+            body = self.get_body(height)
+        if header is None or body is None:
+            return None
+        return PhiBlock.from_dict(header, [PhiTransaction.from_dict(tx) for tx in body])
+
+    def status(self, height: int) -> str:
+        """Get "full", "pruned" (header only) or "missing" for a height."""
+        with self._lock:
+            if height not in self.headers:
+                return "missing"
+            segment = self.segments.get(self._segment_first(height))
+            return "full" if segment is not None and height in segment.index else "pruned"
+
+    def replay_into(self, blockchain: Blockchain) -> int:
+        """
+        Add the stored blocks after a chain's tip, up to the first pruned one.
+
+        Returns:
+            The number of blocks added
+        """
+        added = 0
+        height = blockchain.get_chain_length()
+        while self.tip is not None and height <= self.tip:
+            block = self.get_block(height)
+            if block is None or not blockchain.add_block(block):
+                break
+            added += 1
+            height += 1
+        return added
+
+    # --- Reporting ---
+
+    def disk_bytes(self) -> int:
+        """Bytes used on disk (headers plus every body segment)."""
+        return self.headers_size + sum(s.size for s in self.segments.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get disk usage and pruning counters."""
+        with self._lock:
+            bodies = sum(len(s.index) for s in self.segments.values())
+            heights = len(self.headers)
+            return dict(
+                self.stats,
+                policy=self.policy.describe(),
+                base=self.base,
+                tip=self.tip,
+                heights=heights,
+                bodies=bodies,
+                pruned_heights=heights - bodies,
+                segments=len(self.segments),
+                header_bytes=self.headers_size,
+                body_bytes=sum(s.size for s in self.segments.values()),
+                dead_bytes=sum(s.dead for s in self.segments.values()),
+                disk_bytes=self.disk_bytes(),
+                peak_disk_bytes=self.peak_disk_bytes,
+            )
+
+
+if __name__ == "__main__":
+    import tempfile
+    from storage.pruning import TetrahedralRetention
+
+    # Write a chain through a pruned store and report what is left on disk
+    chain = Blockchain(genesis_timestamp=0.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        with BlockStore(tmp, TetrahedralRetention(), segment_blocks=89) as store:
+            store.append(chain.get_latest_block())
+            for height in range(1, 2001):
+                chain.add_transaction(PhiTransaction("0x742d35Cc6634C0532925a3b844Bc454e4438f44e",
+                                                     f"0xdemo{height % 13}", 1, nonce=height))
+                store.append(chain.mine_pending_transactions("validator_001", difficulty=0))
+            stats = store.get_stats()
+            print(f"Policy: {stats['policy']}")
+            print(f"Heights {stats['heights']}, bodies {stats['bodies']}, pruned {stats['pruned_heights']}")
+            print(f"Disk {stats['disk_bytes']:,} bytes (peak {stats['peak_disk_bytes']:,}), "
+                  f"reclaimed {stats['reclaimed_bytes']:,} in {stats['compactions']} compactions")
+            print(f"Height 10: {store.status(10)}, header state_root {store.get_header(10)['state_root'][:16]}")
+            print(f"Height 1990: {store.status(1990)}")
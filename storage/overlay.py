@@ -0,0 +1,202 @@
+"""
+storage/overlay.py: Copy-on-write state overlay for Φ-Chain
+
+This module implements a layered key/value state. A layer holds only the
+keys written through it (its delta) and falls through to its parent for
+everything else, so speculative execution never copies the full state.
+
+Layers can be stacked (block -> transaction), then committed into their
+parent, discarded, or merged with another delta, all in O(delta).
+"""
+
+from typing import Any, Dict, Iterator, Mapping, Optional, Set
+from collections.abc import Mapping as MappingABC
+
+
+# Marker for keys deleted inside a layer (distinct from a stored None)
+_TOMBSTONE = object()
+
+
+class StateOverlay(MappingABC):
+    """
+    A copy-on-write view over a base mapping or a parent overlay.
+
+    The root overlay wraps a base dictionary which is only ever written by
+    committing a child layer into it. Child layers record their writes in a
+    private delta and, optionally, the keys they read (for conflict checks).
+    """
+
+    def __init__(self, base: Optional[Dict[str, Any]] = None,
+                 parent: Optional["StateOverlay"] = None,
+                 track_reads: bool = False):
+        """
+        Initialize a state overlay.
+
+        Args:
+            base: The base mapping for a root overlay (ignored if parent is set)
+            parent: The overlay this layer sits on top of
+            track_reads: Record every key read through this layer
+        """
+        self.parent = parent
+        self.base = None if parent is not None else (base if base is not None else {})
+        self.delta: Dict[str, Any] = {}
+        self.reads: Set[str] = set()
+        self.track_reads = track_reads
+        self.closed = False
+
+    # --- Layer management ---
+
+    def child(self, track_reads: bool = False) -> "StateOverlay":
+        """Create a new empty layer on top of this one."""
+        return StateOverlay(parent=self, track_reads=track_reads)
+
+    def commit(self) -> int:
+        """
+        Fold this layer's delta into its parent (or into the base for a root).
+
+        Returns:
+            The number of keys written
+        """
+        self._check_open()
+        written = len(self.delta)
+        if self.parent is not None:
+            self.parent.merge(self.delta)
+            self.closed = True
+        else:
+            for key, value in self.delta.items():
+                if value is _TOMBSTONE:
+                    self.base.pop(key, None)
+                else:
+                    self.base[key] = value
+        self.delta = {}
+        self.reads = set()
+        return written
+
+    def discard(self):
+        """Drop every write made through this layer."""
+        self.delta = {}
+        self.reads = set()
+        self.closed = self.parent is not None
+
+    def merge(self, delta: Mapping[str, Any]):
+        """
+        Apply another layer's delta on top of this layer.
+
+        Args:
+            delta: A mapping of key -> value (may contain deletions)
+        """
+        self._check_open()
+        self.delta.update(delta)
+
+    def writes(self) -> Set[str]:
+        """Get the set of keys written in this layer."""
+        return set(self.delta)
+
+    def depth(self) -> int:
+        """Get the number of layers between this one and the root."""
+        depth = 0
+        layer = self
+        while layer.parent is not None:
+            depth += 1
+            layer = layer.parent
+        return depth
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError("State layer has already been committed or discarded")
+
+    # --- Reads and writes ---
+
+    def _lookup(self, key: str) -> Any:
+        layer = self
+        while layer is not None:
+            if key in layer.delta:
+                return layer.delta[key]
+            if layer.parent is None:
+                return layer.base.get(key, _TOMBSTONE)
+            layer = layer.parent
+        return _TOMBSTONE
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Read a key, falling through to the parent layers."""
+        if self.track_reads:
+            self.reads.add(key)
+        value = self._lookup(key)
+        return default if value is _TOMBSTONE else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _TOMBSTONE)
+        if value is _TOMBSTONE:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self._check_open()
+        self.delta[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        self._check_open()
+        self.delta[key] = _TOMBSTONE
+
+    def __contains__(self, key: object) -> bool:
+        return self._lookup(key) is not _TOMBSTONE
+
+    def set(self, key: str, value: Any):
+        """Write a key into this layer."""
+        self[key] = value
+
+    def add(self, key: str, amount: Any) -> Any:
+        """
+        Add an amount to a numeric key (missing keys count as 0).
+
+        Returns:
+            The new value
+        """
+        value = self.get(key, 0) + amount
+        self[key] = value
+        return value
+
+    # --- Full views (O(state), on request only) ---
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Flatten all layers into a plain dictionary."""
+        layers = []
+        layer = self
+        while layer is not None:
+            layers.append(layer)
+            layer = layer.parent
+        flat = dict(layers[-1].base)
+        for layer in reversed(layers):
+            for key, value in layer.delta.items():
+                if value is _TOMBSTONE:
+                    flat.pop(key, None)
+                else:
+                    flat[key] = value
+        return flat
+
+    def __repr__(self) -> str:
+        return f"StateOverlay(depth={self.depth()}, delta={len(self.delta)})"
+
+
+if __name__ == "__main__":
+    # Demonstrate layered execution
+    root = StateOverlay({"0xAlice_balance": 1000, "0xBob_balance": 500})
+
+    block = root.child()
+    tx = block.child(track_reads=True)
+    tx.add("0xAlice_balance", -100)
+    tx.add("0xBob_balance", 100)
+    print(f"Tx delta: {tx.delta}, reads: {tx.reads}")
+    tx.commit()
+
+    print(f"Block view: {block.to_dict()}")
+    block.commit()
+    print(f"Root state: {root.to_dict()}")
@@ -0,0 +1,90 @@
+"""
+storage/pruning.py: Block body retention policies for the Φ-Chain block store
+
+A retention policy decides, given the current tip, whether the body
+(transaction list) of a block at some height is still kept. Headers and
+state roots are always kept; the block store drops the bodies a policy
+rejects and reclaims their space by compacting its segments.
+
+- KeepRecent keeps the last `horizon` bodies.
+- TetrahedralRetention applies reversible_phi_core.TetrahedralPruning:
+  recent bodies are kept, bodies inside the 6^3 = 216 block window are
+  thinned on the tetrahedral schedule, and older bodies are dropped.
+
+Both bound the number of bodies on disk, so disk use stays bounded (up
+to the headers, which are small and always kept).
+"""
+
+import sys
+sys.path.insert(0, '..')
+from reversible_phi_core import TetrahedralPruning
+
+# Bodies always kept behind the tip (F_8 = 21)
+KEEP_RECENT = 21
+
+
+class RetentionPolicy:
+    """Keeps every body (the base policy never prunes)."""
+
+    # Bodies younger than this (tip - height) are always kept
+    keep_recent = float("inf")
+
+    def keep_body(self, height: int, tip: int) -> bool:
+        """
+        Decide whether the body of the block at `height` is kept.
+
+        Decisions must not flip from False back to True as the tip advances.
+        """
+        return True
+
+    def describe(self) -> str:
+        return "keep all"
+
+
+class KeepRecent(RetentionPolicy):
+    """Keeps the bodies of the last `horizon` blocks."""
+
+    def __init__(self, horizon: int):
+        if horizon <= 0:
+            raise ValueError("horizon must be positive")
+        self.horizon = horizon
+        self.keep_recent = horizon
+
+    def keep_body(self, height: int, tip: int) -> bool:
+        return tip - height < self.horizon
+
+    def describe(self) -> str:
+        return f"keep last {self.horizon}"
+
+
+class TetrahedralRetention(RetentionPolicy):
+    """
+    Thins bodies on the tetrahedral schedule and drops them past its depth.
+    """
+
+    def __init__(self, scale: int = 1, keep_recent: int = KEEP_RECENT):
+        """
+        Initialize the policy.
+
+        Args:
+            scale: Blocks per schedule step (the window is 216 * scale blocks)
+            keep_recent: Bodies always kept behind the tip
+        """
+        if scale <= 0:
+            raise ValueError("scale must be positive")
+        self.schedule = TetrahedralPruning()
+        self.scale = scale
+        self.keep_recent = keep_recent
+        self.horizon = self.schedule.max_depth * scale
+
+    def keep_body(self, height: int, tip: int) -> bool:
+        age = tip - height
+        if age < self.keep_recent:
+            return True
+        if age >= self.horizon:
+            return False
+        # The schedule depends only on the height, so a decision never flips
+        return not self.schedule.should_prune(height // self.scale)
+
+    def describe(self) -> str:
+        return f"tetrahedral (window {self.horizon}, keep last {self.keep_recent})"
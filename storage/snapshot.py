@@ -0,0 +1,368 @@
+"""
+storage/snapshot.py: Chunked, content-addressed Φ-Chain state snapshots
+
+At every epoch boundary the node state (account balances, validators and
+the PhiState vector) is written as a set of chunks:
+
+- a "meta" chunk: the anchor block, the genesis hash and the PhiState
+- a "validators" chunk: validator records in registration order
+- "accounts" chunks: balances sorted by address, CHUNK_SIZE per chunk
+
+Each chunk is zlib-compressed canonical JSON stored under its sha256 in a
+shared chunks/ directory, so chunks that do not change between epochs are
+stored once. A manifest per snapshot lists the chunk ids and their Merkle
+root; any single chunk can be checked against the root with its Merkle
+proof, so chunks can be fetched, verified and decoded independently and
+in parallel. A node restores the latest snapshot and then only needs the
+blocks after its anchor.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import sys
+sys.path.insert(0, '..')
+from core.events import get_channel
+from crypto.hash import MerkleTree
+from phi_chain import Blockchain, GenesisParameters, PhiBlock
+
+events = get_channel("snapshot")
+
+# Accounts per chunk (F_19 = 4181)
+CHUNK_SIZE = 4181
+
+# Snapshots kept on disk (older ones are pruned)
+KEEP_SNAPSHOTS = 2
+
+# Worker threads for verifying and decoding chunks
+DEFAULT_WORKERS = 4
+
+MANIFEST_PREFIX = "manifest_"
+
+
+def default_epoch_length() -> int:
+    """Blocks per epoch: one block per slot (EPOCH_DURATION / SLOT_DURATION)."""
+    params = GenesisParameters()
+    return params.EPOCH_DURATION // params.SLOT_DURATION
+
+
+def encode_chunk(payload: Any) -> Tuple[str, bytes]:
+    """
+    Encode a chunk payload.
+
+    Returns:
+        (chunk id, compressed bytes), the id being the sha256 of the bytes
+    """
+    data = zlib.compress(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode())
+    return hashlib.sha256(data).hexdigest(), data
+
+
+def decode_chunk(chunk_id: str, data: bytes) -> Any:
+    """
+    Verify a chunk against its id and decode it.
+
+    Raises:
+        ValueError: If the bytes do not hash to the id
+    """
+    if hashlib.sha256(data).hexdigest() != chunk_id:
+        raise ValueError(f"Chunk {chunk_id[:16]} is corrupt")
+    return json.loads(zlib.decompress(data))
+
+
+def chunk_proof(manifest: Dict[str, Any], index: int) -> List[str]:
+    """Get the Merkle proof of a manifest's chunk `index`."""
+    return MerkleTree([chunk["id"] for chunk in manifest["chunks"]]).get_proof(index)
+
+
+def verify_chunk(data: bytes, index: int, proof: List[str], root: str) -> bool:
+    """
+    Check one chunk against a snapshot root, without the other chunks.
+
+    Args:
+        data: The chunk bytes
+        index: The chunk's position in the manifest
+        proof: Its Merkle proof (chunk_proof)
+        root: The snapshot's Merkle root
+    """
+    return MerkleTree.verify_proof(hashlib.sha256(data).hexdigest(), index, proof, root)
+
+
+class SnapshotStore:
+    """
+    Writes, loads and prunes state snapshots in a directory.
+    """
+
+    def __init__(self, directory: str, epoch_length: Optional[int] = None,
+                 chunk_size: int = CHUNK_SIZE, keep: int = KEEP_SNAPSHOTS,
+                 workers: int = DEFAULT_WORKERS):
+        """
+        Initialize a snapshot store.
+
+        Args:
+            directory: Directory holding manifests and the chunks/ directory
+            epoch_length: Blocks per epoch (default EPOCH_DURATION / SLOT_DURATION)
+            chunk_size: Accounts per chunk
+            keep: Number of snapshots kept by prune()
+            workers: Threads used to verify and decode chunks
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.directory = directory
+        self.chunk_dir = os.path.join(directory, "chunks")
+        self.epoch_length = epoch_length or default_epoch_length()
+        self.chunk_size = chunk_size
+        self.keep = keep
+        self.workers = workers
+        os.makedirs(self.chunk_dir, exist_ok=True)
+
+    def is_boundary(self, height: int) -> bool:
+        """True for the last block of an epoch (a CommitteeSelector boundary height)."""
+        return height % self.epoch_length == self.epoch_length - 1
+
+    def _manifest_path(self, height: int) -> str:
+        return os.path.join(self.directory, f"{MANIFEST_PREFIX}{height}.json")
+
+    def _chunk_path(self, chunk_id: str) -> str:
+        return os.path.join(self.chunk_dir, chunk_id)
+
+    # --- Writing ---
+
+    def capture(self, blockchain: Blockchain) -> Tuple[Dict[str, Any], List[Tuple[str, bytes]]]:
+        """
+        Encode the current state of a chain as a snapshot.
+
+        Only this step reads the chain; the result can be written later
+        (e.g. from a worker) with write().
+
+        Returns:
+            (manifest, [(chunk id, bytes), ...])
+        """
+        anchor = blockchain.get_latest_block()
+        meta = {
+            "anchor": anchor.to_dict(),
+            "genesis_hash": blockchain.genesis_hash,
+            "genesis_timestamp": blockchain.genesis_timestamp,
+            "vector": [int(x) for x in blockchain.state.vector],
+            "step": int(blockchain.state.step),
+        }
+        order = sorted(blockchain.validators, key=blockchain.get_validator_index)
+        validators = [[vid, {
+            "stake": int(blockchain.validators[vid]["stake"]),
+            "participation": int(blockchain.validators[vid]["participation"]),
+            "blocks_proposed": int(blockchain.validators[vid]["blocks_proposed"]),
+            "rewards": float(blockchain.validators[vid]["rewards"]),
+        }] for vid in order]
+        accounts = sorted(blockchain.accounts.to_dict().items())
+
+        payloads = [("meta", meta), ("validators", validators)]
+        for start in range(0, len(accounts), self.chunk_size):
+            payloads.append(("accounts", accounts[start:start + self.chunk_size]))
+
+        chunks = []
+        entries = []
+        for kind, payload in payloads:
+            chunk_id, data = encode_chunk(payload)
+            chunks.append((chunk_id, data))
+            entries.append({"id": chunk_id, "kind": kind, "size": len(data)})
+        manifest = {
+            "height": anchor.index,
+            "block_hash": anchor.hash,
+            "root": MerkleTree([entry["id"] for entry in entries]).get_root(),
+            "chunks": entries,
+        }
+        return manifest, chunks
+
+    def write(self, manifest: Dict[str, Any], chunks: List[Tuple[str, bytes]]) -> str:
+        """
+        Store a captured snapshot; chunks already on disk are not rewritten.
+
+        Returns:
+            The snapshot's Merkle root
+        """
+        for chunk_id, data in chunks:
+            path = self._chunk_path(chunk_id)
+            if os.path.exists(path):
+                continue
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        # The manifest goes last, so a listed snapshot always has its chunks
+        path = self._manifest_path(manifest["height"])
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(path + ".tmp", path)
+        events.info("Snapshot at %d: %d chunks, root %s", manifest["height"],
+                    len(chunks), manifest["root"][:16])
+        return manifest["root"]
+
+    def create(self, blockchain: Blockchain) -> str:
+        """Snapshot a chain's current state; returns the Merkle root."""
+        return self.write(*self.capture(blockchain))
+
+    def maybe_snapshot(self, blockchain: Blockchain) -> Optional[str]:
+        """
+        Snapshot the chain if its tip is an epoch boundary not yet snapshotted.
+
+        Returns:
+            The new snapshot's root, or None
+        """
+        height = blockchain.get_chain_length() - 1
+        if not self.is_boundary(height) or os.path.exists(self._manifest_path(height)):
+            return None
+        root = self.create(blockchain)
+        self.prune()
+        return root
+
+    # --- Reading ---
+
+    def heights(self) -> List[int]:
+        """Get the heights of the stored snapshots, oldest first."""
+        heights = []
+        for name in os.listdir(self.directory):
+            if name.startswith(MANIFEST_PREFIX) and name.endswith(".json"):
+                heights.append(int(name[len(MANIFEST_PREFIX):-len(".json")]))
+        return sorted(heights)
+
+    def latest(self) -> Optional[int]:
+        """Get the height of the newest snapshot, or None."""
+        heights = self.heights()
+        return heights[-1] if heights else None
+
+    def manifest(self, height: int) -> Dict[str, Any]:
+        """Read the manifest of the snapshot at `height`."""
+        with open(self._manifest_path(height)) as f:
+            return json.load(f)
+
+    def read_chunk(self, chunk_id: str) -> bytes:
+        """Read a chunk's raw bytes (e.g. to serve it to a peer)."""
+        with open(self._chunk_path(chunk_id), "rb") as f:
+            return f.read()
+
+    def _load_chunk(self, chunk_id: str) -> Any:
+        return decode_chunk(chunk_id, self.read_chunk(chunk_id))
+
+    def load(self, height: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Load and verify a snapshot, decoding its chunks in parallel.
+
+        Args:
+            height: Snapshot height (default the latest)
+
+        Returns:
+            {"manifest", "meta", "validators", "balances"}
+
+        Raises:
+            ValueError: If there is no snapshot or any chunk fails verification
+        """
+        if height is None:
+            height = self.latest()
+            if height is None:
+                raise ValueError(f"No snapshot in {self.directory}")
+        manifest = self.manifest(height)
+        ids = [chunk["id"] for chunk in manifest["chunks"]]
+        if MerkleTree(ids).get_root() != manifest["root"]:
+            raise ValueError(f"Snapshot {height}: chunk list does not match its root")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            payloads = list(pool.map(self._load_chunk, ids))
+
+        kinds = [chunk["kind"] for chunk in manifest["chunks"]]
+        meta = payloads[kinds.index("meta")]
+        if meta["anchor"]["hash"] != manifest["block_hash"] or meta["anchor"]["index"] != height:
+            raise ValueError(f"Snapshot {height}: anchor does not match the manifest")
+        balances: Dict[str, Any] = {}
+        for kind, payload in zip(kinds, payloads):
+            if kind == "accounts":
+                balances.update(payload)
+        return {
+            "manifest": manifest,
+            "meta": meta,
+            "validators": payloads[kinds.index("validators")],
+            "balances": balances,
+        }
+
+    def restore(self, height: Optional[int] = None,
+                block_hash: Optional[str] = None) -> Blockchain:
+        """
+        Build a Blockchain from a snapshot.
+
+        Args:
+            height: Snapshot height (default the latest)
+            block_hash: Trusted hash of the anchor block, if known
+
+        Returns:
+            A chain whose tip is the snapshot's anchor block
+
+        Raises:
+            ValueError: If the snapshot fails verification or does not match block_hash
+        """
+        snapshot = self.load(height)
+        meta = snapshot["meta"]
+        if block_hash is not None and snapshot["manifest"]["block_hash"] != block_hash:
+            raise ValueError("Snapshot anchor does not match the trusted block hash")
+
+        blockchain = Blockchain(genesis_timestamp=meta["genesis_timestamp"])
+        if blockchain.genesis_hash != meta["genesis_hash"]:
+            raise ValueError("Snapshot is for a different genesis block")
+        blockchain.restore_snapshot(PhiBlock.from_dict(meta["anchor"]), snapshot["balances"],
+                                    snapshot["validators"], meta["vector"], meta["step"])
+        return blockchain
+
+    # --- Pruning ---
+
+    def prune(self) -> int:
+        """
+        Delete all but the newest `keep` snapshots and their unshared chunks.
+
+        Returns:
+            The number of chunk files deleted
+        """
+        heights = self.heights()
+        for height in heights[:-self.keep] if self.keep > 0 else heights:
+            os.remove(self._manifest_path(height))
+        live = set()
+        for height in self.heights():
+            live.update(chunk["id"] for chunk in self.manifest(height)["chunks"])
+        removed = 0
+        for name in os.listdir(self.chunk_dir):
+            if name not in live:
+                os.remove(self._chunk_path(name))
+                removed += 1
+        return removed
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the number of snapshots, chunk files and bytes on disk."""
+        names = os.listdir(self.chunk_dir)
+        return {
+            "snapshots": len(self.heights()),
+            "chunks": len(names),
+            "bytes": sum(os.path.getsize(self._chunk_path(name)) for name in names),
+        }
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from phi_chain import PhiTransaction
+
+    # Snapshot a small chain at an epoch boundary and restore it
+    chain = Blockchain(genesis_timestamp=0.0)
+    chain.add_validator("validator_001", 6765)
+    for height in range(1, 21):
+        chain.add_transaction(PhiTransaction("0x742d35Cc6634C0532925a3b844Bc454e4438f44e",
+                                             f"0xdemo{height:04d}", 1, nonce=height))
+        chain.mine_pending_transactions("validator_001", difficulty=0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SnapshotStore(tmp, epoch_length=21, chunk_size=8)
+        print(f"Snapshot root: {store.maybe_snapshot(chain)}")
+        print(f"Store: {store.get_stats()}")
+        began = time.perf_counter()
+        restored = store.restore()
+        print(f"Restored height {restored.get_chain_length() - 1} in "
+              f"{(time.perf_counter() - began) * 1000:.1f} ms, "
+              f"balances match: {restored.accounts.to_dict() == chain.accounts.to_dict()}")
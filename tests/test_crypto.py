@@ -0,0 +1,73 @@
+import sys
+import os
+import hashlib
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from crypto.verifier import SignatureVerifier, vote_message
+from phi_chain_core import PipelinedBFTMessage
+from validator_node import ValidatorNetwork
+
+
+def sign(key, message):
+    return hashlib.sha256(f"{message}{key}".encode()).hexdigest()
+
+
+class TestSignatureVerifier(unittest.TestCase):
+    def setUp(self):
+        self.keys = {f"validator_{i}": f"key_{i}" for i in range(8)}
+        self.message = vote_message("0xabc", "prepare")
+
+    def make(self, **kwargs):
+        verifier = SignatureVerifier(**kwargs)
+        for signer, key in self.keys.items():
+            verifier.register_signer(signer, key)
+        return verifier
+
+    def test_batch_results_and_cache(self):
+        verifier = self.make(executor="inline")
+        for signer, key in self.keys.items():
+            verifier.submit(self.message, signer, sign(key, self.message))
+        verifier.submit(self.message, "validator_0", sign("wrong", self.message))
+        verifier.submit(self.message, "unknown", sign("key_0", self.message))
+        self.assertEqual(verifier.verify_pending(), [True] * 8 + [False, False])
+        self.assertEqual(verifier.pending, [])
+        self.assertTrue(verifier.verify(self.message, "validator_3", sign("key_3", self.message)))
+        self.assertEqual(verifier.stats["cache_hits"], 1)
+        self.assertEqual(verifier.stats["verified"], 9)
+
+    def test_thread_pool_matches_inline(self):
+        verifier = self.make(executor="thread", workers=3, min_parallel=1, cache_size=4)
+        items = [(self.message, signer, sign(key if i % 2 else "bad", self.message))
+                 for i, (signer, key) in enumerate(self.keys.items())]
+        self.assertEqual(verifier.verify_batch(items), [bool(i % 2) for i in range(8)])
+        self.assertLessEqual(len(verifier._cache), 4)
+        verifier.shutdown()
+
+    def test_bft_message_signature_bytes(self):
+        verifier = self.make(executor="inline")
+        signature = bytes.fromhex(sign("key_1", self.message))
+        verifier.submit_message(PipelinedBFTMessage("prepare", "0xabc", "validator_1", signature))
+        verifier.submit_message(PipelinedBFTMessage("commit", "0xabc", "validator_1", signature))
+        self.assertEqual(verifier.verify_pending(), [True, False])
+
+
+class TestNetworkSignatures(unittest.TestCase):
+    def test_validate_block_checks_proposer_signature(self):
+        network = ValidatorNetwork()
+        network.add_validator("validator_001", 6765)
+        network.add_validator("validator_002", 10946)
+        network.activate_all()
+        block_hash = network.blockchain.get_latest_block().hash
+        proposer = network.get_validator("validator_001")
+        block = {"block_hash": block_hash, "block_index": 0, "proposer": "validator_001",
+                 "signature": proposer.key_manager.sign_message(block_hash)}
+        validator = network.get_validator("validator_002")
+        self.assertTrue(validator.validate_block(block))
+        block["signature"] = validator.key_manager.sign_message(block_hash)
+        self.assertFalse(validator.validate_block(block))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+import io
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.events import DEBUG, ERROR, INFO, SILENT, WARNING, EventChannel, get_channel
+
+
+class TestEventChannel(unittest.TestCase):
+    def setUp(self):
+        self.echoed = io.StringIO()
+
+    def channel(self, **kwargs) -> EventChannel:
+        channel = EventChannel("test", **kwargs)
+        channel.echo_stream = self.echoed
+        return channel
+
+    def test_silent_by_default_and_enable_disable(self):
+        channel = self.channel()
+        channel.info("not recorded")
+        self.assertEqual(len(channel.buffer), 0)
+
+        channel.set_level(INFO)
+        channel.debug("below the level")
+        channel.info("Block %d processed", 3)
+        self.assertTrue(channel.enabled(WARNING))
+        self.assertFalse(channel.enabled(DEBUG))
+        channel.set_level(SILENT)
+        channel.info("disabled again")
+        lines = channel.drain()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].endswith("[test] INFO: Block 3 processed"))
+        self.assertEqual(channel.drain(), [])
+        self.assertFalse(channel.enabled(ERROR))
+
+    def test_ring_buffer_wraps_around(self):
+        channel = self.channel(level=DEBUG, capacity=3)
+        for i in range(5):
+            channel.debug("event %d", i)
+        self.assertEqual(channel.dropped, 2)
+        self.assertEqual([line.rsplit(" ", 1)[1] for line in channel.drain()], ["2", "3", "4"])
+
+    def test_warnings_are_echoed_while_silent(self):
+        channel = self.channel()
+        channel.info("quiet")
+        channel.warning("Interrupted by user")
+        channel.error("Handler failed: %s", "boom")
+        self.assertEqual(len(channel.buffer), 0)
+        echoed = self.echoed.getvalue().splitlines()
+        self.assertEqual(len(echoed), 2)
+        self.assertTrue(echoed[0].endswith("[test] WARNING: Interrupted by user"))
+        self.assertTrue(echoed[1].endswith("[test] ERROR: Handler failed: boom"))
+
+        channel.set_echo_level(SILENT)
+        channel.error("not echoed")
+        self.assertEqual(len(self.echoed.getvalue().splitlines()), 2)
+
+    def test_channels_are_shared_by_name(self):
+        self.assertIs(get_channel("test-shared"), get_channel("test-shared"))
+
+
+if __name__ == "__main__":
+    unittest.main()
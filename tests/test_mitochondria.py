@@ -0,0 +1,110 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from mitochondria_energy import (HISTORY_LENGTH, MitochondrialCell, MitochondrialCells,
+                                 MitochondrialOrgan, MitochondriaEnergySystem)
+
+# A visible efficiency, so production actually moves the charge
+EFFICIENCY = 0.618
+
+
+class TestMitochondrialCells(unittest.TestCase):
+    def test_vectorized_cycle_matches_cells(self):
+        store = MitochondrialCells.for_organs(1, 12)
+        store.current_energy[:] = store.max_energy - 1.0
+        store.efficiency[:] = EFFICIENCY
+        store.refresh_output()
+
+        cells = [MitochondrialCell(i, (i % 6) + 1) for i in range(12)]
+        for cell in cells:
+            cell.current_energy = cell.max_energy - 1.0
+            cell.efficiency = EFFICIENCY
+        for _ in range(20):
+            store.produce()
+            for cell in cells:
+                cell.produce_energy()
+        np.testing.assert_allclose(store.current_energy, [cell.current_energy for cell in cells])
+        np.testing.assert_array_equal(store.max_energy, [cell.max_energy for cell in cells])
+
+    def test_organs_share_one_store(self):
+        system = MitochondriaEnergySystem(organ_count=3, cells_per_organ=13)
+        self.assertEqual(len(system.cells), 39)
+        for _ in range(HISTORY_LENGTH + 5):
+            data = system.metabolic_cycle()
+        organ = system.organs[1]
+        self.assertEqual(len(organ.energy_history), HISTORY_LENGTH)
+        self.assertEqual(organ.total_cycles, HISTORY_LENGTH + 5)
+        self.assertAlmostEqual(data["total_produced"], sum(o.cycle_output for o in system.organs))
+
+        # Draining an organ drains its slice of the shared store
+        provided = organ.distribute_energy(100.0)
+        self.assertEqual(provided, 100.0)
+        self.assertAlmostEqual(system.cells.current_energy[13:26].sum(), organ.get_total_energy())
+        self.assertLess(organ.get_charge_level(), system.organs[0].get_charge_level())
+
+        standalone = MitochondrialOrgan(7, 8)
+        self.assertEqual(len(standalone.store), 8)
+
+    def test_default_efficiency_is_inverse_phi(self):
+        store = MitochondrialCells.for_organs(1, 6)
+        np.testing.assert_allclose(store.efficiency, 1 / 1.618033988749895)
+        self.assertAlmostEqual(MitochondrialCell(0, 1).efficiency, 1 / 1.618033988749895)
+
+    def test_cycle_output_follows_refreshed_rates(self):
+        system = MitochondriaEnergySystem(organ_count=2, cells_per_organ=8)
+        system.cells.efficiency[:] = 0.5
+        system.cells.refresh_output()
+        before = system.cells.current_energy.sum()
+        data = system.metabolic_cycle()
+        # Cells start half charged, so nothing is capped
+        self.assertAlmostEqual(data["total_produced"], system.cells.current_energy.sum() - before)
+        self.assertAlmostEqual(data["total_produced"], 0.5 * system.cells.production_rate.sum())
+
+
+def drain_in_order(energy, amount):
+    """The per-cell loop the prefix-sum allocator replaces."""
+    remaining = amount
+    for i in range(len(energy)):
+        available = min(energy[i], remaining)
+        energy[i] -= available
+        remaining -= available
+    return amount - remaining
+
+
+class TestEnergyAllocation(unittest.TestCase):
+    def test_drain_front_matches_cell_loop(self):
+        store = MitochondrialCells.for_organs(2, 21)
+        expected = store.current_energy.copy()
+        for amount in (5.0, 40.0, 0.0, 233.5, 1.0, 10000.0, 3.0):
+            self.assertAlmostEqual(store.drain_front(amount), drain_in_order(expected, amount))
+            np.testing.assert_allclose(store.current_energy, expected, atol=1e-9)
+
+        # A production cycle invalidates the prefix sums
+        store.efficiency[:] = EFFICIENCY
+        store.refresh_output()
+        store.produce()
+        expected = store.current_energy.copy()
+        self.assertAlmostEqual(store.drain_front(2.0), drain_in_order(expected, 2.0))
+        np.testing.assert_allclose(store.current_energy, expected, atol=1e-9)
+
+    def test_allocate_many_matches_sequential(self):
+        validators = [f"validator_{i}" for i in range(60)]
+        tiers = [f"tier_{i % 7 + 1}" for i in range(60)]  # tier_7 is unknown
+        one_by_one = MitochondriaEnergySystem(organ_count=2, cells_per_organ=21)
+        batched = MitochondriaEnergySystem(organ_count=2, cells_per_organ=21)
+
+        expected = [one_by_one.allocate_energy_to_validator(v, t) for v, t in zip(validators, tiers)]
+        allocated = batched.allocate_many(validators, tiers)
+        np.testing.assert_allclose(allocated, expected, atol=1e-9)
+        self.assertEqual(allocated[6], 0.0)
+        self.assertAlmostEqual(batched.total_consumed, one_by_one.total_consumed)
+        self.assertAlmostEqual(batched.get_system_charge(), 0.0)
+        np.testing.assert_allclose(batched.cells.current_energy, one_by_one.cells.current_energy, atol=1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from nero_phi_network import NeroLayer, NeroNeuron, NeroPhiNetwork
+
+
+class TestNeroForward(unittest.TestCase):
+    def test_layer_matches_neurons(self):
+        rng = np.random.default_rng(8)
+        layer = NeroLayer(3, 5, 4)
+        layer.weights[:] = rng.normal(size=(5, 4))
+        inputs = rng.random(4)
+
+        expected = []
+        for i, row in enumerate(layer.weights):
+            neuron = NeroNeuron(i, 3)
+            neuron.weights = dict(enumerate(row))
+            expected.append(neuron.activate(dict(enumerate(inputs))))
+        np.testing.assert_allclose(layer.forward(inputs), expected)
+
+        # Unconnected inputs are ignored, missing ones count as zero
+        np.testing.assert_allclose(layer.forward(np.append(inputs, 9.0)), expected)
+        np.testing.assert_allclose(layer.forward(inputs[:2]), layer.forward(np.append(inputs[:2], [0, 0])))
+
+    def test_batch_matches_one_by_one(self):
+        rng = np.random.default_rng(13)
+        one_by_one, batched = NeroPhiNetwork(), NeroPhiNetwork()
+        for a, b in zip(one_by_one.layers, batched.layers):
+            a.weights[:] = b.weights[:] = rng.normal(size=a.weights.shape)
+        ids = [f"validator_{i % 21}" for i in range(300)]
+        metrics = rng.random((300, 4))
+
+        expected = [one_by_one.learn_validator_behavior(v, dict(zip("abcd", row)))
+                    for v, row in zip(ids, metrics)]
+        np.testing.assert_allclose(batched.learn_validator_behavior_many(ids, metrics), expected)
+        self.assertEqual(len(batched.memory), batched.max_memory)
+        self.assertEqual([(m["validator_id"], m["timestamp"]) for m in batched.memory],
+                         [(m["validator_id"], m["timestamp"]) for m in one_by_one.memory])
+        self.assertAlmostEqual(batched.predict_validator_quality("validator_3"),
+                               one_by_one.predict_validator_quality("validator_3"))
+
+        with self.assertRaises(ValueError):
+            batched.learn_validator_behavior_many(ids[:2], metrics)
+
+
+class TestNeroMemory(unittest.TestCase):
+    def test_indexed_memory_matches_full_scan(self):
+        rng = np.random.default_rng(21)
+        network = NeroPhiNetwork()
+        for i in range(600):
+            validator = f"validator_{rng.integers(30)}"
+            # Some validators score high, so high performers come and go
+            confidence = rng.uniform(0.75, 1.0) if validator < "validator_2" else rng.random()
+            network._remember(validator, {}, float(confidence))
+        self.assertEqual(len(network.memory), network.max_memory)
+
+        # The former full scans over memory
+        entries = list(network.memory)
+        for validator in {m["validator_id"] for m in entries} | {"unknown"}:
+            confidences = [m["confidence"] for m in entries if m["validator_id"] == validator]
+            if not confidences:
+                self.assertEqual(network.predict_validator_quality(validator), 0.5)
+                continue
+            weights = [1, 1]
+            while len(weights) < len(confidences):
+                weights.append(weights[-1] + weights[-2])
+            weights = weights[:len(confidences)]
+            expected = sum(c * w for c, w in zip(confidences, weights)) / sum(weights)
+            self.assertAlmostEqual(network.predict_validator_quality(validator), expected)
+            self.assertAlmostEqual(network.get_validator_mean(validator), np.mean(confidences))
+
+        patterns = network.recognize_patterns()
+        high = {p["validator_id"] for p in patterns if p["type"] == "high_performer"}
+        expected_high = {v for v in network.validator_memory
+                         if np.mean([m["confidence"] for m in entries if m["validator_id"] == v]) > 0.8}
+        self.assertEqual(high, expected_high)
+        self.assertTrue(high)
+
+        recent = np.mean([m["confidence"] for m in entries[-5:]])
+        older = np.mean([m["confidence"] for m in entries[-10:-5]])
+        trend = [p for p in patterns if p["type"] == "improving_trend"]
+        self.assertEqual(bool(trend), recent > older)
+        self.assertEqual(sum(len(h) for h in network.validator_memory.values()), network.max_memory)
+
+
+if __name__ == "__main__":
+    unittest.main()
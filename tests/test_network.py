@@ -0,0 +1,310 @@
+import sys
+import os
+import copy
+import io
+import asyncio
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from network.transport import HELLO, Peer, Transport, encode_frame, parse_hello, read_frame
+from network.gossip import GossipNode, BLOCK, TX
+from network.compact import CompactBlockRelay, compact_is_well_formed, make_compact, MAX_COMPACT_TXS, SHORT_ID_SIZE
+from network.sync import ChainSync, validate_header_range
+from storage.snapshot import SnapshotStore
+from core.events import get_channel
+from phi_chain import (Blockchain, PhiBlock, PhiState, PhiTransaction,
+                       save_blockchain_to_file, load_blockchain_from_file)
+
+GENESIS_ACCOUNT = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+
+async def start_nodes(count, edges=None):
+    """Start `count` gossip nodes on free ports, fully connected unless edges are given."""
+    nodes = [GossipNode(f"node_{i}") for i in range(count)]
+    for node in nodes:
+        await node.start()
+    if edges is None:
+        edges = [(i, j) for i in range(count) for j in range(i + 1, count)]
+    for i, j in edges:
+        nodes[i].peer_ports.append(nodes[j].port)
+        nodes[j].peer_ports.append(nodes[i].port)
+    for node in nodes:
+        node.transport.connect_peers(node.peer_ports)
+    await asyncio.gather(*(node.wait_for_peers(timeout=5.0) for node in nodes))
+    return nodes
+
+
+class TestTransport(unittest.TestCase):
+    def test_frame_round_trip(self):
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(encode_frame(2, b"block") + encode_frame(3, b""))
+            return [await read_frame(reader), await read_frame(reader)]
+
+        self.assertEqual(asyncio.run(run()), [(2, b"block"), (3, b"")])
+
+    def test_full_peer_queue_drops(self):
+        async def run():
+            peer = Peer("slow", 0, None, None, queue_size=2)
+            return [peer.send(b"x") for _ in range(3)], peer.dropped
+
+        self.assertEqual(asyncio.run(run()), ([True, True, False], 1))
+
+    def test_malformed_hello_closes_the_connection(self):
+        self.assertEqual(parse_hello(b'{"node_id": "a", "port": 1}')["node_id"], "a")
+        for payload in (b"not json", b"[]", b'{"port": 1}', b'{"node_id": 7}', b'{"node_id": "a", "port": "x"}'):
+            with self.assertRaises(ValueError):
+                parse_hello(payload)
+
+        async def run():
+            transport = Transport("server")
+            await transport.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", transport.port)
+            await read_frame(reader)
+            writer.write(encode_frame(HELLO, b'{"port": 1}'))
+            await writer.drain()
+            closed = await asyncio.wait_for(reader.read(), timeout=5.0)
+            writer.close()
+            await transport.close()
+            return closed, transport.peers
+
+        self.assertEqual(asyncio.run(run()), (b"", {}))
+
+    def test_orderly_shutdown_does_not_warn(self):
+        channel = get_channel("transport")
+        channel.echo_stream = echoed = io.StringIO()
+
+        async def run():
+            nodes = await start_nodes(3)
+            for node in nodes:
+                await node.close()
+
+        try:
+            asyncio.run(run())
+        finally:
+            channel.echo_stream = None
+        self.assertEqual(echoed.getvalue(), "")
+
+
+class TestGossip(unittest.TestCase):
+    def test_flood_reaches_every_node_once(self):
+        async def run():
+            nodes = await start_nodes(4)
+            received = {node.node_id: [] for node in nodes}
+            for node in nodes:
+                node.subscribe(TX, lambda tx, source, n=node.node_id: received[n].append(tx))
+            nodes[0].publish(TX, {"value": 21})
+            nodes[0].publish(TX, {"value": 21})
+            await asyncio.sleep(0.2)
+            stats = [node.get_stats() for node in nodes]
+            for node in nodes:
+                await node.close()
+            return received, stats
+
+        received, stats = asyncio.run(run())
+        self.assertEqual(received["node_0"], [])
+        for node_id in ("node_1", "node_2", "node_3"):
+            self.assertEqual(received[node_id], [{"value": 21}])
+        self.assertEqual(stats[0]["published"], 1)
+        self.assertGreater(sum(s["duplicates"] for s in stats), 0)
+
+    def test_rejected_message_is_not_relayed(self):
+        async def run():
+            # Line topology: node_2 only hears from node_0 through node_1
+            nodes = await start_nodes(3, edges=[(0, 1), (1, 2)])
+            nodes[1].subscribe(BLOCK, lambda block, source: False)
+            got = []
+            nodes[2].subscribe(BLOCK, lambda block, source: got.append(block))
+            nodes[0].publish(BLOCK, {"index": 1})
+            await asyncio.sleep(0.1)
+            invalid = nodes[1].stats["invalid"]
+            for node in nodes:
+                await node.close()
+            return got, invalid
+
+        got, invalid = asyncio.run(run())
+        self.assertEqual(got, [])
+        self.assertEqual(invalid, 1)
+
+
+class TestBlockSerialization(unittest.TestCase):
+    def test_shared_genesis_and_block_round_trip(self):
+        a = Blockchain(genesis_timestamp=1766443333.0994673)
+        b = Blockchain(genesis_timestamp=1766443333.0994673)
+        self.assertEqual(a.chain[0].hash, b.chain[0].hash)
+
+        a.add_transaction(PhiTransaction(GENESIS_ACCOUNT, "0xabc", 55))
+        block = a.mine_pending_transactions("validator_0")
+        block.bls_signature = b"\x01\x02"
+        copy = PhiBlock.from_dict(block.to_dict())
+        self.assertEqual(copy.hash, block.hash)
+        self.assertEqual(copy.bls_signature, b"\x01\x02")
+        self.assertTrue(b.add_block(copy))
+        self.assertEqual(b.get_balance("0xabc"), 55)
+
+        tampered = block.to_dict()
+        tampered["nonce"] += 1
+        with self.assertRaises(ValueError):
+            PhiBlock.from_dict(tampered)
+
+    def test_tampered_transactions_change_the_hash(self):
+        chain = Blockchain(genesis_timestamp=0.0)
+        chain.add_transaction(PhiTransaction(GENESIS_ACCOUNT, "0xabc", 55))
+        data = chain.mine_pending_transactions("validator_0").to_dict()
+        data["transactions"][0]["value"] = 56
+        with self.assertRaises(ValueError):
+            PhiBlock.from_dict(data)
+
+
+class TestCompactRelay(unittest.TestCase):
+    def make_block(self, count):
+        chain = Blockchain(genesis_timestamp=0.0)
+        for i in range(count):
+            chain.add_transaction(PhiTransaction(GENESIS_ACCOUNT, f"0x{i:04d}", i + 1))
+        return chain.mine_pending_transactions("validator_0")
+
+    def test_short_ids_replace_transactions(self):
+        block = self.make_block(10)
+        compact = make_compact(block, nonce=7, prefill=[0])
+        self.assertEqual(len(bytes.fromhex(compact["short_ids"])), 9 * SHORT_ID_SIZE)
+        self.assertEqual(list(compact["prefilled"]), ["0"])
+        self.assertNotIn("transactions", compact["header"])
+        self.assertNotEqual(compact["short_ids"], make_compact(block, nonce=8, prefill=[0])["short_ids"])
+
+    def test_rebuild_and_fetch_missing(self):
+        block = self.make_block(8)
+
+        async def run():
+            nodes = await start_nodes(2)
+            received = []
+            sender = CompactBlockRelay(nodes[0], lambda: [], lambda b, source: True)
+            # The receiver's mempool lacks the last two transactions
+            receiver = CompactBlockRelay(nodes[1], lambda: block.transactions[:6],
+                                         lambda b, source: received.append(b))
+            sender.announce(block)
+            await asyncio.sleep(0.2)
+            for node in nodes:
+                await node.close()
+            return received, receiver.stats
+
+        received, stats = asyncio.run(run())
+        self.assertEqual([b.hash for b in received], [block.hash])
+        self.assertEqual(received[0].tx_root, block.tx_root)
+        self.assertEqual((stats["round_trips"], stats["missing_txs"]), (1, 2))
+
+    def test_incomplete_blocks_are_capped(self):
+        # Announcements whose transactions never arrive; the unstarted node
+        # drops the GET_BLOCK_TXN requests
+        relay = CompactBlockRelay(GossipNode("node_0"), lambda: [], lambda b, source: True,
+                                  partial_blocks=3)
+        blocks = [self.make_block(2) for _ in range(5)]
+        for block in blocks:
+            self.assertTrue(relay._on_compact(make_compact(block), "peer"))
+        self.assertEqual(list(relay.partial), [block.hash for block in blocks[2:]])
+        self.assertEqual(relay.stats["evicted"], 2)
+
+    def test_inconsistent_counts_are_rejected(self):
+        block = self.make_block(4)
+        self.assertTrue(compact_is_well_formed(make_compact(block, prefill=[0])))
+        for change in ({"count": 10 ** 9}, {"count": MAX_COMPACT_TXS + 1}, {"count": 5},
+                       {"count": "4"}, {"short_ids": ""}, {"short_ids": "00"},
+                       {"prefilled": {"4": {}}}, {"prefilled": {"-1": {}}}):
+            message = dict(make_compact(block, prefill=[0]), **change)
+            self.assertFalse(compact_is_well_formed(message), change)
+
+        relay = CompactBlockRelay(GossipNode("node_0"), lambda: [], lambda b, source: True)
+        self.assertFalse(relay._on_compact(dict(make_compact(block), count=10 ** 9), "peer"))
+        self.assertEqual((relay.stats["failed"], len(relay.partial)), (1, 0))
+
+
+def build_chain(blocks):
+    chain = Blockchain(genesis_timestamp=0.0)
+    for i in range(blocks):
+        chain.add_transaction(PhiTransaction(GENESIS_ACCOUNT, f"0x{i % 5}", 1))
+        chain.mine_pending_transactions("validator_0", difficulty=0)
+    return chain
+
+
+class TestSync(unittest.TestCase):
+    def test_q_matrix_jump_matches_evolve(self):
+        state = PhiState()
+        for _ in range(150):
+            state.evolve()
+        # Past F_92 the int64 state wraps; the jump must wrap the same way
+        self.assertEqual(PhiState.metrics_at(150), state.get_current_metrics())
+
+    def test_header_range_validation(self):
+        headers = [b.to_dict(transactions=False) for b in build_chain(120).chain[100:121]]
+        self.assertTrue(validate_header_range(headers, 100))
+        headers[3]["f_vector"][0] += 1
+        self.assertFalse(validate_header_range(headers, 100))
+
+    def test_sync_skips_bad_bodies(self):
+        source = build_chain(150)
+        # The second server tampers with a transfer in block 40
+        tampered = copy.deepcopy(source)
+        tampered.chain[40].transactions[0].value = 2
+
+        async def run():
+            servers = [GossipNode("good"), GossipNode("bad")]
+            client = GossipNode("client")
+            for node in servers + [client]:
+                await node.start()
+            ChainSync(servers[0], source)
+            ChainSync(servers[1], tampered)
+            for node in servers:
+                client.transport.dial(node.port)
+            await client.wait_for_peers(2, timeout=5.0)
+            chain = Blockchain(genesis_timestamp=0.0)
+            stats = await ChainSync(client, chain, header_batch=40, body_batch=10).sync()
+            for node in servers + [client]:
+                await node.close()
+            return chain, stats
+
+        chain, stats = asyncio.run(run())
+        self.assertEqual(chain.get_latest_block().hash, source.get_latest_block().hash)
+        self.assertEqual(stats["blocks"], 150)
+        self.assertEqual(chain.get_balance("0x0"), 30)
+
+    def test_sync_tail_after_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SnapshotStore(tmp, epoch_length=100)
+            source = Blockchain(genesis_timestamp=0.0)
+            for i in range(150):
+                source.add_transaction(PhiTransaction(GENESIS_ACCOUNT, f"0x{i % 5}", 1))
+                source.mine_pending_transactions("validator_0", difficulty=0)
+                store.maybe_snapshot(source)
+            chain = store.restore()
+
+        async def run():
+            server, client = GossipNode("server"), GossipNode("client")
+            for node in (server, client):
+                await node.start()
+            ChainSync(server, source)
+            client.transport.dial(server.port)
+            await client.wait_for_peers(1, timeout=5.0)
+            stats = await ChainSync(client, chain, header_batch=40, body_batch=10).sync()
+            for node in (server, client):
+                await node.close()
+            return stats
+
+        stats = asyncio.run(run())
+        # Only heights 100..150, after the snapshot anchor, are fetched
+        self.assertEqual(stats["blocks"], 51)
+        self.assertEqual(chain.get_latest_block().hash, source.get_latest_block().hash)
+        self.assertEqual(chain.get_balance("0x0"), source.get_balance("0x0"))
+
+    def test_save_and_load(self):
+        source = build_chain(20)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "chain.json")
+            save_blockchain_to_file(source, path)
+            loaded = load_blockchain_from_file(path)
+        self.assertEqual(loaded.get_latest_block().hash, source.get_latest_block().hash)
+        self.assertEqual(loaded.get_balance("0x1"), source.get_balance("0x1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -103,6 +103,15 @@ class TestPhiState(unittest.TestCase):
         self.assertEqual(f3, 3)
         self.assertEqual(f2, 2)
     
+    def test_state_revert(self):
+        """Test the inverse Q-Matrix undoes evolution, past int64 wrap-around too"""
+        for _ in range(150):
+            self.state.evolve()
+        for _ in range(150):
+            self.state.revert()
+        self.assertEqual(self.state.get_current_metrics(), (1, 1))
+        self.assertEqual(self.state.step, 0)
+    
     def test_state_hash(self):
         """Test state hash generation"""
         state_hash = self.state.get_state_hash()
@@ -222,6 +231,25 @@ class TestBlockchain(unittest.TestCase):
         self.assertEqual(block.index, 1)
         self.assertEqual(len(self.blockchain.pending_transactions), 0)
     
+    def test_overspending_transactions_stay_pending(self):
+        """Test a block takes the transactions that apply and keeps the rest pending"""
+        sender = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+        # Each transfer passes on its own, but not both after the first
+        first = PhiTransaction(sender, "0xA", 3524578 - 89)
+        overspend = PhiTransaction(sender, "0xB", 144)
+        last = PhiTransaction(sender, "0xC", 55)
+        for tx in (first, overspend, last):
+            self.assertTrue(self.blockchain.add_transaction(tx))
+        
+        block = self.blockchain.mine_pending_transactions("validator_001")
+        self.assertEqual(block.transactions, [first, last])
+        self.assertEqual(self.blockchain.pending_transactions, [overspend])
+        self.assertEqual(self.blockchain.get_balance(sender), 34)
+        
+        # Still unfunded: nothing to mine, and the transfer is kept
+        self.assertIsNone(self.blockchain.mine_pending_transactions("validator_001"))
+        self.assertEqual(self.blockchain.pending_transactions, [overspend])
+    
     def test_balance_calculation(self):
         """Test balance calculation"""
         # Initial balance from genesis
@@ -260,6 +288,61 @@ class TestBlockchain(unittest.TestCase):
         
         self.assertTrue(self.blockchain.is_chain_valid())
 
+class TestBlockchainRewind(unittest.TestCase):
+    """Test Undo Journals, Rewind and Reorgs"""
+    
+    SENDER = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+    
+    def setUp(self):
+        self.blockchain = Blockchain(genesis_timestamp=0.0)
+    
+    def mine(self, chain, recipient, value=1):
+        chain.add_transaction(PhiTransaction(self.SENDER, recipient, value))
+        return chain.mine_pending_transactions("validator_001", difficulty=0)
+    
+    def test_rewind_and_replay(self):
+        """Test rewinding k blocks restores balances and state, and replay restores the tip"""
+        self.mine(self.blockchain, "0xA")
+        before = (self.blockchain.accounts.to_dict(), self.blockchain.state.get_current_metrics())
+        for i in range(5):
+            self.mine(self.blockchain, f"0xB{i}", 2)
+        tip = self.blockchain.get_latest_block().hash
+        
+        removed = self.blockchain.rewind(5)
+        self.assertEqual([b.index for b in removed], [2, 3, 4, 5, 6])
+        self.assertEqual(self.blockchain.get_chain_length(), 2)
+        self.assertEqual((self.blockchain.accounts.to_dict(), self.blockchain.state.get_current_metrics()), before)
+        self.assertNotIn("0xB0", self.blockchain.accounts)
+        
+        self.assertEqual(self.blockchain.replay(removed), 5)
+        self.assertEqual(self.blockchain.get_latest_block().hash, tip)
+        with self.assertRaises(ValueError):
+            self.blockchain.rewind(self.blockchain.get_chain_length())
+    
+    def test_reorg(self):
+        """Test switching to a competing branch and rejecting an invalid one"""
+        fork = Blockchain(genesis_timestamp=0.0)
+        self.mine(self.blockchain, "0xA")
+        fork.add_block(self.blockchain.get_block(1))
+        for i in range(2):
+            self.mine(self.blockchain, f"0xMain{i}")
+        for i in range(3):
+            self.mine(fork, f"0xFork{i}")
+        
+        self.assertTrue(self.blockchain.reorg(fork.chain[2:]))
+        self.assertEqual(self.blockchain.get_latest_block().hash, fork.get_latest_block().hash)
+        self.assertEqual(self.blockchain.accounts.to_dict(), fork.accounts.to_dict())
+        # The dropped branch's transfers are pending again
+        self.assertEqual(sorted(tx.recipient for tx in self.blockchain.pending_transactions),
+                         ["0xMain0", "0xMain1"])
+        
+        tip = self.blockchain.get_latest_block().hash
+        bad = PhiBlock.from_dict(fork.get_block(3).to_dict())
+        bad.transactions[0].value = 10 ** 9
+        self.assertFalse(self.blockchain.reorg([fork.get_block(2), bad]))
+        self.assertEqual(self.blockchain.get_latest_block().hash, tip)
+        self.assertEqual(self.blockchain.accounts.to_dict(), fork.accounts.to_dict())
+
 class TestProofOfCoherence(unittest.TestCase):
     """Test Proof-of-Coherence Consensus"""
     
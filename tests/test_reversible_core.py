@@ -0,0 +1,178 @@
+import sys
+import os
+import io
+import json
+import hashlib
+import math
+import unittest
+from fractions import Fraction
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.phi_math import phi_fixed, phi_multiply
+from core.reversible_core import (ReversibleBlock, TemporalChain, phi_hash_batch, phi_hash_pair,
+                                  hash_prefixes, validate_symmetry_many)
+from reversible_phi_core import (HASH_BATCH, ReversibleFibonacciCore, TridiagonalStateMatrix,
+                                 build_reversible_genesis, fibonacci, hash_pool, superposition_hash,
+                                 write_reversible_genesis)
+
+# φ to 100 digits, exact enough for 256-bit products
+PHI = (1 + Fraction(math.isqrt(5 * 10 ** 200), 10 ** 100)) / 2
+
+
+class TestPhiHash(unittest.TestCase):
+    def test_fixed_point_phi(self):
+        self.assertEqual(phi_fixed(64), math.floor(PHI * 2 ** 64))
+        value = int.from_bytes(hashlib.sha3_256(b"phi").digest(), "big")
+        self.assertEqual(phi_multiply(value), math.floor(value * PHI))
+
+    def test_phi_and_mirror_hashes_are_exact(self):
+        value = int.from_bytes(hashlib.sha3_256("block".encode()).digest(), "big")
+        phi_hash, mirror_hash = phi_hash_pair(b"block")
+        self.assertEqual(int(phi_hash, 16), math.floor(value * PHI) % 2 ** 256)
+        self.assertEqual(int(mirror_hash, 16), math.floor(value * PHI * PHI) % 2 ** 256)
+
+        backward = ReversibleBlock("block", direction="backward")
+        self.assertEqual((backward.phi_hash, backward.mirror_hash), (phi_hash, mirror_hash))
+        self.assertEqual(ReversibleBlock("block").mirror_hash, phi_hash)
+
+    def test_batch_matches_single(self):
+        items = [f"tx {i}" for i in range(50)]
+        self.assertEqual(phi_hash_batch(items), [phi_hash_pair(item.encode()) for item in items])
+
+
+class TestTemporalChain(unittest.TestCase):
+    def test_rewind_and_replay_restore_state(self):
+        chain = TemporalChain()
+        self.assertEqual(chain.add_blocks([f"block {i}" for i in range(8)]), 8)
+        tip = chain.forward_chain[-1]
+        self.assertEqual(chain.state, (34, 21))
+
+        removed = chain.rewind(3)
+        self.assertEqual(len(removed), 3)
+        self.assertEqual(chain.state, (8, 5))
+        self.assertEqual(len(chain.replay()), 3)
+        self.assertIs(chain.forward_chain[-1], tip)
+        self.assertEqual(chain.state, (34, 21))
+
+        # A new block after a rewind discards the redo log
+        chain.rewind(1)
+        chain.add_block("other branch")
+        self.assertEqual(chain.replay(), [])
+
+
+def symmetric_data(chain, direction, tag):
+    """Search for block data the chain accepts next in `direction`."""
+    opposite = chain.backward_chain if direction == "forward" else chain.forward_chain
+    for i in range(100000):
+        block = ReversibleBlock(f"{tag} {i}", direction=direction)
+        if not opposite or block.validate_symmetry(opposite[-1]):
+            return block.data
+    raise AssertionError("no symmetric block found")
+
+
+class TestSymmetryTracking(unittest.TestCase):
+    def test_running_count_follows_add_and_rewind(self):
+        chain = TemporalChain()
+        for i in range(4):
+            for direction in ("forward", "backward"):
+                self.assertTrue(chain.add_block(symmetric_data(chain, direction, f"{direction} {i}"), direction)[1])
+        self.assertEqual(chain.symmetric_pairs, 4)
+        self.assertEqual(chain.get_stats()["symmetry_score"], 1.0)
+        self.assertTrue(chain.get_temporal_state(2)["is_symmetric"])
+
+        chain.rewind(2)
+        self.assertEqual((len(chain.pair_symmetry), chain.symmetric_pairs), (2, 2))
+        chain.replay()
+        self.assertEqual(chain.symmetric_pairs, 4)
+        self.assertEqual(chain.audit_symmetry(), chain.symmetric_pairs)
+
+    def test_bulk_validation_matches_pairwise(self):
+        forward = [ReversibleBlock(f"f {i}") for i in range(300)]
+        backward = [ReversibleBlock(f"b {i}", direction="backward") for i in range(300)]
+        # Include known symmetric pairs and a short (leading zeros) hash
+        chain = TemporalChain()
+        for i in range(3):
+            for direction in ("forward", "backward"):
+                chain.add_block(symmetric_data(chain, direction, f"{direction} {i}"), direction)
+        forward += chain.forward_chain
+        backward += chain.backward_chain
+        forward[0].phi_hash = "0" * 12 + forward[0].phi_hash[12:]
+
+        f_hashes = [b.phi_hash for b in forward]
+        b_hashes = [b.mirror_hash for b in backward]
+        result = validate_symmetry_many(hash_prefixes(f_hashes), hash_prefixes(b_hashes), f_hashes, b_hashes)
+        self.assertEqual(result.tolist(), [f.validate_symmetry(b) for f, b in zip(forward, backward)])
+        self.assertGreaterEqual(int(result.sum()), 3)
+
+
+class TestReversibleGenesis(unittest.TestCase):
+    def test_fibonacci_table_and_zeckendorf(self):
+        a, b = 0, 1
+        for n in range(60):
+            self.assertEqual(fibonacci(n), a)
+            self.assertEqual(fibonacci(-n), (-1) ** (n + 1) * a if n else 0)
+            a, b = b, a + b
+        core = ReversibleFibonacciCore()
+        self.assertEqual(core.zeckendorf_representation(42), [34, 8])
+        self.assertEqual(core.zeckendorf_representation(-42), [-34, -8])
+        self.assertEqual(core.zeckendorf_representation(0), [])
+
+    def test_streamed_genesis_matches_in_memory(self):
+        out = io.StringIO()
+        state_hash = write_reversible_genesis(out, depth=21, workers=1)
+        streamed = json.loads(out.getvalue())
+        genesis = build_reversible_genesis(depth=21, workers=1)
+        streamed["metadata"]["timestamp"] = genesis["metadata"]["timestamp"]
+        self.assertEqual(json.loads(json.dumps(genesis)), streamed)
+
+        temporal = genesis["temporal_architecture"]
+        forward = [temporal["genesis_block"]] + temporal["forward_blocks"]
+        expected = superposition_hash(str(temporal["pre_genesis_blocks"]) + str(forward))
+        self.assertEqual(state_hash, expected)
+        self.assertEqual(genesis["initial_state_hash"], expected)
+
+        matrix = genesis["mathematical_foundations"]["state_transition_matrix"]
+        self.assertEqual(matrix["size"], 43)
+        self.assertEqual(matrix["diagonal"][0], fibonacci(-21))
+        self.assertEqual(len(matrix["upper"]), 42)
+
+    def test_hash_pool_matches_serial(self):
+        labels = [f"genesis_{n}" for n in range(HASH_BATCH + 10)]
+        self.assertEqual(list(hash_pool(labels, workers=2)), [superposition_hash(l) for l in labels])
+        self.assertEqual(ReversibleFibonacciCore().quantum_superposition_hash("x"), superposition_hash("x"))
+
+
+class TestTridiagonalStateMatrix(unittest.TestCase):
+    def test_matches_dense_state_matrix(self):
+        matrix = ReversibleFibonacciCore().generate_state_matrix(13)
+        dense = np.asarray(matrix)
+        self.assertEqual(dense.shape, (27, 27))
+        self.assertEqual(dense[0, 0], fibonacci(-13))
+        self.assertAlmostEqual(dense[5, 6] * dense[6, 5], 1.0)
+        self.assertEqual(np.count_nonzero(dense), 3 * 27 - 2 - 1)  # F(0) = 0
+
+        rng = np.random.default_rng(21)
+        x, b = rng.random(27), rng.random((27, 3))
+        np.testing.assert_allclose(matrix @ x, dense @ x)
+        np.testing.assert_allclose(matrix.T @ b, dense.T @ b)
+        np.testing.assert_allclose(matrix.solve(b), np.linalg.solve(dense, b))
+
+    def test_solve_rejects_zero_pivot_and_bad_shapes(self):
+        with self.assertRaises(ValueError):
+            TridiagonalStateMatrix([1.0], [0.0, 1.0], [1.0]).solve(np.ones(2))
+        with self.assertRaises(ValueError):
+            TridiagonalStateMatrix([1.0, 1.0], [1.0, 1.0], [1.0])
+        with self.assertRaises(ValueError):
+            TridiagonalStateMatrix([1.0], [2.0, 2.0], [1.0]) @ np.ones(3)
+
+    def test_large_depth_stays_banded(self):
+        matrix = ReversibleFibonacciCore().generate_state_matrix(10000)
+        self.assertEqual(matrix.shape, (20001, 20001))
+        self.assertLess(matrix.nbytes, 500000)
+        self.assertTrue(np.isfinite(matrix.solve(np.ones(20001))).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
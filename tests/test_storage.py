@@ -0,0 +1,268 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from storage.overlay import StateOverlay
+from storage.snapshot import SnapshotStore, chunk_proof, verify_chunk
+from storage.block_store import BlockStore
+from storage.pruning import KeepRecent, TetrahedralRetention
+from opevm_executor import OPEVMExecutor
+from phi_chain import Blockchain, PhiTransaction
+from phi_chain_core import PhiTransaction as CoreTransaction
+from validator_node import ValidatorNodeRunner
+
+GENESIS_ADDRESS = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+
+class TestStateOverlay(unittest.TestCase):
+    def setUp(self):
+        self.base = {"a": 1, "b": 2}
+        self.root = StateOverlay(self.base)
+
+    def test_child_reads_through(self):
+        layer = self.root.child()
+        self.assertEqual(layer["a"], 1)
+        layer["a"] = 10
+        self.assertEqual(layer["a"], 10)
+        self.assertEqual(self.root["a"], 1)
+        self.assertEqual(layer.delta, {"a": 10})
+
+    def test_commit_and_discard(self):
+        block = self.root.child()
+        tx = block.child()
+        tx["c"] = 3
+        tx.commit()
+        discarded = block.child()
+        discarded["a"] = 99
+        discarded.discard()
+        self.assertEqual(block.to_dict(), {"a": 1, "b": 2, "c": 3})
+        block.commit()
+        self.root.commit()
+        self.assertEqual(self.base, {"a": 1, "b": 2, "c": 3})
+        with self.assertRaises(ValueError):
+            tx["d"] = 4
+
+    def test_delete_and_track_reads(self):
+        layer = self.root.child(track_reads=True)
+        del layer["b"]
+        self.assertNotIn("b", layer)
+        self.assertEqual(layer.get("a"), 1)
+        self.assertEqual(layer.reads, {"a"})
+        layer.commit()
+        self.root.commit()
+        self.assertEqual(self.base, {"a": 1})
+
+
+class TestOverlayExecution(unittest.TestCase):
+    def test_executor_conflict_reexecution(self):
+        state = {"0xAlice_balance": 1000, "0xBob_balance": 500}
+        executor = OPEVMExecutor(state)
+        tx0 = CoreTransaction("0xAlice", "0xBob", 100,
+                              read_set=["0xAlice_balance", "0xBob_balance"],
+                              write_set=["0xAlice_balance", "0xBob_balance"])
+        tx1 = CoreTransaction("0xAlice", "0xCharlie", 50,
+                              read_set=["0xAlice_balance"],
+                              write_set=["0xAlice_balance"])
+        final_state, re_executed = executor.execute_block([tx0, tx1])
+        self.assertEqual(re_executed, [1])
+        self.assertEqual(final_state["0xAlice_balance"], 850)
+        self.assertEqual(final_state["0xBob_balance"], 600)
+
+    def test_block_rejects_overspend_within_block(self):
+        blockchain = Blockchain()
+        balance = blockchain.get_balance(GENESIS_ADDRESS)
+        for _ in range(2):
+            blockchain.pending_transactions.append(
+                PhiTransaction(GENESIS_ADDRESS, "0xBob", int(balance * 0.6)))
+        block = blockchain.mine_pending_transactions("validator_001")
+        self.assertEqual(len(block.transactions), 1)
+        self.assertEqual(blockchain.get_balance("0xBob"), int(balance * 0.6))
+
+
+def build_with_snapshots(blocks, store):
+    """Build a chain of one-transfer blocks, snapshotting at each epoch boundary."""
+    chain = Blockchain(genesis_timestamp=0.0)
+    chain.add_validator("validator_0", 6765)
+    for i in range(blocks):
+        chain.add_transaction(PhiTransaction(GENESIS_ADDRESS, f"0x{i}", 1))
+        chain.mine_pending_transactions("validator_0", difficulty=0)
+        store.maybe_snapshot(chain)
+    return chain
+
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(self.tmp.name, epoch_length=10, chunk_size=4)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_restore_then_replay_tail(self):
+        chain = build_with_snapshots(35, self.store)
+        self.assertEqual(self.store.heights(), [19, 29])
+
+        restored = self.store.restore(block_hash=chain.get_block(29).hash)
+        self.assertEqual(restored.get_chain_length(), 30)
+        self.assertIsNone(restored.get_block(28))
+        self.assertEqual(restored.validators, chain.validators)
+        for block in chain.chain[30:]:
+            self.assertTrue(restored.add_block(block))
+        self.assertEqual(restored.get_latest_block().hash, chain.get_latest_block().hash)
+        self.assertEqual(restored.accounts.to_dict(), chain.accounts.to_dict())
+        self.assertEqual(restored.state.get_current_metrics(), chain.state.get_current_metrics())
+
+    def test_chunks_verify_independently(self):
+        build_with_snapshots(20, self.store)
+        manifest = self.store.manifest(19)
+        self.assertGreater(len(manifest["chunks"]), 3)
+        for index, chunk in enumerate(manifest["chunks"]):
+            data = self.store.read_chunk(chunk["id"])
+            self.assertTrue(verify_chunk(data, index, chunk_proof(manifest, index), manifest["root"]))
+        self.assertFalse(verify_chunk(b"forged", 0, chunk_proof(manifest, 0), manifest["root"]))
+
+        # A corrupt chunk on disk fails the load
+        path = os.path.join(self.store.chunk_dir, manifest["chunks"][-1]["id"])
+        with open(path, "wb") as f:
+            f.write(b"corrupt")
+        with self.assertRaises(ValueError):
+            self.store.load(19)
+
+    def test_prune_keeps_shared_chunks(self):
+        build_with_snapshots(40, self.store)
+        self.assertEqual(self.store.heights(), [29, 39])
+        live = set()
+        for height in self.store.heights():
+            live.update(chunk["id"] for chunk in self.store.manifest(height)["chunks"])
+        # Unchanged chunks (e.g. the validators) are stored once
+        self.assertEqual(set(os.listdir(self.store.chunk_dir)), live)
+        self.assertLess(len(live), sum(len(self.store.manifest(h)["chunks"]) for h in (29, 39)))
+
+
+class TestBlockStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.chain = Blockchain(genesis_timestamp=0.0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fill(self, store, blocks):
+        if store.tip is None:
+            store.append(self.chain.get_latest_block())
+        for i in range(blocks):
+            self.chain.add_transaction(PhiTransaction(GENESIS_ADDRESS, f"0x{i % 7}", 1))
+            store.append(self.chain.mine_pending_transactions("validator_0", difficulty=0))
+
+    def test_prune_keeps_headers_and_bounds_disk(self):
+        with BlockStore(self.tmp.name, KeepRecent(30), segment_blocks=10) as store:
+            self.fill(store, 100)
+            body_bytes = store.get_stats()["body_bytes"]
+            self.fill(store, 300)
+            stats = store.get_stats()
+        # Bodies older than the horizon are gone, whole segments included
+        self.assertLess(stats["body_bytes"], 1.1 * body_bytes)
+        self.assertLessEqual(stats["segments"], 6)
+        self.assertGreater(stats["reclaimed_bytes"], 0)
+        self.assertEqual(store.status(0), "full")
+        self.assertEqual(store.status(100), "pruned")
+        self.assertIsNone(store.get_block(100))
+        self.assertEqual(store.get_header(100)["hash"], self.chain.get_block(100).hash)
+        self.assertEqual(store.get_header(100)["state_root"], self.chain.get_block(100).state_root)
+        self.assertEqual(store.get_block(395).hash, self.chain.get_block(395).hash)
+        self.assertEqual(store.status(401), "missing")
+
+    def test_reopen_rebuilds_index_and_replays(self):
+        with BlockStore(self.tmp.name, segment_blocks=10) as store:
+            self.fill(store, 25)
+        # A torn record at the end (e.g. a crash mid-write) is cut off
+        with open(os.path.join(self.tmp.name, "headers.dat"), "ab") as f:
+            f.write(b"\x00\x00")
+        with BlockStore(self.tmp.name, segment_blocks=10) as store:
+            self.assertEqual(store.tip, 25)
+            chain = Blockchain(genesis_timestamp=0.0)
+            self.assertEqual(store.replay_into(chain), 25)
+            self.fill(store, 1)
+        self.assertEqual(chain.get_latest_block().hash, self.chain.get_block(25).hash)
+
+    def test_tetrahedral_schedule_and_pinning(self):
+        policy = TetrahedralRetention()
+        tip = 1000
+        self.assertTrue(policy.keep_body(tip - 5, tip))
+        self.assertFalse(policy.keep_body(tip - 300, tip))
+        # Inside the window the tetrahedral schedule thins every sixth height
+        self.assertFalse(policy.keep_body(900, tip))
+        self.assertTrue(policy.keep_body(901, tip))
+
+        with BlockStore(self.tmp.name, policy, segment_blocks=50) as store:
+            store.pinned_from = 100
+            self.fill(store, 400)
+            self.assertEqual(store.status(60), "pruned")
+            self.assertEqual(store.status(120), "full")
+            self.assertEqual(store.status(300), "full")
+
+
+
+class TestNodeRestart(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = os.path.join(self.tmp.name, "node.json")
+        self.write_config(block_dir=os.path.join(self.tmp.name, "blocks"),
+                          snapshot_dir=os.path.join(self.tmp.name, "snapshots"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_config(self, **dirs):
+        with open(self.config, "w") as f:
+            json.dump(dict(validator_id="validator_0", stake=6765, **dirs), f)
+
+    def run_blocks(self, runner, count):
+        blockchain = runner.node.blockchain
+        persist = runner.build_runtime().persist
+        for i in range(count):
+            blockchain.add_transaction(PhiTransaction(GENESIS_ADDRESS, f"0x{i % 3}", 1))
+            persist([{"block": blockchain.mine_pending_transactions("validator_0", difficulty=0)}])
+
+    def test_restart_before_first_snapshot_replays_the_store(self):
+        runner = ValidatorNodeRunner(self.config)
+        self.run_blocks(runner, 5)
+        tip = runner.node.blockchain.get_latest_block().hash
+        runner.blocks.close()
+
+        restarted = ValidatorNodeRunner(self.config)
+        self.assertEqual(restarted.node.blockchain.get_latest_block().hash, tip)
+        # Bodies are kept until the first snapshot, and appends resume at the tip
+        self.assertEqual(restarted.blocks.pinned_from, 0)
+        self.run_blocks(restarted, 1)
+        self.assertEqual(restarted.blocks.tip, 6)
+        restarted.blocks.close()
+
+    def test_unreconciled_store_is_reset(self):
+        runner = ValidatorNodeRunner(self.config)
+        self.run_blocks(runner, 3)
+        runner.blocks.close()
+        # Without the bodies the stored blocks cannot be replayed
+        block_dir = os.path.join(self.tmp.name, "blocks")
+        for name in os.listdir(block_dir):
+            if name.endswith(".seg"):
+                os.remove(os.path.join(block_dir, name))
+
+        restarted = ValidatorNodeRunner(self.config)
+        self.assertEqual(restarted.blocks.tip, 0)
+        self.run_blocks(restarted, 1)
+        self.assertEqual(restarted.blocks.tip, 1)
+        restarted.blocks.close()
+
+    def test_block_dir_requires_snapshot_dir(self):
+        self.write_config(block_dir=os.path.join(self.tmp.name, "blocks"))
+        with self.assertRaises(ValueError):
+            ValidatorNodeRunner(self.config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+import os
+import unittest
+import tempfile
+from datetime import datetime
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from transaction_analyzer import CHAIN_PROFILES, BlockchainType, ColumnarDataset, TransactionAnalyzer
+
+
+class TestStreamingDataset(unittest.TestCase):
+    def test_batches_follow_chain_profiles(self):
+        analyzer = TransactionAnalyzer(seed=5)
+        rng = np.random.default_rng(8)
+        for blockchain, profile in CHAIN_PROFILES.items():
+            block, batch = analyzer.generator.generate_batch(blockchain, 1e9, rng)
+            low, high = profile["tx_count"]
+            self.assertTrue(low <= len(batch) == block["transaction_count"] <= high)
+            self.assertTrue(np.all(batch.amount >= profile["amount"][0]))
+            self.assertTrue(np.all(batch.amount < profile["amount"][1]))
+            self.assertTrue(np.all((batch.timestamp <= 1e9) & (batch.timestamp >= 1e9 - 600)))
+            self.assertFalse(np.any(batch.sender == batch.receiver))
+            self.assertGreater(block["size_bytes"], int(batch.size_bytes.sum()))
+
+    def test_online_metrics_match_materialized_rows(self):
+        dataset = TransactionAnalyzer(seed=13).generate_dataset(hours=1)
+        for name, chain in dataset["blockchains"].items():
+            transactions, blocks, metrics = chain["transactions"], chain["blocks"], chain["metrics"]
+            self.assertEqual(metrics["total_transactions"], len(transactions))
+            self.assertAlmostEqual(metrics["average_fee"], np.mean([tx["fee"] for tx in transactions]))
+            self.assertAlmostEqual(metrics["total_volume"], sum(tx["amount"] for tx in transactions), delta=1e-6)
+
+            # The former metrics re-parsed ISO timestamps
+            times = [datetime.fromisoformat(tx["timestamp"]) for tx in transactions]
+            tps = len(transactions) / (max(times) - min(times)).total_seconds()
+            self.assertAlmostEqual(metrics["transactions_per_second"], tps)
+            block_times = [datetime.fromisoformat(b["timestamp"]) for b in blocks]
+            gaps = [(b - a).total_seconds() for a, b in zip(block_times, block_times[1:])]
+            self.assertAlmostEqual(metrics["average_block_time"], np.mean(gaps) if gaps else 0)
+
+        summary = TransactionAnalyzer(seed=13).summarize(hours=1)
+        self.assertNotIn("transactions", summary["blockchains"]["kaspa"])
+        self.assertEqual(set(summary["blockchains"]), {b.value for b in BlockchainType})
+
+
+class TestColumnarExport(unittest.TestCase):
+    def test_columns_and_rollups_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            summary = TransactionAnalyzer(seed=21).export_columns(directory, hours=2)
+            dataset = ColumnarDataset(directory)
+            self.assertEqual(set(dataset.chains), {b.value for b in BlockchainType})
+
+            for name in dataset.chains:
+                metrics = dataset.metrics(name)
+                self.assertEqual(metrics, summary["blockchains"][name]["metrics"])
+
+                tx = dataset.columns(name)
+                self.assertIsInstance(tx["amount"], np.memmap)
+                self.assertEqual(len(tx["fee"]), metrics["total_transactions"])
+                self.assertAlmostEqual(float(tx["amount"].sum()), metrics["total_volume"], delta=1e-6)
+                self.assertTrue(np.all(tx["sender"] != tx["receiver"]))
+
+                blocks = dataset.columns(name, "block")
+                self.assertEqual(int(blocks["transaction_count"].sum()), len(tx["fee"]))
+                self.assertEqual(len(blocks["block_id"][0]), 64)
+
+                hourly = dataset.rollups(name)
+                self.assertEqual(int(hourly["transactions"].sum()), len(tx["fee"]))
+                self.assertEqual(int(hourly["blocks"].sum()), len(blocks["timestamp"]))
+                self.assertAlmostEqual(float(hourly["fees"].sum()), float(tx["fee"].sum()), delta=1e-6)
+                self.assertTrue(np.all(np.diff(hourly["hour_start"]) == 3600))
+                self.assertEqual(summary["blockchains"][name]["hourly"]["transactions"],
+                                 hourly["transactions"].tolist())
+
+            with self.assertRaises(ValueError):
+                dataset.columns("kaspa", "mempool")
+
+
+if __name__ == "__main__":
+    unittest.main()
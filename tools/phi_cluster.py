@@ -0,0 +1,258 @@
+"""
+tools/phi_cluster.py - Localhost Φ-Chain gossip cluster
+
+Launches one gossip node per validator config (config/validators/node_*.json)
+on its configured port, all on one event loop. Every node builds the same
+genesis block from config/genesis_mainnet.json. The first node mines
+blocks and gossips them; the others verify and append each block, then
+gossip a signed prepare vote for it. Blocks are relayed in full or as
+compact blocks (rebuilt from the mempool). Block propagation latency
+(publish to append on each node), vote quorum latency and bytes on the
+wire per block are reported:
+
+    python3 tools/phi_cluster.py [blocks] [full|compact] [port_offset]
+"""
+
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from phi_chain import Blockchain, PhiBlock, PhiTransaction
+from consensus.runtime import summarize
+from crypto.verifier import SignatureVerifier, vote_message
+from network.gossip import GossipNode, BLOCK, TX, VOTE, COMPACT_BLOCK, GET_BLOCK_TXN, BLOCK_TXN
+from network.compact import CompactBlockRelay
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_CONFIG_DIR = ROOT / "config" / "validators"
+GENESIS_FILE = ROOT / "config" / "genesis_mainnet.json"
+
+# The genesis allocation account (funds the cluster's transactions)
+GENESIS_ACCOUNT = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+
+def load_genesis_timestamp(path: Path = GENESIS_FILE) -> Optional[float]:
+    """Read the shared genesis timestamp, if the genesis file exists."""
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f).get("genesis_block", {}).get("timestamp")
+
+
+class ClusterNode:
+    """A validator's chain, keys and gossip node."""
+
+    def __init__(self, config: Dict[str, Any], genesis_timestamp: Optional[float],
+                 verifier: SignatureVerifier, port_offset: int = 0):
+        self.validator_id = config["validator_id"]
+        self.private_key = config["private_key"]
+        self.blockchain = Blockchain(genesis_timestamp=genesis_timestamp)
+        self.verifier = verifier
+        self.gossip = GossipNode(self.validator_id, port=config["port"] + port_offset,
+                                 peers=[p + port_offset for p in config.get("peers", [])])
+        self.gossip.subscribe(TX, self.on_transaction)
+        self.gossip.subscribe(BLOCK, self.on_block)
+        self.gossip.subscribe(VOTE, self.on_vote)
+        self.compact = CompactBlockRelay(self.gossip, lambda: self.blockchain.pending_transactions,
+                                         self.accept_block)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # block hash -> loop time the block was appended
+        self.block_times: Dict[str, float] = {}
+        # block hash -> voters
+        self.votes: Dict[str, set] = {}
+        self.quorum_times: Dict[str, float] = {}
+        self.quorum = 0
+
+    def sign(self, message: str) -> str:
+        return hashlib.sha256(f"{message}{self.private_key}".encode()).hexdigest()
+
+    # --- Gossip handlers ---
+
+    def on_transaction(self, data: Dict[str, Any], source: Optional[str]) -> bool:
+        return self.blockchain.add_transaction(PhiTransaction.from_dict(data))
+
+    def on_block(self, data: Dict[str, Any], source: Optional[str]) -> bool:
+        try:
+            block = PhiBlock.from_dict(data)
+        except (KeyError, ValueError):
+            return False
+        return self.accept_block(block, source)
+
+    def accept_block(self, block: PhiBlock, source: Optional[str]) -> bool:
+        if not self.verifier.verify(block.hash, block.proposer, block.bls_signature):
+            return False
+        if not self.blockchain.add_block(block):
+            return False
+        self.block_times[block.hash] = self.loop.time()
+        included = {tx.hash for tx in block.transactions}
+        self.blockchain.pending_transactions = [
+            tx for tx in self.blockchain.pending_transactions if tx.hash not in included]
+
+        message = vote_message(block.hash, "prepare")
+        vote = {"block_hash": block.hash, "vote_type": "prepare",
+                "validator_id": self.validator_id, "signature": self.sign(message)}
+        self.on_vote(vote, None)
+        self.gossip.publish(VOTE, vote)
+        return True
+
+    def on_vote(self, vote: Dict[str, Any], source: Optional[str]) -> bool:
+        message = vote_message(vote["block_hash"], vote["vote_type"])
+        if not self.verifier.verify(message, vote["validator_id"], vote["signature"]):
+            return False
+        voters = self.votes.setdefault(vote["block_hash"], set())
+        voters.add(vote["validator_id"])
+        if len(voters) == self.quorum and vote["block_hash"] not in self.quorum_times:
+            self.quorum_times[vote["block_hash"]] = self.loop.time()
+        return True
+
+    # --- Block production ---
+
+    def gossip_transactions(self, tx_count: int, height: int, unannounced: int = 0):
+        """
+        Add tx_count transfers to the mempool and gossip them.
+
+        The last `unannounced` transfers are kept local, so compact relay
+        has to fetch them.
+        """
+        for i in range(tx_count):
+            tx = PhiTransaction(GENESIS_ACCOUNT, f"0xcluster{height:04d}{i:04d}", 1 + i, nonce=height)
+            self.blockchain.add_transaction(tx)
+            if i < tx_count - unannounced:
+                self.gossip.publish(TX, tx.to_dict())
+
+    def produce_block(self, relay: str = "full") -> Optional[PhiBlock]:
+        """Mine the mempool into a signed block and gossip it."""
+        block = self.blockchain.mine_pending_transactions(self.validator_id, difficulty=2)
+        if block is None:
+            return None
+        block.bls_signature = bytes.fromhex(self.sign(block.hash))
+        self.block_times[block.hash] = self.loop.time()
+        if relay == "compact":
+            self.compact.announce(block)
+        else:
+            self.gossip.publish(BLOCK, block.to_dict())
+        return block
+
+
+def load_configs(config_dir: Path = DEFAULT_CONFIG_DIR) -> List[Dict[str, Any]]:
+    """Load every node_*.json validator config, ordered by port."""
+    configs = []
+    for path in glob.glob(os.path.join(str(config_dir), "node_*.json")):
+        with open(path) as f:
+            configs.append(json.load(f))
+    return sorted(configs, key=lambda c: c["port"])
+
+
+async def run_cluster(blocks: int = 20, tx_per_block: int = 5, interval: float = 0.05,
+                      relay: str = "full", unannounced: int = 0,
+                      config_dir: Path = DEFAULT_CONFIG_DIR, port_offset: int = 0) -> Dict[str, Any]:
+    """
+    Run a localhost cluster and measure propagation.
+
+    Args:
+        blocks: Blocks to produce
+        tx_per_block: Transactions gossiped into each block
+        interval: Seconds between blocks
+        relay: "full" (whole blocks) or "compact" (short transaction IDs)
+        unannounced: Transactions per block not gossiped before the block
+        config_dir: Directory of validator configs
+        port_offset: Added to every configured port (to avoid clashes)
+
+    Returns:
+        Propagation latencies (ms), chain heights and gossip counters
+    """
+    loop = asyncio.get_running_loop()
+    configs = load_configs(config_dir)
+    if len(configs) < 2:
+        raise ValueError(f"Need at least 2 validator configs in {config_dir}")
+    if relay not in ("full", "compact"):
+        raise ValueError(f"Unknown relay mode: {relay}")
+
+    verifier = SignatureVerifier(executor="inline")
+    for config in configs:
+        verifier.register_signer(config["validator_id"], config["private_key"])
+
+    genesis_timestamp = load_genesis_timestamp()
+    nodes = [ClusterNode(c, genesis_timestamp, verifier, port_offset) for c in configs]
+    quorum = (2 * len(nodes)) // 3 + 1
+    for node in nodes:
+        node.loop = loop
+        node.quorum = quorum
+        await node.gossip.start()
+
+    try:
+        connected = await asyncio.gather(*(node.gossip.wait_for_peers() for node in nodes))
+        if not all(connected):
+            raise RuntimeError("Cluster did not fully connect")
+
+        leader, followers = nodes[0], nodes[1:]
+        produced = []
+        for height in range(1, blocks + 1):
+            # Transactions reach mempools before the block (half an interval)
+            leader.gossip_transactions(tx_per_block, height, unannounced)
+            await asyncio.sleep(interval / 2)
+            block = leader.produce_block(relay)
+            if block is not None:
+                produced.append(block)
+            await asyncio.sleep(interval / 2)
+        # Give the last block time to land everywhere
+        deadline = loop.time() + 5.0
+        while loop.time() < deadline and not all(
+                produced and produced[-1].hash in node.quorum_times for node in nodes):
+            await asyncio.sleep(0.01)
+
+        propagation = []
+        quorum_latency = []
+        for block in produced:
+            published = leader.block_times[block.hash]
+            for node in followers:
+                if block.hash in node.block_times:
+                    propagation.append(node.block_times[block.hash] - published)
+            if block.hash in leader.quorum_times:
+                quorum_latency.append(leader.quorum_times[block.hash] - published)
+
+        totals: Dict[str, int] = {}
+        block_bytes = 0
+        for node in nodes:
+            for key, value in node.gossip.get_stats().items():
+                totals[key] = totals.get(key, 0) + value
+            for msg_type in (BLOCK, COMPACT_BLOCK, GET_BLOCK_TXN, BLOCK_TXN):
+                block_bytes += node.gossip.transport.type_bytes.get(msg_type, 0)
+            for key, value in node.compact.stats.items():
+                totals[f"compact_{key}"] = totals.get(f"compact_{key}", 0) + value
+
+        return {
+            "nodes": len(nodes),
+            "blocks": len(produced),
+            "heights": [node.blockchain.get_chain_length() for node in nodes],
+            "in_sync": len({node.blockchain.get_latest_block().hash for node in nodes}) == 1,
+            "propagation": summarize(propagation),
+            "quorum": summarize(quorum_latency),
+            "block_bytes_per_block": block_bytes // max(len(produced), 1),
+            "gossip": totals,
+        }
+    finally:
+        for node in nodes:
+            await node.gossip.close()
+
+
+if __name__ == "__main__":
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    relay = sys.argv[2] if len(sys.argv) > 2 else "full"
+    offset = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    stats = asyncio.run(run_cluster(blocks=blocks, relay=relay, port_offset=offset))
+
+    print(f"🌐 {stats['nodes']} nodes, {stats['blocks']} blocks, heights {stats['heights']}, in sync: {stats['in_sync']}")
+    print(f"   block bytes on the wire per block ({relay}): {stats['block_bytes_per_block']:,}")
+    for name in ("propagation", "quorum"):
+        m = stats[name]
+        print(f"   {name}: mean {m['mean_ms']:.2f} ms, p99 {m['p99_ms']:.2f} ms, max {m['max_ms']:.2f} ms")
+    print(f"   gossip: {stats['gossip']}")
@@ -4,12 +4,14 @@
 Advanced blockchain transaction analysis and comparison tool
 """
 
+import os
 import json
 import time
 import random
 import math
+import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -35,6 +37,22 @@ class Transaction:
     priority: str
 
 
+@dataclass
+class TransactionBatch:
+    """Column arrays for the transactions of one block"""
+    timestamp: np.ndarray      # Epoch seconds
+    amount: np.ndarray
+    fee: np.ndarray
+    size_bytes: np.ndarray
+    confirmations: np.ndarray
+    sender: np.ndarray         # Indices into TransactionGenerator.addresses
+    receiver: np.ndarray
+    priority: np.ndarray       # Indices into PRIORITIES
+    
+    def __len__(self) -> int:
+        return len(self.amount)
+
+
 @dataclass
 class Block:
     """Represents a blockchain block"""
@@ -48,6 +66,71 @@ class Block:
     reward: float
 
 
+PRIORITIES = ("low", "medium", "high")
+
+# Per-chain generation parameters: uniform ranges for amounts, fees and
+# difficulty, inclusive integer ranges for sizes and transaction counts
+CHAIN_PROFILES = {
+    BlockchainType.BITCOIN: {
+        "amount": (0.001, 10.0),  # BTC
+        "fee": (0.0001, 0.01),
+        "size_bytes": (250, 1000),
+        "tx_count": (1000, 3000),
+        "difficulty": (10000000000000, 50000000000000),
+        "reward": 6.25,
+    },
+    BlockchainType.KASPA: {
+        "amount": (1, 1000),  # KAS
+        "fee": (0.01, 1.0),
+        "size_bytes": (200, 800),
+        "tx_count": (8000, 15000),
+        "difficulty": (1000000, 10000000),
+        "reward": 50,
+    },
+    BlockchainType.PHI_CHAIN: {
+        "amount": (0.1, 100),  # PHI
+        "fee": (0.001, 0.1),
+        "size_bytes": (300, 1200),
+        "tx_count": (987, 987),  # F16 - fixed by design
+        "difficulty": (100000, 1000000),
+        "reward": 987 * 0.001,  # F16 * 0.001
+    },
+}
+
+
+# Columnar export layout: one .npy per column per chain, named
+# <table>_<column>.npy, plus the manifest
+MANIFEST_FILE = "manifest.json"
+TX_COLUMNS = {
+    "timestamp": "<f8",  # Epoch seconds
+    "amount": "<f8",
+    "fee": "<f8",
+    "size_bytes": "<i4",
+    "confirmations": "<i2",
+    "sender": "<i2",  # Indices into the manifest's addresses
+    "receiver": "<i2",
+    "priority": "|i1",  # Indices into PRIORITIES
+}
+BLOCK_COLUMNS = {
+    "timestamp": "<f8",
+    "transaction_count": "<i4",
+    "size_bytes": "<i8",
+    "difficulty": "<f8",
+    "reward": "<f8",
+    "miner": "|i1",  # Indices into the manifest's mining pools
+    "block_id": "|S64",
+}
+ROLLUP_COLUMNS = {
+    "hour_start": "<i8",  # Epoch seconds
+    "transactions": "<i8",
+    "volume": "<f8",
+    "fees": "<f8",
+    "size_bytes": "<i8",
+    "blocks": "<i8",
+}
+COLUMN_TABLES = {"tx": TX_COLUMNS, "block": BLOCK_COLUMNS, "hourly": ROLLUP_COLUMNS}
+
+
 class FibonacciUtils:
     """Utility class for Fibonacci calculations"""
     
@@ -118,18 +201,10 @@ class TransactionGenerator:
             timestamp = datetime.now()
         
         # Generate realistic transaction amounts based on blockchain type
-        if blockchain == BlockchainType.BITCOIN:
-            amount = random.uniform(0.001, 10.0)  # BTC
-            fee = random.uniform(0.0001, 0.01)
-            size_bytes = random.randint(250, 1000)
-        elif blockchain == BlockchainType.KASPA:
-            amount = random.uniform(1, 1000)  # KAS
-            fee = random.uniform(0.01, 1.0)
-            size_bytes = random.randint(200, 800)
-        else:  # PHI_CHAIN
-            amount = random.uniform(0.1, 100)  # PHI
-            fee = random.uniform(0.001, 0.1)
-            size_bytes = random.randint(300, 1200)
+        profile = CHAIN_PROFILES[blockchain]
+        amount = random.uniform(*profile["amount"])
+        fee = random.uniform(*profile["fee"])
+        size_bytes = random.randint(*profile["size_bytes"])
         
         # Generate transaction ID
         tx_id = "".join(random.choices("0123456789abcdef", k=64))
@@ -142,7 +217,7 @@ class TransactionGenerator:
         
         # Determine confirmations and priority
         confirmations = random.randint(0, 1000)
-        priority = random.choice(["low", "medium", "high"])
+        priority = random.choice(PRIORITIES)
         
         return Transaction(
             tx_id=tx_id,
@@ -166,18 +241,10 @@ class TransactionGenerator:
         block_id = "".join(random.choices("0123456789abcdef", k=64))
         
         # Generate transactions based on blockchain capacity
-        if blockchain == BlockchainType.BITCOIN:
-            tx_count = random.randint(1000, 3000)
-            difficulty = random.uniform(10000000000000, 50000000000000)
-            reward = 6.25
-        elif blockchain == BlockchainType.KASPA:
-            tx_count = random.randint(8000, 15000)
-            difficulty = random.uniform(1000000, 10000000)
-            reward = 50
-        else:  # PHI_CHAIN
-            tx_count = 987  # F16 - fixed by design
-            difficulty = random.uniform(100000, 1000000)
-            reward = FibonacciUtils.fibonacci(16) * 0.001  # F16 * 0.001
+        profile = CHAIN_PROFILES[blockchain]
+        tx_count = random.randint(*profile["tx_count"])
+        difficulty = random.uniform(*profile["difficulty"])
+        reward = profile["reward"]
         
         # Generate transactions
         transactions = []
@@ -202,18 +269,386 @@ class TransactionGenerator:
             reward=reward
         )
 
+    
+    def generate_batch(self, blockchain: BlockchainType, timestamp: float,
+                       rng: np.random.Generator) -> Tuple[Dict[str, Any], TransactionBatch]:
+        """
+        Generate a block as a record and column arrays, with the same
+        distributions as generate_block.
+        
+        Args:
+            blockchain: The chain to generate for
+            timestamp: The block time in epoch seconds
+            rng: The NumPy random generator to draw from
+            
+        Returns:
+            (block record with an epoch-second timestamp, its transactions)
+        """
+        profile = CHAIN_PROFILES[blockchain]
+        low, high = profile["tx_count"]
+        n = int(rng.integers(low, high + 1))
+        
+        # Senders and receivers are distinct address indices
+        address_count = len(self.addresses)
+        sender = rng.integers(0, address_count, n)
+        receiver = (sender + rng.integers(1, address_count, n)) % address_count
+        
+        batch = TransactionBatch(
+            timestamp=timestamp - rng.integers(0, 601, n),
+            amount=rng.uniform(*profile["amount"], n),
+            fee=rng.uniform(*profile["fee"], n),
+            size_bytes=rng.integers(profile["size_bytes"][0], profile["size_bytes"][1] + 1, n),
+            confirmations=rng.integers(0, 1001, n),
+            sender=sender,
+            receiver=receiver,
+            priority=rng.integers(0, len(PRIORITIES), n)
+        )
+        block = {
+            "block_id": rng.bytes(32).hex(),
+            "timestamp": timestamp,
+            "transaction_count": n,
+            "size_bytes": int(batch.size_bytes.sum()) + int(rng.integers(1000, 5001)),
+            "miner": self.mining_pools[rng.integers(len(self.mining_pools))],
+            "difficulty": float(rng.uniform(*profile["difficulty"])),
+            "reward": profile["reward"],
+            "blockchain": blockchain.value
+        }
+        return block, batch
+    
+    def iter_blocks(self, blockchain: BlockchainType, start: float, end: float,
+                    rng: np.random.Generator) -> Iterator[Tuple[Dict[str, Any], TransactionBatch]]:
+        """
+        Stream generated blocks from `start` up to `end` (epoch seconds),
+        5 to 15 minutes apart. Only one block is held at a time.
+        """
+        current = start
+        while current < end:
+            yield self.generate_batch(blockchain, current, rng)
+            current += 60 * int(rng.integers(5, 16))
+
+
+class ChainMetrics:
+    """
+    Online accumulator for one chain's metrics.
+    
+    Blocks are added one at a time and only running totals are kept, so
+    memory does not depend on how many blocks or transactions are seen.
+    """
+    
+    def __init__(self):
+        self.transactions = 0
+        self.total_volume = 0.0
+        self.total_fees = 0.0
+        self.total_size = 0
+        self.first_tx_time = math.inf
+        self.last_tx_time = -math.inf
+        self.blocks = 0
+        self.total_block_size = 0
+        self.first_block_time = None
+        self.last_block_time = None
+    
+    def add_block(self, block: Dict[str, Any], batch: TransactionBatch) -> None:
+        """Account for one block (epoch-second timestamp) and its transactions."""
+        self.blocks += 1
+        self.total_block_size += block["size_bytes"]
+        if self.first_block_time is None:
+            self.first_block_time = block["timestamp"]
+        self.last_block_time = block["timestamp"]
+        
+        if len(batch):
+            self.transactions += len(batch)
+            self.total_volume += float(batch.amount.sum())
+            self.total_fees += float(batch.fee.sum())
+            self.total_size += int(batch.size_bytes.sum())
+            self.first_tx_time = min(self.first_tx_time, float(batch.timestamp.min()))
+            self.last_tx_time = max(self.last_tx_time, float(batch.timestamp.max()))
+    
+    def result(self) -> Dict[str, Any]:
+        """The metrics dictionary (empty if no transactions were seen)."""
+        if not self.transactions:
+            return {}
+        
+        n = self.transactions
+        time_range = self.last_tx_time - self.first_tx_time
+        block_times = self.blocks - 1
+        return {
+            "total_transactions": n,
+            "total_volume": self.total_volume,
+            "total_fees": self.total_fees,
+            "average_amount": self.total_volume / n,
+            "average_fee": self.total_fees / n,
+            "average_size": self.total_size / n,
+            "transactions_per_second": n / time_range if time_range > 0 else 0,
+            "average_block_size": self.total_block_size / self.blocks,
+            "average_block_time": ((self.last_block_time - self.first_block_time) / block_times
+                                   if block_times else 0),
+            "efficiency": _efficiency(self.total_fees, self.total_volume)
+        }
+
+
+class HourlyRollup:
+    """
+    Online per-hour totals for one chain's transactions and blocks.
+    
+    Buckets cover the period (plus the 10 minutes transactions may
+    predate the first block), so memory grows with hours, not rows.
+    """
+    
+    def __init__(self, start: float, end: float):
+        self.first_hour = int((start - 600) // 3600)
+        buckets = int(end // 3600) - self.first_hour + 1
+        self.transactions = np.zeros(buckets, dtype=np.int64)
+        self.volume = np.zeros(buckets)
+        self.fees = np.zeros(buckets)
+        self.size_bytes = np.zeros(buckets, dtype=np.int64)
+        self.blocks = np.zeros(buckets, dtype=np.int64)
+    
+    def add_block(self, block: Dict[str, Any], batch: TransactionBatch) -> None:
+        """Account for one block (epoch-second timestamp) and its transactions."""
+        buckets = len(self.blocks)
+        self.blocks[int(block["timestamp"] // 3600) - self.first_hour] += 1
+        hours = (batch.timestamp // 3600).astype(np.int64) - self.first_hour
+        self.transactions += np.bincount(hours, minlength=buckets)
+        self.volume += np.bincount(hours, weights=batch.amount, minlength=buckets)
+        self.fees += np.bincount(hours, weights=batch.fee, minlength=buckets)
+        self.size_bytes += np.bincount(hours, weights=batch.size_bytes, minlength=buckets).astype(np.int64)
+    
+    def columns(self) -> Dict[str, np.ndarray]:
+        """The rollup as columns, keyed like ROLLUP_COLUMNS."""
+        hour_start = (self.first_hour + np.arange(len(self.blocks), dtype=np.int64)) * 3600
+        return {
+            "hour_start": hour_start,
+            "transactions": self.transactions,
+            "volume": self.volume,
+            "fees": self.fees,
+            "size_bytes": self.size_bytes,
+            "blocks": self.blocks
+        }
+
+
+class _ColumnWriter:
+    """Appends to a 1-D .npy file whose length is only known on close()"""
+    
+    def __init__(self, path: str, dtype: str):
+        self.dtype = np.dtype(dtype)
+        self.rows = 0
+        self._file = open(path, "wb")
+        self._write_header()
+        self._header_size = self._file.tell()
+    
+    def _write_header(self) -> None:
+        np.lib.format.write_array_header_1_0(self._file, {
+            "descr": np.lib.format.dtype_to_descr(self.dtype),
+            "fortran_order": False,
+            "shape": (self.rows,)
+        })
+    
+    def append(self, values) -> None:
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self._file.write(values.tobytes())
+        self.rows += len(values)
+    
+    def close(self) -> None:
+        # The v1.0 header is padded to 64 bytes, so the final shape fits
+        # in the space written for an empty column
+        self._file.seek(0)
+        self._write_header()
+        if self._file.tell() != self._header_size:
+            raise ValueError("column header size changed")
+        self._file.close()
+
+
+class ColumnarDataset:
+    """
+    Reader for a dataset written by TransactionAnalyzer.export_columns.
+    
+    Columns open as read-only memory maps, so only the pages a query
+    touches are read; hourly rollups let reports skip the rows entirely.
+    """
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+    
+    @property
+    def chains(self) -> List[str]:
+        return list(self.manifest["chains"])
+    
+    def columns(self, chain: str, table: str = "tx",
+                names: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Memory-map a chain's columns.
+        
+        Args:
+            chain: The chain name (a BlockchainType value)
+            table: "tx", "block" or "hourly"
+            names: Columns to open (default: all of the table's columns)
+        """
+        if table not in COLUMN_TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        names = names or list(COLUMN_TABLES[table])
+        return {
+            name: np.load(os.path.join(self.directory, chain, f"{table}_{name}.npy"), mmap_mode="r")
+            for name in names
+        }
+    
+    def rollups(self, chain: str) -> Dict[str, np.ndarray]:
+        """The chain's hourly rollup columns."""
+        return self.columns(chain, "hourly")
+    
+    def metrics(self, chain: str) -> Dict[str, Any]:
+        """The chain's metrics as computed during the export."""
+        return self.manifest["chains"][chain]["metrics"]
+
+
+def _isoformat(timestamp: float) -> str:
+    """Local ISO time for an epoch-second timestamp (as datetime.now() gives)"""
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+def _efficiency(total_fees: float, total_amount: float) -> float:
+    """Efficiency = 1 - (fee percentage), normalized to 0-100"""
+    if total_amount == 0:
+        return 0.0
+    fee_percentage = (total_fees / total_amount) * 100
+    return max(0, min(100, 100 - fee_percentage * 10))
+
 
 class TransactionAnalyzer:
     """Analyzes blockchain transaction data"""
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.generator = TransactionGenerator()
+        self.rng = np.random.default_rng(seed)
         self.data = {}
     
+    def stream_dataset(self, hours: int = 24,
+                       end_time: Optional[float] = None) -> Iterator[Tuple[BlockchainType, Dict[str, Any], TransactionBatch]]:
+        """
+        Stream (blockchain, block, transactions) for every chain over the period.
+        
+        Blocks carry epoch-second timestamps and transactions come as
+        column arrays, one block at a time.
+        """
+        end = time.time() if end_time is None else end_time
+        start = end - hours * 3600
+        for blockchain in BlockchainType:
+            for block, batch in self.generator.iter_blocks(blockchain, start, end, self.rng):
+                yield blockchain, block, batch
+    
+    def summarize(self, hours: int = 24) -> Dict[str, Any]:
+        """
+        Compute every chain's metrics over the period in constant memory.
+        
+        Returns:
+            The dataset layout of generate_dataset, with block counts and
+            metrics but without the blocks and transactions themselves
+        """
+        end_time = datetime.now()
+        accumulators = {blockchain: ChainMetrics() for blockchain in BlockchainType}
+        for blockchain, block, batch in self.stream_dataset(hours, end_time.timestamp()):
+            accumulators[blockchain].add_block(block, batch)
+        
+        return {
+            "timestamp": end_time.isoformat(),
+            "period_hours": hours,
+            "blockchains": {
+                blockchain.value: {"block_count": metrics.blocks, "metrics": metrics.result()}
+                for blockchain, metrics in accumulators.items()
+            }
+        }
+    
+    def export_columns(self, directory: str, hours: int = 24) -> Dict[str, Any]:
+        """
+        Stream the dataset into a columnar export.
+        
+        Each chain gets one .npy file per transaction and block column
+        (see TX_COLUMNS and BLOCK_COLUMNS) and its hourly rollups, written
+        block by block in constant memory. The manifest records row
+        counts, dtypes, metrics and the lookup tables for index columns;
+        read it back with ColumnarDataset.
+        
+        Returns:
+            The summarize() layout for the exported data, with each chain's
+            hourly rollups inlined so reports can render from the buckets
+        """
+        end_time = datetime.now()
+        end = end_time.timestamp()
+        start = end - hours * 3600
+        os.makedirs(directory, exist_ok=True)
+        
+        accumulators = {blockchain: ChainMetrics() for blockchain in BlockchainType}
+        rollups = {blockchain: HourlyRollup(start, end) for blockchain in BlockchainType}
+        writers = {}
+        for blockchain in BlockchainType:
+            chain_dir = os.path.join(directory, blockchain.value)
+            os.makedirs(chain_dir, exist_ok=True)
+            writers[blockchain] = {
+                (table, name): _ColumnWriter(os.path.join(chain_dir, f"{table}_{name}.npy"), dtype)
+                for table, columns in (("tx", TX_COLUMNS), ("block", BLOCK_COLUMNS))
+                for name, dtype in columns.items()
+            }
+        
+        miners = {miner: i for i, miner in enumerate(self.generator.mining_pools)}
+        try:
+            for blockchain, block, batch in self.stream_dataset(hours, end):
+                chain_writers = writers[blockchain]
+                for name in TX_COLUMNS:
+                    chain_writers["tx", name].append(getattr(batch, name))
+                for name in BLOCK_COLUMNS:
+                    value = miners[block["miner"]] if name == "miner" else block[name]
+                    chain_writers["block", name].append([value])
+                accumulators[blockchain].add_block(block, batch)
+                rollups[blockchain].add_block(block, batch)
+        finally:
+            for chain_writers in writers.values():
+                for writer in chain_writers.values():
+                    writer.close()
+        
+        summary = {"timestamp": end_time.isoformat(), "period_hours": hours, "blockchains": {}}
+        manifest = {
+            "format": "phi-columns/1",
+            "generated_at": end_time.isoformat(),
+            "period_hours": hours,
+            "start": start,
+            "end": end,
+            "priorities": list(PRIORITIES),
+            "mining_pools": self.generator.mining_pools,
+            "addresses": self.generator.addresses,
+            "tables": {table: columns for table, columns in COLUMN_TABLES.items()},
+            "chains": {}
+        }
+        for blockchain in BlockchainType:
+            chain_dir = os.path.join(directory, blockchain.value)
+            hourly = rollups[blockchain].columns()
+            for name, column in hourly.items():
+                np.save(os.path.join(chain_dir, f"hourly_{name}.npy"), column.astype(ROLLUP_COLUMNS[name]))
+            metrics = accumulators[blockchain]
+            summary["blockchains"][blockchain.value] = {
+                "block_count": metrics.blocks,
+                "metrics": metrics.result(),
+                "hourly": {name: column.tolist() for name, column in hourly.items()}
+            }
+            manifest["chains"][blockchain.value] = {
+                "transactions": metrics.transactions,
+                "blocks": metrics.blocks,
+                "hours": len(rollups[blockchain].blocks),
+                "metrics": metrics.result()
+            }
+        with open(os.path.join(directory, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        return summary
+    
     def generate_dataset(self, hours: int = 24) -> Dict[str, Any]:
-        """Generate comprehensive dataset for analysis"""
+        """
+        Generate comprehensive dataset for analysis
+        
+        Every block and transaction is materialized as a dict, so memory
+        grows with `hours`; summarize() computes the same metrics without
+        holding them.
+        """
         end_time = datetime.now()
-        start_time = end_time - timedelta(hours=hours)
         
         dataset = {
             "timestamp": end_time.isoformat(),
@@ -222,23 +657,22 @@ class TransactionAnalyzer:
         }
         
         for blockchain in BlockchainType:
-            blockchain_data = {
+            dataset["blockchains"][blockchain.value] = {
                 "blocks": [],
                 "transactions": [],
                 "metrics": {}
             }
-            
-            # Generate blocks for the time period
-            current_time = start_time
-            while current_time < end_time:
-                block = self.generator.generate_block(blockchain, current_time)
-                blockchain_data["blocks"].append(self._block_to_dict(block))
-                blockchain_data["transactions"].extend([self._transaction_to_dict(tx) for tx in block.transactions])
-                current_time += timedelta(minutes=random.randint(5, 15))
-            
-            # Calculate metrics
-            blockchain_data["metrics"] = self._calculate_metrics(blockchain_data["transactions"], blockchain_data["blocks"])
-            dataset["blockchains"][blockchain.value] = blockchain_data
+        
+        accumulators = {blockchain: ChainMetrics() for blockchain in BlockchainType}
+        for blockchain, block, batch in self.stream_dataset(hours, end_time.timestamp()):
+            blockchain_data = dataset["blockchains"][blockchain.value]
+            blockchain_data["blocks"].append(dict(block, timestamp=_isoformat(block["timestamp"])))
+            blockchain_data["transactions"].extend(self._batch_to_dicts(blockchain, batch))
+            accumulators[blockchain].add_block(block, batch)
+        
+        # Calculate metrics
+        for blockchain, metrics in accumulators.items():
+            dataset["blockchains"][blockchain.value]["metrics"] = metrics.result()
         
         return dataset
     
@@ -270,74 +704,35 @@ class TransactionAnalyzer:
             "priority": tx.priority
         }
     
-    def _calculate_metrics(self, transactions: List[Dict], blocks: List[Dict]) -> Dict[str, Any]:
-        """Calculate blockchain metrics"""
-        if not transactions:
-            return {}
-        
-        amounts = [tx["amount"] for tx in transactions]
-        fees = [tx["fee"] for tx in transactions]
-        sizes = [tx["size_bytes"] for tx in transactions]
-        
-        # Transaction metrics
-        total_volume = sum(amounts)
-        total_fees = sum(fees)
-        avg_amount = sum(amounts) / len(amounts)
-        avg_fee = sum(fees) / len(fees)
-        avg_size = sum(sizes) / len(sizes)
-        
-        # Time-based metrics
-        timestamps = [datetime.fromisoformat(tx["timestamp"]) for tx in transactions]
-        time_range = max(timestamps) - min(timestamps)
-        
-        if time_range.total_seconds() > 0:
-            tps = len(transactions) / time_range.total_seconds()
-        else:
-            tps = 0
-        
-        # Block metrics
-        if blocks:
-            block_sizes = [block["size_bytes"] for block in blocks]
-            avg_block_size = sum(block_sizes) / len(block_sizes)
-            block_times = []
-            
-            for i in range(1, len(blocks)):
-                time_diff = datetime.fromisoformat(blocks[i]["timestamp"]) - datetime.fromisoformat(blocks[i-1]["timestamp"])
-                block_times.append(time_diff.total_seconds())
-            
-            avg_block_time = sum(block_times) / len(block_times) if block_times else 0
-        else:
-            avg_block_size = 0
-            avg_block_time = 0
-        
-        return {
-            "total_transactions": len(transactions),
-            "total_volume": total_volume,
-            "total_fees": total_fees,
-            "average_amount": avg_amount,
-            "average_fee": avg_fee,
-            "average_size": avg_size,
-            "transactions_per_second": tps,
-            "average_block_size": avg_block_size,
-            "average_block_time": avg_block_time,
-            "efficiency": self._calculate_efficiency(fees, amounts)
-        }
+    def _batch_to_dicts(self, blockchain: BlockchainType, batch: TransactionBatch) -> List[Dict[str, Any]]:
+        """Convert a TransactionBatch to transaction dictionaries"""
+        addresses = self.generator.addresses
+        tx_ids = self.rng.bytes(32 * len(batch)).hex()
+        return [
+            {
+                "tx_id": tx_ids[64 * i:64 * (i + 1)],
+                "timestamp": _isoformat(timestamp),
+                "amount": amount,
+                "fee": fee,
+                "confirmations": confirmations,
+                "blockchain": blockchain.value,
+                "sender": addresses[sender],
+                "receiver": addresses[receiver],
+                "size_bytes": size_bytes,
+                "priority": PRIORITIES[priority]
+            }
+            for i, (timestamp, amount, fee, confirmations, sender, receiver, size_bytes, priority)
+            in enumerate(zip(batch.timestamp.tolist(), batch.amount.tolist(), batch.fee.tolist(),
+                             batch.confirmations.tolist(), batch.sender.tolist(), batch.receiver.tolist(),
+                             batch.size_bytes.tolist(), batch.priority.tolist()))
+        ]
     
     def _calculate_efficiency(self, fees: List[float], amounts: List[float]) -> float:
         """Calculate transaction efficiency (lower fees = higher efficiency)"""
         if not fees or not amounts:
             return 0.0
         
-        total_fees = sum(fees)
-        total_amount = sum(amounts)
-        
-        if total_amount == 0:
-            return 0.0
-        
-        # Efficiency = 1 - (fee percentage), normalized to 0-100
-        fee_percentage = (total_fees / total_amount) * 100
-        efficiency = max(0, min(100, 100 - fee_percentage * 10))
-        return efficiency
+        return _efficiency(sum(fees), sum(amounts))
     
     def compare_blockchains(self, dataset: Dict[str, Any]) -> Dict[str, Any]:
         """Compare blockchain performance"""
@@ -370,9 +765,18 @@ class TransactionAnalyzer:
         
         return comparison
     
-    def generate_report(self, hours: int = 24) -> Dict[str, Any]:
-        """Generate comprehensive analysis report"""
-        dataset = self.generate_dataset(hours)
+    def generate_report(self, hours: int = 24, export_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate comprehensive analysis report
+        
+        With `export_dir`, the underlying rows are also written there as a
+        columnar export (see export_columns) and the report points to it.
+        """
+        if export_dir is None:
+            dataset = self.summarize(hours)
+        else:
+            dataset = self.export_columns(export_dir, hours)
+            dataset["columns"] = export_dir
         comparison = self.compare_blockchains(dataset)
         
         report = {
@@ -436,8 +840,10 @@ def main():
     print("🔄 Φ-Chain Transaction Analyzer")
     print("=" * 50)
     
-    # Generate and display report
-    report = analyzer.generate_report(1)  # 1 hour of data
+    # Generate and display report; the rows go to a columnar export next
+    # to the report rather than into the JSON
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    report = analyzer.generate_report(1, export_dir=f"transaction_columns_{stamp}")  # 1 hour of data
     
     print(f"\n📊 Analysis Report Generated")
     print(f"Period: {report['analysis_period_hours']} hours")
@@ -465,11 +871,12 @@ def main():
         print(f"  • {recommendation}")
     
     # Save report to file
-    filename = f"transaction_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    filename = f"transaction_analysis_{stamp}.json"
     with open(filename, 'w') as f:
         json.dump(report, f, indent=2)
     
     print(f"\n💾 Report saved to: {filename}")
+    print(f"🗂️  Columns saved to: {report['dataset']['columns']}")
     print("✅ Analysis complete!")
 
 
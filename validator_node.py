@@ -11,7 +11,9 @@ This module implements a complete validator node with:
 
 import json
 import time
+import asyncio
 import hashlib
+import hmac
 import uuid
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
@@ -26,6 +28,16 @@ from phi_chain import (
     FBAConsensus,
     FibonacciUtils
 )
+from consensus.runtime import NodeRuntime
+from consensus.sampling import CommitteeSelector
+from consensus.vote_pool import VotePool, PREPARE, COMMIT
+from crypto.verifier import SignatureVerifier, vote_message
+from core.events import get_channel
+from storage.snapshot import SnapshotStore
+from storage.block_store import BlockStore
+from storage.pruning import TetrahedralRetention
+
+events = get_channel("validator_node")
 
 # --- Validator Key Management ---
 
@@ -50,7 +62,7 @@ class ValidatorKeyManager:
     def verify_signature(self, message: str, signature: str) -> bool:
         """Verify a message signature"""
         expected_signature = self.sign_message(message)
-        return signature == expected_signature
+        return hmac.compare_digest(signature, expected_signature)
     
     def to_dict(self) -> Dict[str, str]:
         """Export key information"""
@@ -79,7 +91,9 @@ class ValidatorMetrics:
 class ValidatorNode:
     """Φ-Chain Validator Node"""
     
-    def __init__(self, validator_id: str, stake: int, blockchain: Optional[Blockchain] = None):
+    def __init__(self, validator_id: str, stake: int, blockchain: Optional[Blockchain] = None,
+                 vote_pool: Optional[VotePool] = None,
+                 verifier: Optional[SignatureVerifier] = None):
         """
         Initialize a validator node.
         
@@ -87,6 +101,8 @@ class ValidatorNode:
             validator_id: Unique validator identifier
             stake: Amount of Φ tokens staked (must be Fibonacci number)
             blockchain: Reference to the blockchain (optional)
+            vote_pool: Vote pool shared with other nodes (optional)
+            verifier: Signature verifier shared with other nodes (optional)
         """
         self.validator_id = validator_id
         self.stake = stake
@@ -95,10 +111,14 @@ class ValidatorNode:
         
         # Key management
         self.key_manager = ValidatorKeyManager(validator_id)
+        if verifier is None:
+            verifier = SignatureVerifier(executor="inline")
+        self.verifier = verifier
+        self.verifier.register_signer(validator_id, self.key_manager.private_key)
         
         # Consensus
         self.poc = ProofOfCoherence(self.blockchain)
-        self.fba = FBAConsensus(self.blockchain)
+        self.fba = FBAConsensus(self.blockchain, vote_pool)
         
         # Metrics
         self.metrics = ValidatorMetrics()
@@ -159,6 +179,7 @@ class ValidatorNode:
             # Sign block
             block_hash = block.hash
             signature = self.key_manager.sign_message(block_hash)
+            block.bls_signature = bytes.fromhex(signature)
             
             return {
                 "block_hash": block_hash,
@@ -188,31 +209,44 @@ class ValidatorNode:
         if not all(field in block_data for field in required_fields):
             return False
         
+        # Verify the proposer's signature over the block hash
+        if not self.verifier.verify(block_data["block_hash"], block_data["proposer"],
+                                    block_data["signature"]):
+            return False
+        
         # Update metrics
         self.metrics.blocks_validated += 1
         
         return True
     
-    def cast_vote(self, block_hash: str, vote_type: str = "prepare") -> bool:
+    def sign_vote(self, block_hash: str, vote_type: str = "prepare") -> str:
+        """Sign a vote on a block."""
+        return self.key_manager.sign_message(vote_message(block_hash, vote_type))
+    
+    def cast_vote(self, block_hash: str, vote_type: str = "prepare",
+                  height: Optional[int] = None, signature: Optional[str] = None) -> bool:
         """
         Cast a vote on a block during consensus.
         
         Args:
             block_hash: The block being voted on
             vote_type: "prepare" or "commit"
+            height: The block height (defaults to the chain head)
+            signature: An already verified vote signature (signed here if omitted)
             
         Returns:
-            True if vote was cast successfully
+            True if vote was cast successfully (False for a repeated vote)
         """
         if not self.is_active or not self.is_synced:
             return False
         
         # Sign the vote
-        vote_message = f"{block_hash}:{vote_type}"
-        signature = self.key_manager.sign_message(vote_message)
+        if signature is None:
+            signature = self.sign_vote(block_hash, vote_type)
         
         # Process vote through FBA
-        self.fba.process_vote(self.validator_id, block_hash, vote_type)
+        if not self.fba.process_vote(self.validator_id, block_hash, vote_type, height):
+            return False
         
         # Update metrics
         self.metrics.votes_cast += 1
@@ -261,6 +295,17 @@ class ValidatorNetwork:
         self.blockchain = blockchain or Blockchain()
         self.validators: Dict[str, ValidatorNode] = {}
         self.params = GenesisParameters()
+        
+        # One block per slot, so an epoch spans EPOCH_DURATION / SLOT_DURATION blocks
+        self.committees = CommitteeSelector(
+            self.params.TARGET_COMMITTEE_SIZE,
+            self.params.EPOCH_DURATION // self.params.SLOT_DURATION
+        )
+        
+        # Votes from every node are aggregated in one shared pool, and
+        # signatures are checked in batches by one shared verifier
+        self.vote_pool = VotePool(lambda height: self.get_finality_threshold(len(self._committee_ids())))
+        self.verifier = SignatureVerifier()
     
     def add_validator(self, validator_id: str, stake: int) -> Optional[ValidatorNode]:
         """
@@ -274,8 +319,10 @@ class ValidatorNetwork:
             The created ValidatorNode, or None if failed
         """
         try:
-            validator = ValidatorNode(validator_id, stake, self.blockchain)
+            validator = ValidatorNode(validator_id, stake, self.blockchain,
+                                      self.vote_pool, self.verifier)
             self.validators[validator_id] = validator
+            self.committees.invalidate()
             return validator
         except ValueError as e:
             print(f"Failed to add validator {validator_id}: {e}")
@@ -320,8 +367,35 @@ class ValidatorNetwork:
             "pending_transactions": len(self.blockchain.pending_transactions)
         }
     
+    def get_committee(self) -> List[ValidatorNode]:
+        """
+        Get the consensus committee for the next block.
+        
+        The committee is a stake-weighted sample of TARGET_COMMITTEE_SIZE
+        validators, seeded by the hash of the last block of the previous
+        epoch and cached for the whole epoch.
+        
+        Returns:
+            The committee's validator nodes
+        """
+        return [self.validators[vid] for vid in self._committee_ids()]
+    
+    def _committee_ids(self) -> List[str]:
+        height = self.blockchain.get_chain_length()
+        epoch = self.committees.epoch_of(height)
+        seed = self.blockchain.get_block(self.committees.boundary_height(epoch)).hash
+        members = self.committees.cached(epoch, seed)
+        if members is None:
+            stakes = {vid: v.stake for vid, v in self.validators.items()}
+            members = self.committees.get_committee(epoch, seed, stakes)
+        return members
+    
+    def get_finality_threshold(self, committee_size: int) -> int:
+        """Votes needed to finalize: 2/3 + 1 of the committee, capped at F_15."""
+        return min(self.params.FINALITY_THRESHOLD, (2 * committee_size) // 3 + 1)
+    
     def simulate_consensus_round(self) -> Dict[str, Any]:
-        """Simulate a consensus round"""
+        """Simulate a consensus round with the current epoch's committee"""
         results = {
             "blocks_proposed": 0,
             "blocks_validated": 0,
@@ -329,28 +403,37 @@ class ValidatorNetwork:
             "consensus_reached": False
         }
         
-        # Propose blocks
-        for validator in self.validators.values():
-            if validator.is_active:
-                block = validator.propose_block()
-                if block:
-                    results["blocks_proposed"] += 1
+        # Only the selected proposer can produce a block
+        block = None
+        proposer = self.validators.get(self.blockchain.get_coherence_leader() or "")
+        if proposer is not None and proposer.is_active:
+            block = proposer.propose_block()
+            if block:
+                results["blocks_proposed"] += 1
         
-        # Validate blocks
-        for validator in self.validators.values():
-            if validator.is_active:
-                # Simulate block validation
+        committee = [v for v in self.get_committee() if v.is_active]
+        head = self.blockchain.get_latest_block()
+        
+        # Validate blocks (the proposer signature is verified once, then cached)
+        for validator in committee:
+            if block is None or validator.validate_block(block):
                 results["blocks_validated"] += 1
         
-        # Cast votes
-        for validator in self.validators.values():
-            if validator.is_active:
-                if validator.cast_vote("block_hash"):
+        # Cast votes: commit only once the prepare phase has a quorum.
+        # All signatures of a phase are verified as one batch.
+        for phase in (PREPARE, COMMIT):
+            message = vote_message(head.hash, phase)
+            signatures = [validator.sign_vote(head.hash, phase) for validator in committee]
+            for validator, signature in zip(committee, signatures):
+                self.verifier.submit(message, validator.validator_id, signature)
+            for validator, signature, valid in zip(committee, signatures, self.verifier.verify_pending()):
+                if valid and validator.cast_vote(head.hash, phase, head.index, signature):
                     results["votes_cast"] += 1
+            if not self.vote_pool.has_quorum(head.index, head.hash, phase):
+                break
         
         # Check consensus
-        if results["votes_cast"] >= self.params.FINALITY_THRESHOLD:
-            results["consensus_reached"] = True
+        results["consensus_reached"] = self.vote_pool.has_quorum(head.index, head.hash, COMMIT)
         
         return results
     
@@ -391,8 +474,16 @@ class ValidatorNodeRunner:
         """
         self.config_file = config_file
         self.config = self._load_config()
+        snapshot_dir = self.config.get("snapshot_dir")
+        self.snapshots = SnapshotStore(snapshot_dir) if snapshot_dir else None
+        block_dir = self.config.get("block_dir")
+        if block_dir and self.snapshots is None:
+            # Pruned bodies can only be skipped by restoring a snapshot
+            raise ValueError("Invalid configuration: block_dir requires snapshot_dir")
+        self.blocks = BlockStore(block_dir, TetrahedralRetention()) if block_dir else None
         self.node = self._initialize_node()
         self.running = False
+        self.runtime: Optional[NodeRuntime] = None
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file"""
@@ -410,7 +501,42 @@ class ValidatorNodeRunner:
         if not validator_id or not stake:
             raise ValueError("Invalid configuration: missing validator_id or stake")
         
-        return ValidatorNode(validator_id, stake)
+        # Start from the latest snapshot, if any; only the blocks after it are needed
+        blockchain = None
+        if self.snapshots is not None and self.snapshots.latest() is not None:
+            blockchain = self.snapshots.restore()
+            events.info("Restored snapshot at height %d", blockchain.get_chain_length() - 1)
+        if self.blocks is not None:
+            if blockchain is None:
+                blockchain = self._stored_genesis_chain()
+            if self.blocks.tip is not None:
+                events.info("Replayed %d stored blocks", self.blocks.replay_into(blockchain))
+                if self.blocks.tip != blockchain.get_chain_length() - 1:
+                    # Every later append would be rejected: start the store over
+                    events.warning("Block store tip %d does not match chain tip %d; resetting it",
+                                   self.blocks.tip, blockchain.get_chain_length() - 1)
+                    self.blocks.reset()
+            if self.blocks.tip is None:
+                for block in blockchain.chain:
+                    self.blocks.append(block)
+            self._pin_blocks()
+        return ValidatorNode(validator_id, stake, blockchain)
+    
+    def _stored_genesis_chain(self) -> Blockchain:
+        """A new chain with the block store's genesis block, if it has one."""
+        header = self.blocks.get_header(0)
+        if header is not None:
+            blockchain = Blockchain(genesis_timestamp=header["timestamp"])
+            if blockchain.chain[0].hash == header["hash"]:
+                return blockchain
+        return Blockchain()
+    
+    def _pin_blocks(self):
+        """Keep every body after the latest snapshot, so a restart can replay them."""
+        if self.blocks is not None:
+            latest = self.snapshots.latest()
+            # Before the first snapshot the whole chain is replayed from genesis
+            self.blocks.pinned_from = 0 if latest is None else latest + 1
     
     def start(self):
         """Start the validator node"""
@@ -422,6 +548,8 @@ class ValidatorNodeRunner:
     def stop(self):
         """Stop the validator node"""
         print(f"Stopping validator node: {self.node.validator_id}")
+        if self.runtime is not None:
+            self.runtime.stop()
         self.node.deactivate()
         self.running = False
         print(f"✅ Validator node stopped")
@@ -438,24 +566,79 @@ class ValidatorNodeRunner:
             duration: Duration in seconds to run
         """
         self.start()
-        start_time = time.time()
-        
         try:
-            while time.time() - start_time < duration:
-                # Propose blocks
-                block = self.node.propose_block()
-                if block:
-                    print(f"📦 Block proposed: {block['block_hash'][:16]}...")
-                
-                # Cast votes
-                self.node.cast_vote("block_hash")
-                
-                # Sleep
-                time.sleep(self.node.params.SLOT_DURATION)
+            asyncio.run(self.run_async(duration))
         except KeyboardInterrupt:
-            print("\n⏹️ Interrupted by user")
+            events.warning("Interrupted by user")
         finally:
             self.stop()
+    
+    def build_runtime(self, slot_duration: Optional[float] = None) -> NodeRuntime:
+        """
+        Build the asyncio runtime for this node.
+        
+        Proposals are voted on by the vote task; if the configuration has a
+        "data_file", each proposed block is appended to it as a JSON line
+        by the persistence task. With a "snapshot_dir", the state at each
+        epoch boundary is captured on the loop and written by that task;
+        with a "block_dir", blocks are also appended to a pruned BlockStore.
+        
+        Args:
+            slot_duration: Seconds per slot (default SLOT_DURATION)
+        """
+        blockchain = self.node.blockchain
+        
+        def propose(slot: int) -> Optional[Dict[str, Any]]:
+            block = self.node.propose_block()
+            if block:
+                events.info("Block proposed: %s at index %d", block['block_hash'], block['block_index'])
+                # Serialize on the loop thread; only the write happens in a worker
+                block["block"] = blockchain.get_block(block["block_index"])
+                block["record"] = json.dumps(block["block"].to_dict())
+                if self.snapshots is not None and self.snapshots.is_boundary(block["block_index"]):
+                    block["snapshot"] = self.snapshots.capture(blockchain)
+            return block
+        
+        def vote(block: Dict[str, Any]) -> bool:
+            return self.node.cast_vote(block["block_hash"], height=block["block_index"])
+        
+        persist = None
+        data_file = self.config.get("data_file")
+        if data_file or self.snapshots is not None or self.blocks is not None:
+            def persist(blocks: List[Dict[str, Any]]):
+                if data_file:
+                    with open(data_file, 'a') as f:
+                        f.write("".join(block["record"] + "\n" for block in blocks))
+                for block in blocks:
+                    if self.blocks is not None:
+                        self.blocks.append(block["block"])
+                    if "snapshot" in block:
+                        self.snapshots.write(*block["snapshot"])
+                        self.snapshots.prune()
+                        self._pin_blocks()
+        
+        return NodeRuntime(
+            slot_duration if slot_duration is not None else self.node.params.SLOT_DURATION,
+            propose=propose,
+            vote=vote,
+            admit=blockchain.add_transaction,
+            persist=persist
+        )
+    
+    async def run_async(self, duration: Optional[float] = None,
+                        slot_duration: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run the node's asyncio runtime.
+        
+        Args:
+            duration: Seconds to run (until stopped if None)
+            slot_duration: Seconds per slot (default SLOT_DURATION)
+            
+        Returns:
+            The runtime metrics (slot jitter, proposal latency, ...)
+        """
+        self.runtime = self.build_runtime(slot_duration)
+        return await self.runtime.run(duration)
 
 if __name__ == "__main__":
     print("=" * 60)